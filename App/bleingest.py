@@ -0,0 +1,308 @@
+# bleingest.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Background BLE ingest for the EZ-TRAK device
+#
+# A reader thread runs its own asyncio loop (bleak for the real device, a
+# simulated device for testing, or a recorded session replayed) and pushes
+# timestamped az/el samples into a single-producer / single-consumer ring
+# buffer. The GUI animation callback only drains that buffer, so a slow
+# redraw never blocks BLE notifications and a burst of notifications never
+# stalls the GUI.
+
+import asyncio
+import math
+import random
+import threading
+import time
+
+import numpy as np
+
+from recordfile import Recording
+
+# Configuration
+DEVICE_NAME = "EZ-TRAK"  # Device name to search for
+NOTIFY_UUID = "6e400003-b5a3-f393-e0a9-e50e24dcca9e"  # UART TX characteristic (notify)
+WRITE_UUID = "6e400002-b5a3-f393-e0a9-e50e24dcca9e"  # UART RX characteristic (write)
+RING_CAPACITY = 4096  # Samples buffered between the reader and the GUI
+LATE_THRESHOLD = 0.25  # Seconds; samples older than this when drained count as late
+SCAN_TIMEOUT = 10.0  # Seconds per scan attempt
+RECONNECT_DELAY = 2.0  # Seconds between connection attempts
+SIMULATED_RATE = 20.0  # Samples per second from the simulated device
+REPLAY_TICK = 0.01  # Seconds between pushes of a timed replay
+
+
+def decode_packet(data):
+    """Decode an "az,el" ASCII notification into (azimuth, elevation) floats."""
+    text = bytes(data).decode("ascii", errors="ignore").strip()
+    az, el = text.split(",")[:2]
+    return float(az), float(el)
+
+
+class SampleRing:
+    """Lock-free single-producer / single-consumer ring of (time, az, el) samples.
+
+    The producer only ever advances `_head` and the consumer only `_tail`.
+    Each is a plain int rebound after the slot is written (or read), which
+    is atomic under the GIL, so no lock is needed. When the ring is full new
+    samples are dropped and counted rather than overwriting unread ones.
+    """
+
+    def __init__(self, capacity=RING_CAPACITY):
+        self.capacity = capacity
+        self._time = np.zeros(capacity)
+        self._az = np.zeros(capacity)
+        self._el = np.zeros(capacity)
+        self._head = 0  # Total samples written
+        self._tail = 0  # Total samples read
+        self.dropped = 0
+        self.late = 0
+        self.received = 0
+
+    def __len__(self):
+        return self._head - self._tail
+
+    def push(self, t, az, el):
+        """Producer side: store one sample, returning False if the ring was full."""
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.dropped += 1
+            return False
+        slot = head % self.capacity
+        self._time[slot] = t
+        self._az[slot] = az
+        self._el[slot] = el
+        self._head = head + 1
+        self.received += 1
+        return True
+
+    def push_many(self, t, az, el):
+        """Producer side: store as many of the samples as fit; returns how many were stored."""
+        head = self._head
+        n = min(len(t), self.capacity - (head - self._tail))
+        if n <= 0:
+            return 0
+        index = np.arange(head, head + n) % self.capacity
+        self._time[index] = t[:n]
+        self._az[index] = az[:n]
+        self._el[index] = el[:n]
+        self._head = head + n
+        self.received += n
+        return n
+
+    def drain(self, now=None, late_threshold=LATE_THRESHOLD):
+        """Consumer side: return (time, az, el) arrays of every unread sample."""
+        tail = self._tail
+        head = self._head
+        if head == tail:
+            return np.empty(0), np.empty(0), np.empty(0)
+        index = np.arange(tail, head) % self.capacity
+        t, az, el = self._time[index], self._az[index], self._el[index]
+        self._tail = head
+        if now is None:
+            now = time.time()
+        self.late += int(np.count_nonzero(now - t > late_threshold))
+        return t, az, el
+
+    def counters(self):
+        """Snapshot of the ingest counters."""
+        return {"received": self.received, "dropped": self.dropped,
+                "late": self.late, "pending": len(self)}
+
+
+class DeviceReader:
+    """Runs a device backend on a private asyncio loop in a daemon thread."""
+
+    def __init__(self, ring=None):
+        self.ring = ring if ring is not None else SampleRing()
+        self.status = "Disconnected"
+        self._loop = None
+        self._thread = None
+        self._stop = None
+
+    def start(self):
+        """Start the reader thread."""
+        if self._thread is not None:
+            return
+        # The loop exists before the thread does, so stop() can always reach it
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="ezTrakReader", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Ask the reader to disconnect and wait for the thread to finish."""
+        if self._thread is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._request_stop)
+        except RuntimeError:
+            pass  # The backend already returned and the loop is closed
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _request_stop(self):
+        # Runs on the reader loop, where the stop event lives
+        self._stop.set()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._stop = asyncio.Event()
+        try:
+            self._loop.run_until_complete(self.read_loop(self._stop))
+        finally:
+            self._loop.close()
+            self.status = "Disconnected"
+
+    def on_sample(self, az, el, t=None):
+        """Push one sample; backends call this from the reader loop."""
+        self.ring.push(time.time() if t is None else t, az, el)
+
+    def send_command(self, command):
+        """Send a command to the device; backends without a command channel return False."""
+        return False
+
+    async def read_loop(self, stop):
+        """Backend coroutine producing samples until `stop` is set."""
+        raise NotImplementedError
+
+
+class BLEReader(DeviceReader):
+    """Reads az/el notifications from the EZ-TRAK device with bleak."""
+
+    def __init__(self, device_name=DEVICE_NAME, ring=None):
+        super().__init__(ring)
+        self.device_name = device_name
+        self.decode_errors = 0
+        self._client = None
+
+    def _handle_notification(self, sender, data):
+        try:
+            az, el = decode_packet(data)
+        except ValueError:
+            self.decode_errors += 1
+            return
+        self.on_sample(az, el)
+
+    async def read_loop(self, stop):
+        from bleak import BleakClient, BleakScanner
+        from bleak.exc import BleakError
+
+        while not stop.is_set():
+            self.status = "Scanning"
+            try:
+                device = await BleakScanner.find_device_by_name(self.device_name, timeout=SCAN_TIMEOUT)
+                if device is None:
+                    self.status = "Device not found"
+                else:
+                    self.status = "Connecting"
+                    async with BleakClient(device) as client:
+                        self._client = client
+                        await client.start_notify(NOTIFY_UUID, self._handle_notification)
+                        self.status = "Connected"
+                        # Notifications arrive on this loop; just wait for stop or drop-out
+                        while client.is_connected and not stop.is_set():
+                            await asyncio.sleep(0.2)
+                    self._client = None
+                    self.status = "Disconnected"
+            except (BleakError, OSError, asyncio.TimeoutError) as e:
+                self._client = None
+                self.status = f"Error: {e}"
+            try:
+                await asyncio.wait_for(stop.wait(), RECONNECT_DELAY)
+            except asyncio.TimeoutError:
+                pass
+
+    def send_command(self, command):
+        """Write a text command (e.g. "RESET") to the device from any thread."""
+        if self._client is None or self._loop is None:
+            return False
+        asyncio.run_coroutine_threadsafe(
+            self._client.write_gatt_char(WRITE_UUID, command.encode("ascii")), self._loop)
+        return True
+
+
+class SimulatedReader(DeviceReader):
+    """Simulated EZ-TRAK: sweeps a pass-like arc with IMU-style jitter."""
+
+    def __init__(self, rate=SIMULATED_RATE, ring=None, noise=0.5, seed=None):
+        super().__init__(ring)
+        self.rate = rate
+        self.noise = noise
+        self._random = random.Random(seed)
+
+    def position(self, t):
+        """Noise-free az/el of the simulated antenna at time t (seconds)."""
+        phase = (t % 600.0) / 600.0
+        az = (90.0 + 180.0 * phase) % 360.0
+        el = 80.0 * math.sin(math.pi * phase)
+        return az, el
+
+    async def read_loop(self, stop):
+        self.status = "Connected (simulated)"
+        interval = 1.0 / self.rate
+        next_time = time.monotonic()
+        while not stop.is_set():
+            az, el = self.position(time.time())
+            self.on_sample((az + self._random.gauss(0, self.noise)) % 360.0,
+                           min(max(el + self._random.gauss(0, self.noise), 0.0), 90.0))
+            next_time += interval
+            await asyncio.sleep(max(next_time - time.monotonic(), 0.0))
+        self.status = "Disconnected"
+
+
+class ReplayReader(DeviceReader):
+    """Plays a recorded session (.ezt) back as if the device were sending it.
+
+    With `speed` 1 the samples arrive with their recorded spacing, larger
+    factors compress it, and None pushes them as fast as the GUI drains the
+    ring (a load test of the whole ingest, filter and render path). Samples
+    are stamped with the time they are replayed at, or keep their recorded
+    time with `original_times`, and are never dropped: a full ring makes
+    the replay wait.
+    """
+
+    def __init__(self, path, speed=1.0, ring=None, original_times=False):
+        super().__init__(ring)
+        recording = Recording(path)
+        self.path = path
+        self.metadata = recording.metadata
+        self.speed = speed
+        self.original_times = original_times
+        self._t = np.array(recording.column("time"), dtype=np.float64)
+        self._az = np.array(recording.column("az"), dtype=np.float64)
+        self._el = np.array(recording.column("el"), dtype=np.float64)
+        self.replayed = 0  # Samples pushed so far
+        self.finished = False
+
+    def __len__(self):
+        return self._t.size
+
+    async def read_loop(self, stop):
+        n = self._t.size
+        label = "max speed" if self.speed is None else f"{self.speed:g}x"
+        started = time.time()
+        while self.replayed < n and not stop.is_set():
+            start = self.replayed
+            if self.speed is None:
+                end = min(n, start + self.ring.capacity - len(self.ring))
+                t = np.full(end - start, time.time())
+            else:
+                recorded = self._t[0] + (time.time() - started) * self.speed
+                end = int(np.searchsorted(self._t, recorded, side="right"))
+                t = started + (self._t[start:end] - self._t[0]) / self.speed
+            if self.original_times:
+                t = self._t[start:end]
+            pushed = self.ring.push_many(t, self._az[start:end], self._el[start:end]) if end > start else 0
+            self.replayed += pushed
+            self.status = f"Replay {label}: {self.replayed / n:.0%}"
+            if self.speed is not None:
+                await asyncio.sleep(REPLAY_TICK)
+            else:
+                # Yield briefly when the ring is full so the GUI can drain it
+                await asyncio.sleep(0 if pushed else 0.001)
+        self.finished = self.replayed == n
+        if self.finished:
+            # Stay open like a connected device that went quiet
+            self.status = "Replay finished"
+            await stop.wait()
+        self.status = "Disconnected"
@@ -0,0 +1,143 @@
+# blitting.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Blitted redraw of the dynamic plot artists
+#
+# The static parts of a figure (elevation circles, compass labels, widgets,
+# text box frames) are rendered once and cached as a background. Each tick
+# only the artists that changed since the last tick are redrawn, over their
+# own patch of the cached background, and only those patches are blitted.
+
+import numpy as np
+from matplotlib.transforms import Bbox
+
+BLIT_PADDING = 8  # Pixels added around artist extents to cover text box frames
+
+
+def _is_empty(artist):
+    """True for lines without data, texts without characters and collections without
+    points (their extents are bogus)."""
+    if hasattr(artist, "get_xdata"):
+        return len(artist.get_xdata()) == 0
+    if hasattr(artist, "get_text"):
+        return not artist.get_text()
+    if hasattr(artist, "get_offsets"):
+        return len(artist.get_offsets()) == 0
+    return False
+
+
+def _window_extent(artist, renderer):
+    """Display extent of an artist.
+
+    Collections report no extent on non-affine axes such as the polar plot,
+    so theirs is taken from the transformed point offsets, widened by the
+    largest marker.
+    """
+    if hasattr(artist, "get_offsets"):
+        points = artist.get_offset_transform().transform(artist.get_offsets())
+        half = np.sqrt(np.max(artist.get_sizes(), initial=0)) * renderer.points_to_pixels(1.0) / 2
+        low, high = points.min(axis=0) - half, points.max(axis=0) + half
+        return Bbox([low, high])
+    return artist.get_window_extent(renderer)
+
+
+class BlitManager:
+    """Redraw a fixed set of animated artists over a cached static background.
+
+    Artists are grouped by the axes they live in. A group is redrawn when one
+    of its artists is stale (matplotlib marks artists stale on set_data,
+    set_text, ...). The group's screen region is restored from the cached
+    background, its artists are drawn again and just that region is blitted.
+    """
+
+    def __init__(self, canvas, artists=()):
+        self.canvas = canvas
+        self._background = None
+        self._groups = {}
+        self._regions = {}
+        for artist in artists:
+            self.add_artist(artist)
+        # Every full draw (first show, resize, button clicks) refreshes the cache
+        self._cid = canvas.mpl_connect("draw_event", self.on_draw)
+
+    def add_artist(self, artist):
+        """Take an artist out of normal drawing and manage it here."""
+        artist.set_animated(True)
+        group = self._groups.setdefault(artist.axes, [])
+        group.append(artist)
+        group.sort(key=lambda a: a.get_zorder())
+
+    def on_draw(self, event):
+        """Cache the freshly drawn static background and draw the animated artists on top."""
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        renderer = self.canvas.get_renderer()
+        for owner, artists in self._groups.items():
+            self._regions[owner] = self._region(artists, renderer)
+            for artist in artists:
+                self.canvas.figure.draw_artist(artist)
+
+    def _region(self, artists, renderer):
+        """Screen area covered by a group of artists, or None if they draw nothing."""
+        boxes = []
+        for artist in artists:
+            if not artist.get_visible() or _is_empty(artist):
+                continue
+            try:
+                extent = _window_extent(artist, renderer)
+            except (RuntimeError, ValueError):
+                continue
+            if np.all(np.isfinite(extent.extents)) and extent.width > 0:
+                boxes.append(extent)
+        if not boxes:
+            return None
+        return Bbox.union(boxes).padded(BLIT_PADDING)
+
+    def _restore(self, region):
+        # Saved regions use a top-left origin, display boxes a bottom-left one;
+        # xy is the origin of the saved region, so the patch is restored in place
+        height = self.canvas.figure.bbox.height
+        x1, y1, x2, y2 = region.extents
+        self.canvas.restore_region(self._background, bbox=(x1, height - y2, x2, height - y1), xy=(0, 0))
+
+    def update(self):
+        """Redraw and blit the groups containing artists changed since the last update.
+
+        Returns the number of artist groups redrawn.
+        """
+        if self._background is None:
+            return 0
+        dirty = {owner for owner, artists in self._groups.items()
+                 if any(artist.stale for artist in artists)}
+        if not dirty:
+            return 0
+        renderer = self.canvas.get_renderer()
+        regions = {}
+        for owner in dirty:
+            # Cover where the artists were as well as where they are now
+            boxes = [self._regions.get(owner), self._region(self._groups[owner], renderer)]
+            self._regions[owner] = boxes[1]
+            boxes = [box for box in boxes if box is not None]
+            if boxes:
+                regions[owner] = Bbox.union(boxes)
+        # Groups overlapping a restored region lose their pixels and are redrawn too
+        added = True
+        while added:
+            added = False
+            for owner in self._groups:
+                region = self._regions.get(owner)
+                if owner not in regions and region is not None and any(
+                        region.overlaps(r) for r in regions.values()):
+                    regions[owner] = region
+                    added = True
+        for region in regions.values():
+            self._restore(region)
+        for owner in dirty | set(regions):
+            for artist in self._groups[owner]:
+                self.canvas.figure.draw_artist(artist)
+        for region in regions.values():
+            self.canvas.blit(region)
+        return len(regions)
+
+    def disconnect(self):
+        """Stop tracking draw events."""
+        self.canvas.mpl_disconnect(self._cid)
@@ -0,0 +1,269 @@
+# coastline.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# World map geometry: the bundled coastline and dateline splitting
+#
+# Usage (build the bundled file from Natural Earth data, public domain):
+#   python coastline.py build ne_110m_coastline.geojson
+#   python coastline.py build ne_110m_admin_0_countries.shp
+#   python coastline.py build ne_50m_coastline.geojson --tolerance 0.2
+#   python coastline.py info
+#
+# The bundled data/coastline.ezc is built from the Natural Earth 110m
+# countries shapefile. Polygon sources (countries, land) are reduced to their
+# coastline: an edge shared by two polygons is a land border and is dropped,
+# as are the edges where polygons are cut at the antimeridian or the pole.
+#
+# The coastline is simplified ahead of time (Douglas-Peucker) and stored as
+# quantized 16-bit integers:
+#   8 bytes   magic b"EZCOAST1"
+#   8 bytes   little-endian uint32 line count, uint32 point count
+#   4*(n+1)   uint32 offset of the first point of each line, then the total
+#   4*points  int16 (lon, lat) pairs, degrees * 32767/180 and 32767/90
+# The quantization step is about 0.006 degrees (600 m), far below the
+# simplification tolerance. Loading is a single read and one NumPy
+# conversion; the lines come back NaN-separated, ready for one Line2D.
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+# Configuration
+COASTLINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "coastline.ezc")
+TOLERANCE = 0.1  # Degrees; Douglas-Peucker tolerance of the bundled file
+MAGIC = b"EZCOAST1"
+SCALE = np.array([32767 / 180.0, 32767 / 90.0])  # Quantization of (lon, lat)
+SHAPE_TYPES = (3, 5)  # Shapefile PolyLine and Polygon records
+
+
+def split_dateline(lon, lat):
+    """Break a lon/lat polyline where it crosses the antimeridian.
+
+    A point on the ±180° edge is interpolated at each crossing, followed by
+    NaN (a gap for matplotlib) and the same point on the opposite edge, so
+    the line runs to the map border instead of across the whole map.
+    """
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    step = np.diff(lon)
+    jumps = np.nonzero(np.abs(step) > 180.0)[0]
+    if jumps.size == 0:
+        return lon, lat
+    edge = np.where(step[jumps] < 0, 180.0, -180.0)  # Edge the line leaves through
+    unwrapped = lon[jumps + 1] + 2 * edge
+    fraction = (edge - lon[jumps]) / (unwrapped - lon[jumps])
+    crossing = lat[jumps] + fraction * (lat[jumps + 1] - lat[jumps])
+    at = np.repeat(jumps + 1, 3)
+    new_lon = np.column_stack([edge, np.full(jumps.size, np.nan), -edge]).ravel()
+    new_lat = np.column_stack([crossing, np.full(jumps.size, np.nan), crossing]).ravel()
+    return np.insert(lon, at, new_lon), np.insert(lat, at, new_lat)
+
+
+def simplify(points, tolerance):
+    """Douglas-Peucker simplification of an (n, 2) polyline; returns the kept points."""
+    n = len(points)
+    if n < 3:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = points[first], points[last]
+        inner = points[first + 1:last]
+        d = b - a
+        length = np.hypot(*d)
+        if length == 0:
+            distance = np.hypot(*(inner - a).T)
+        else:
+            distance = np.abs(d[0] * (inner[:, 1] - a[1]) - d[1] * (inner[:, 0] - a[0])) / length
+        k = int(np.argmax(distance))
+        if distance[k] > tolerance:
+            middle = first + 1 + k
+            keep[middle] = True
+            stack += [(first, middle), (middle, last)]
+    return points[keep]
+
+
+def _geojson_lines(geometry):
+    """Coordinate lists of every line or ring in a GeoJSON geometry."""
+    kind, coordinates = geometry["type"], geometry.get("coordinates")
+    if kind == "LineString":
+        return [coordinates]
+    if kind in ("MultiLineString", "Polygon"):
+        return list(coordinates)
+    if kind == "MultiPolygon":
+        return [ring for polygon in coordinates for ring in polygon]
+    if kind == "GeometryCollection":
+        return [line for part in geometry["geometries"] for line in _geojson_lines(part)]
+    return []
+
+
+def _shapefile_lines(path):
+    """Coordinate arrays of every part of the PolyLine / Polygon records in a .shp file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    file_code, = struct.unpack_from(">i", data, 0)
+    if file_code != 9994:
+        raise ValueError(f"{path} is not a shapefile")
+    file_length = struct.unpack_from(">i", data, 24)[0] * 2
+    lines = []
+    position = 100
+    while position + 8 <= min(file_length, len(data)):
+        content_length = struct.unpack_from(">i", data, position + 4)[0] * 2
+        record = position + 8
+        position = record + content_length
+        shape_type, = struct.unpack_from("<i", data, record)
+        if shape_type not in SHAPE_TYPES:
+            continue
+        n_parts, n_points = struct.unpack_from("<ii", data, record + 36)
+        parts = np.frombuffer(data, "<i4", n_parts, record + 44)
+        points = np.frombuffer(data, "<f8", 2 * n_points, record + 44 + 4 * n_parts).reshape(-1, 2)
+        for start, end in zip(parts, np.append(parts[1:], n_points)):
+            lines.append(points[start:end])
+    return lines
+
+
+def _is_cut(a, b):
+    """True for an edge along the antimeridian or the south pole, where polygons are cut."""
+    return (abs(a[0]) == 180.0 and a[0] == b[0]) or (a[1] == b[1] == -90.0)
+
+
+def coastline_only(lines):
+    """Drop land borders from polygon rings, keeping the runs of coastline between them.
+
+    An edge that appears in two rings (in either direction) separates two
+    polygons rather than land and sea. Lines without such edges come back
+    unchanged.
+    """
+    def key(a, b):
+        return (a, b) if a <= b else (b, a)
+
+    counts = {}
+    for line in lines:
+        points = [tuple(point) for point in line]
+        for a, b in zip(points, points[1:]):
+            counts[key(a, b)] = counts.get(key(a, b), 0) + 1
+    coast = []
+    for line in lines:
+        points = [tuple(point) for point in line]
+        keep = [counts[key(a, b)] == 1 and not _is_cut(a, b) for a, b in zip(points, points[1:])]
+        if all(keep):
+            coast.append(np.asarray(line))
+            continue
+        closed = len(points) > 2 and points[0] == points[-1]
+        if closed:
+            # Start the ring at a dropped edge so no run wraps around its end
+            first = keep.index(False)
+            points = points[first:-1] + points[:first + 1]
+            keep = keep[first:] + keep[:first]
+        run = []
+        for (a, b), kept in zip(zip(points, points[1:]), keep):
+            if kept:
+                run = run or [a]
+                run.append(b)
+            elif run:
+                coast.append(np.array(run))
+                run = []
+        if run:
+            coast.append(np.array(run))
+    return coast
+
+
+def write_coastline(lines, path=COASTLINE_PATH):
+    """Store (n, 2) lon/lat arrays in the bundled binary format."""
+    lines = [np.asarray(line, dtype=np.float64)[:, :2] for line in lines if len(line) >= 2]
+    offsets = np.cumsum([0] + [len(line) for line in lines]).astype("<u4")
+    points = np.concatenate(lines) if lines else np.empty((0, 2))
+    quantized = np.clip(np.round(points * SCALE), -32767, 32767).astype("<i2")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<II", len(lines), len(points)))
+        f.write(offsets.tobytes())
+        f.write(quantized.tobytes())
+
+
+def load_coastline(path=COASTLINE_PATH):
+    """NaN-separated (lon, lat) arrays of the bundled coastline, or None if it is not installed."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not an EZ-TRAK coastline file")
+    n_lines, n_points = struct.unpack_from("<II", data, len(MAGIC))
+    start = len(MAGIC) + 8
+    offsets = np.frombuffer(data, "<u4", n_lines + 1, start)
+    points = np.frombuffer(data, "<i2", 2 * n_points, start + 4 * (n_lines + 1)).reshape(-1, 2)
+    points = points / SCALE
+    # A NaN row between lines lets one artist draw them all
+    at = offsets[1:-1].astype(np.intp)
+    lon = np.insert(points[:, 0], at, np.nan)
+    lat = np.insert(points[:, 1], at, np.nan)
+    return lon, lat
+
+
+def build(source, path=COASTLINE_PATH, tolerance=TOLERANCE):
+    """Simplify the coastline of a GeoJSON or shapefile and write the bundled file; returns (lines, points)."""
+    if source.lower().endswith(".shp"):
+        source_lines = _shapefile_lines(source)
+    else:
+        with open(source) as f:
+            document = json.load(f)
+        if document.get("type") == "FeatureCollection":
+            geometries = [feature["geometry"] for feature in document["features"] if feature.get("geometry")]
+        elif document.get("type") == "Feature":
+            geometries = [document["geometry"]]
+        else:
+            geometries = [document]
+        source_lines = [line for geometry in geometries for line in _geojson_lines(geometry)]
+    lines = []
+    for line in coastline_only([np.asarray(line, dtype=np.float64)[:, :2] for line in source_lines]):
+        simplified = simplify(line, tolerance)
+        # Drop islands that simplify down to a point
+        if len(simplified) >= 3 or (len(simplified) == 2 and not np.array_equal(*simplified)):
+            lines.append(simplified)
+    write_coastline(lines, path)
+    return len(lines), sum(len(line) for line in lines)
+
+
+def main(argv=None):
+    """Build or describe the bundled coastline file."""
+    parser = argparse.ArgumentParser(description="Build the compact coastline file used by the map view.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="simplify a coastline or country outlines into the bundled file")
+    build_parser.add_argument("source", help="GeoJSON or .shp file, e.g. Natural Earth ne_110m_coastline.geojson "
+                                             "or ne_110m_admin_0_countries.shp")
+    build_parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="degrees")
+    build_parser.add_argument("--output", default=COASTLINE_PATH)
+    info_parser = commands.add_parser("info", help="show the size and load time of the bundled file")
+    info_parser.add_argument("--path", default=COASTLINE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        n_lines, n_points = build(args.source, args.output, args.tolerance)
+        print(f"{args.output}: {n_lines} lines, {n_points} points, {os.path.getsize(args.output)} bytes")
+        return 0
+    started = time.perf_counter()
+    coastline = load_coastline(args.path)
+    elapsed = time.perf_counter() - started
+    if coastline is None:
+        print(f"{args.path} not found - build it with: python coastline.py build <coastline.geojson|.shp>",
+              file=sys.stderr)
+        return 1
+    n_points = int(np.count_nonzero(np.isfinite(coastline[0])))
+    print(f"{args.path}: {os.path.getsize(args.path)} bytes, {n_points} points, "
+          f"loaded in {elapsed * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
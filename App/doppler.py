@@ -0,0 +1,269 @@
+# doppler.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Slant range, range rate and Doppler-corrected downlink frequencies
+#
+# Usage (rigctld stand-in that logs the frequencies it is tuned to):
+#   python doppler.py
+#   python doppler.py --port 4532
+#
+# Range and range rate come from the pass ephemeris table: the interpolated
+# position and its derivative in the Earth-fixed frame, where the observer
+# does not move, so the range rate is the velocity projected on the line of
+# sight. A DopplerTuner thread evaluates BATCH_SECONDS of tuning ticks in
+# one vectorized call and then sends each corrected frequency to rigctld (or
+# the stand-in below) on schedule; the GUI only reads its latest values, so
+# neither SGP4 nor socket I/O ever runs in the animation loop.
+
+import argparse
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from passpredict import observer_ecef
+
+# Configuration
+SPEED_OF_LIGHT = 299792.458  # km/s
+TUNE_RATE = 5.0  # Frequency updates per second
+BATCH_SECONDS = 1.0  # Seconds of ticks evaluated per vectorized batch
+TUNE_STEP = 1  # Hz; smaller corrections are not sent to the radio
+RIGCTL_HOST = "127.0.0.1"
+RIGCTL_PORT = 4532  # Standard rigctld port
+CONNECT_TIMEOUT = 3.0  # Seconds
+RESPONSE_TIMEOUT = 1.0  # Seconds
+RECONNECT_DELAY = 2.0  # Seconds between connection attempts
+
+# Downlinks (label, Hz) of well-known satellites; the first one is tuned
+DOWNLINKS = {
+    "NOAA 15": [("APT", 137.62e6)],
+    "NOAA 18": [("APT", 137.9125e6)],
+    "NOAA 19": [("APT", 137.1e6)],
+    "METOP-C": [("LRPT", 137.9e6)],
+    "ISS (ZARYA)": [("FM voice", 145.8e6), ("APRS", 145.825e6)],
+}
+
+DopplerSample = namedtuple("DopplerSample", "time range range_rate frequencies")
+
+
+def slant_range(ephemeris, t):
+    """Range (km) and range rate (km/s, positive receding) at unix times t; NaN outside the pass."""
+    r, v = ephemeris.state(t)
+    line_of_sight = r - observer_ecef(ephemeris.lat, ephemeris.lon, ephemeris.alt)
+    distance = np.linalg.norm(line_of_sight, axis=-1)
+    return distance, np.einsum("...i,...i->...", line_of_sight, v) / distance
+
+
+def doppler_shift(frequency, range_rate):
+    """Received frequency (Hz) of a downlink transmitted at `frequency` Hz."""
+    return frequency * (1 - range_rate / SPEED_OF_LIGHT)
+
+
+def format_sample(sample):
+    """Readout lines for a DopplerSample (or None outside a pass)."""
+    if sample is None:
+        return "Range: ---"
+    lines = [f"Range: {sample.range:.0f} km  {sample.range_rate:+.2f} km/s"]
+    lines += [f"{label}: {hz / 1e6:.5f} MHz" for label, hz in sample.frequencies]
+    return "\n".join(lines)
+
+
+class RigctlClient:
+    """Blocking rigctld client for the tuner thread: sets the frequency, reconnects when needed."""
+
+    def __init__(self, host=RIGCTL_HOST, port=RIGCTL_PORT):
+        self.host = host
+        self.port = int(port)
+        self.status = "Disconnected"
+        self.errors = 0
+        self._sock = None
+        self._reader = None
+        self._retry_at = 0.0
+
+    def set_frequency(self, hz):
+        """Send "F <hz>"; True when the radio acknowledged it."""
+        if self._sock is None and not self._connect():
+            return False
+        try:
+            self._sock.sendall(f"F {int(round(hz))}\n".encode("ascii"))
+            reply = self._reader.readline().strip()
+        except OSError as e:
+            self._disconnect(f"Error: {e}")
+            return False
+        if not reply:
+            self._disconnect("Disconnected")
+            return False
+        if reply != "RPRT 0":
+            self.errors += 1
+            return False
+        return True
+
+    def close(self):
+        self._disconnect("Disconnected")
+
+    def _connect(self):
+        if time.monotonic() < self._retry_at:
+            return False
+        try:
+            self._sock = socket.create_connection((self.host, self.port), timeout=CONNECT_TIMEOUT)
+        except OSError as e:
+            self._retry_at = time.monotonic() + RECONNECT_DELAY
+            self.status = f"Error: {e}"
+            return False
+        self._sock.settimeout(RESPONSE_TIMEOUT)
+        self._reader = self._sock.makefile("r", encoding="ascii", newline="\n")
+        self.status = "Connected"
+        return True
+
+    def _disconnect(self, status):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+            self._retry_at = time.monotonic() + RECONNECT_DELAY
+        self._sock = None
+        self._reader = None
+        self.status = status
+
+
+class DopplerTuner:
+    """Background thread computing Doppler-corrected downlinks and tuning the radio.
+
+    set_target() switches to another pass at any time. Outside the pass the
+    radio is held at the AOS (or LOS) frequency and `latest` is None.
+    """
+
+    def __init__(self, rig=None, rate=TUNE_RATE):
+        self.rig = rig  # RigctlClient, or None to only compute the readout
+        self.rate = rate
+        self.latest = None  # DopplerSample of the last tick inside the pass
+        self.sent = 0  # Frequencies acknowledged by the radio
+        self._target = (None, [])  # (PassEphemeris, downlinks)
+        self._tuned = None
+        self._changed = threading.Event()
+        self._closed = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ezTrakDoppler", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Stop the thread and disconnect from the radio."""
+        self._closed.set()
+        self._changed.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        if self.rig is not None:
+            self.rig.close()
+
+    def set_target(self, ephemeris, downlinks):
+        """Follow the pass of `ephemeris` (None to stop) with (label, Hz) downlinks."""
+        self._target = (ephemeris, list(downlinks))
+        self.latest = None
+        self._changed.set()
+
+    def _run(self):
+        while not self._closed.is_set():
+            self._changed.clear()
+            ephemeris, downlinks = self._target
+            now = time.time()
+            if ephemeris is None or now > ephemeris.end:
+                self.latest = None
+                self._changed.wait()
+                continue
+            # One vectorized evaluation for the whole batch of ticks
+            ticks = now + np.arange(max(int(BATCH_SECONDS * self.rate), 1)) / self.rate
+            in_pass = ticks >= ephemeris.start
+            distance, range_rate = slant_range(ephemeris, np.clip(ticks, ephemeris.start, ephemeris.end))
+            hz = np.array([frequency for _, frequency in downlinks])
+            frequencies = doppler_shift(hz[None, :], range_rate[:, None])
+            for k, tick in enumerate(ticks.tolist()):
+                if self._changed.wait(max(tick - time.time(), 0.0)):
+                    break  # New target or closing: plan again
+                if in_pass[k]:
+                    self.latest = DopplerSample(tick, float(distance[k]), float(range_rate[k]),
+                                                tuple(zip((label for label, _ in downlinks),
+                                                          frequencies[k].tolist())))
+                if self.rig is not None and downlinks:
+                    self._tune(frequencies[k, 0])
+
+    def _tune(self, hz):
+        hz = int(round(hz))
+        if self._tuned is not None and abs(hz - self._tuned) < TUNE_STEP:
+            return
+        if self.rig.set_frequency(hz):
+            self._tuned = hz
+            self.sent += 1
+
+
+class RigStandIn(socketserver.ThreadingTCPServer):
+    """Minimal rigctld stand-in answering set/get frequency, for testing without a radio."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host=RIGCTL_HOST, port=RIGCTL_PORT):
+        super().__init__((host, port), _RigHandler)
+        self.frequency = 145000000  # Hz
+        self.updates = 0
+
+
+class _RigHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        rig = self.server
+        for line in self.rfile:
+            parts = line.decode("ascii", "replace").split()
+            if not parts:
+                continue
+            if parts[0] in ("F", "\\set_freq") and len(parts) == 2:
+                try:
+                    rig.frequency = int(float(parts[1]))
+                    rig.updates += 1
+                    reply = "RPRT 0"
+                except ValueError:
+                    reply = "RPRT -1"
+            elif parts[0] in ("f", "\\get_freq"):
+                reply = str(rig.frequency)
+            elif parts[0] in ("q", "Q"):
+                return
+            else:
+                reply = "RPRT -11"  # Not available in the stand-in
+            self.wfile.write((reply + "\n").encode("ascii"))
+
+
+def main(argv=None):
+    """Run the rigctld stand-in and print the frequency whenever it changes."""
+    parser = argparse.ArgumentParser(description="rigctld stand-in that logs tuned frequencies.")
+    parser.add_argument("--host", default=RIGCTL_HOST)
+    parser.add_argument("--port", type=int, default=RIGCTL_PORT)
+    args = parser.parse_args(argv)
+
+    server = RigStandIn(args.host, args.port)
+    threading.Thread(target=server.serve_forever, name="ezTrakRigStandIn", daemon=True).start()
+    print(f"rigctld stand-in listening on {args.host}:{args.port}", file=sys.stderr)
+    shown = None
+    try:
+        while True:
+            time.sleep(1.0)
+            if server.frequency != shown:
+                shown = server.frequency
+                print(f"{time.strftime('%H:%M:%S')} {shown / 1e6:.6f} MHz ({server.updates} updates)")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
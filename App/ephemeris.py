@@ -0,0 +1,176 @@
+# ephemeris.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Compact per-pass ephemeris tables for the animation loop
+#
+# A pass is covered by short segments of SEGMENT_STEP seconds. SGP4 is run
+# at the DEGREE + 1 Chebyshev nodes of each segment and the segment stores
+# the polynomial through those Earth-fixed positions. A lookup is then one
+# segment index and one polynomial per axis, whatever the time, followed by
+# the topocentric transform. (SGP4 velocities are not exact derivatives of
+# its positions, so only positions are interpolated.) The error of degree
+# n Chebyshev interpolation over a segment of length h is at most
+# (h/2)^(n+1) / (2^n (n+1)!) times the largest (n+1)-th derivative of the
+# position, which for an orbit is bounded by r * w^(n+1) with w the angular
+# rate seen from the rotating Earth; error_bound() turns that into
+# kilometres and pointing degrees, and verify() checks it against direct
+# propagation (see tests/test_ephemeris.py).
+
+import math
+
+import numpy as np
+
+from passpredict import (EARTH_ROTATION, SECONDS_PER_DAY, UNIX_EPOCH_JD, ecef_positions,
+                         observer_ecef, topocentric)
+
+# Configuration
+SEGMENT_STEP = 300.0  # Seconds per segment
+DEGREE = 5  # Polynomial degree per segment
+BOUND_SAFETY = 2.0  # Factor on the analytic bound for the eccentricity, drag and J2 terms it ignores
+
+
+def _fit_matrix(degree):
+    """Chebyshev nodes on [-1, 1] and the matrix turning samples there into power coefficients."""
+    nodes = np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+    return nodes, np.linalg.inv(np.vander(nodes, degree + 1, increasing=True))
+
+
+class PassEphemeris:
+    """Piecewise Chebyshev table of one satellite's Earth-fixed position over a pass."""
+
+    def __init__(self, predictor, sat_pass, step=SEGMENT_STEP, degree=DEGREE):
+        self.name = sat_pass.name
+        self.lat, self.lon, self.alt = predictor.lat, predictor.lon, predictor.alt
+        self.satrec = predictor.satrecs[sat_pass.index]
+        # Fastest the position vector can turn in the Earth-fixed frame (rad/s)
+        self.rate = predictor.max_angular_rate[sat_pass.index] + EARTH_ROTATION
+        self.start = sat_pass.aos.timestamp()
+        self.end = sat_pass.los.timestamp()
+        n_segments = max(int(np.ceil((self.end - self.start) / step)), 1)
+        self.step = step
+        self.degree = degree
+        nodes, fit = _fit_matrix(degree)
+        middles = self.start + (np.arange(n_segments) + 0.5) * step
+        t = middles[:, None] + nodes[None, :] * (step / 2)
+        r, error = ecef_positions(self.satrec, t.ravel())
+        self.valid = not np.any(error)
+        # Power coefficients (segment, power, axis) in x = -1..1 across each segment
+        self.coefficients = np.einsum("ij,sjk->sik", fit, r.reshape(n_segments, degree + 1, 3))
+        self._max_radius = np.linalg.norm(r, axis=1).max()
+        # Plain-float copies for the scalar per-frame lookup
+        self._rows = [segment[::-1] for segment in self.coefficients.tolist()]
+        self._site = observer_ecef(self.lat, self.lon, self.alt).tolist()
+        lat_r, lon_r = math.radians(self.lat), math.radians(self.lon)
+        self._sin_lat, self._cos_lat = math.sin(lat_r), math.cos(lat_r)
+        self._sin_lon, self._cos_lon = math.sin(lon_r), math.cos(lon_r)
+
+    def __len__(self):
+        return len(self.coefficients)
+
+    def position(self, t):
+        """Interpolated ECEF position (..., 3) in km at unix times t (NaN outside the pass)."""
+        t = np.asarray(t, dtype=np.float64)
+        u = (t - self.start) / self.step
+        k = np.clip(np.floor(u).astype(np.intp), 0, len(self.coefficients) - 1)
+        x = (2 * (u - k) - 1)[..., None]
+        c = self.coefficients[k]
+        r = c[..., self.degree, :]
+        for power in range(self.degree - 1, -1, -1):
+            r = r * x + c[..., power, :]
+        outside = (t < self.start) | (t > self.end)
+        if np.any(outside):
+            r = np.where(outside[..., None], np.nan, r)
+        return r
+
+    def state(self, t):
+        """Interpolated ECEF position (km) and velocity (km/s), each (..., 3), NaN outside the pass.
+
+        The velocity is the derivative of the position polynomial, evaluated
+        in the same Horner pass, so it is consistent with position().
+        """
+        t = np.asarray(t, dtype=np.float64)
+        u = (t - self.start) / self.step
+        k = np.clip(np.floor(u).astype(np.intp), 0, len(self.coefficients) - 1)
+        x = (2 * (u - k) - 1)[..., None]
+        c = self.coefficients[k]
+        r = c[..., self.degree, :]
+        dr = np.zeros_like(r)
+        for power in range(self.degree - 1, -1, -1):
+            dr = dr * x + r
+            r = r * x + c[..., power, :]
+        v = dr * (2 / self.step)
+        outside = (t < self.start) | (t > self.end)
+        if np.any(outside):
+            r = np.where(outside[..., None], np.nan, r)
+            v = np.where(outside[..., None], np.nan, v)
+        return r, v
+
+    def look_angles(self, t):
+        """Azimuth, elevation (degrees) and range (km) at unix times t."""
+        return topocentric(self.position(t), self.lat, self.lon, self.alt)
+
+    def at(self, t):
+        """(az, el) at unix times t, NaN outside the pass (the track filter's prediction source)."""
+        azimuth, elevation, _ = self.look_angles(t)
+        return azimuth, elevation
+
+    def direction(self, t):
+        """(az, el) in degrees at one unix time, or None outside the pass.
+
+        Plain float arithmetic: a few microseconds per call, for the animation loop.
+        """
+        if not self.start <= t <= self.end:
+            return None
+        u = (t - self.start) / self.step
+        k = min(int(u), len(self._rows) - 1)
+        x = 2 * (u - k) - 1
+        px = py = pz = 0.0
+        for cx, cy, cz in self._rows[k]:
+            px = px * x + cx
+            py = py * x + cy
+            pz = pz * x + cz
+        dx, dy, dz = px - self._site[0], py - self._site[1], pz - self._site[2]
+        sin_lat, cos_lat, sin_lon, cos_lon = self._sin_lat, self._cos_lat, self._sin_lon, self._cos_lon
+        east = -sin_lon * dx + cos_lon * dy
+        north = -sin_lat * cos_lon * dx - sin_lat * sin_lon * dy + cos_lat * dz
+        up = cos_lat * cos_lon * dx + cos_lat * sin_lon * dy + sin_lat * dz
+        return (math.degrees(math.atan2(east, north)) % 360.0,
+                math.degrees(math.atan2(up, math.hypot(east, north))))
+
+    def track(self, step=10.0):
+        """Az/el arrays sampled every `step` seconds from AOS to LOS."""
+        n = max(int(np.ceil((self.end - self.start) / step)) + 1, 2)
+        return self.at(np.linspace(self.start, self.end, n))
+
+    def error_bound(self):
+        """(km, degrees): largest position and pointing error the interpolation can make.
+
+        The (n+1)-th derivative is bounded by r * w^(n+1) with w the perigee
+        angular rate of the orbit plus the Earth's rotation. Added to that is
+        the round-off of the Earth rotation angle, which is computed from a
+        Julian date float (resolution tens of microseconds) both when the
+        table is built and when it is checked. The pointing bound divides by
+        the closest range of the pass.
+        """
+        n = self.degree
+        remainder = (self.step / 2) ** (n + 1) / (2 ** n * math.factorial(n + 1))
+        resolution = np.spacing(UNIX_EPOCH_JD + self.end / SECONDS_PER_DAY) * SECONDS_PER_DAY
+        roundoff = 2 * EARTH_ROTATION * resolution * self._max_radius
+        km = BOUND_SAFETY * remainder * self._max_radius * self.rate ** (n + 1) + roundoff
+        closest = np.min(self.look_angles(np.linspace(self.start, self.end, 64))[2])
+        return km, float(np.degrees(km / (closest - km)))
+
+    def verify(self, samples=500, seed=0):
+        """Maximum position (km) and pointing (degrees) error against direct SGP4 over the pass."""
+        rng = np.random.default_rng(seed)
+        t = np.concatenate([[self.start, self.end], rng.uniform(self.start, self.end, samples)])
+        r_direct, error = ecef_positions(self.satrec, t)
+        t, r_direct = t[~error], r_direct[~error]
+        r_table = self.position(t)
+        position_error = np.linalg.norm(r_table - r_direct, axis=1).max()
+        # Angle between the two lines of sight; arctan2 stays accurate for tiny angles
+        site = observer_ecef(self.lat, self.lon, self.alt)
+        a, b = r_direct - site, r_table - site
+        angle = np.arctan2(np.linalg.norm(np.cross(a, b), axis=1), np.einsum("ij,ij->i", a, b))
+        return float(position_error), float(np.degrees(angle.max()))
+
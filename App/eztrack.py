@@ -4,28 +4,62 @@
 # Using a BLE EZ-TRAK connected to a Linux/Windows/Mac computer 
 # EZ-TRAK device is available from Benb0jangles sales page
 
+import tkinter as tk
+from tkinter import messagebox
 import matplotlib
 matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
-from matplotlib.widgets import Button, TextBox, AxesWidget
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
+from matplotlib import style
+from matplotlib.widgets import Button, TextBox
 import numpy as np
-from collections import deque
+import os
+import sys
+import time
+from bleingest import BLEReader, ReplayReader, SimulatedReader
+from blitting import BlitManager
+from doppler import DOWNLINKS, TUNE_RATE, DopplerTuner, RigctlClient, format_sample
+from ephemeris import PassEphemeris
+from instruments import BLE_TO_SCREEN, FRAME, PREDICTION, Instruments, ThroughputMeter
+from passcache import PassCache
+from passpredict import PassPredictor, format_pass
+from recordfile import RECORDINGS_DIR, RecordingWriter
+from skyview import SkyLayer
+from tlestore import TLEStore
+from tracestore import TraceStore
+from trackfilter import DisplayDecimator, KalmanFilter
+
+
+def _option(name, default=None):
+    """Value following `name` on the command line, or `default`."""
+    if name in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
 
 # Configuration
 DEVICE_NAME = "EZ-TRAK"  # Device name to search for
+SIMULATE_DEVICE = "--simulate" in sys.argv  # Use the simulated device instead of BLE
+REPLAY_FILE = _option("--replay")  # Recorded session (.ezt) to play back instead of the device
+REPLAY_SPEED = _option("--speed", "1")  # Replay speed factor, or "max" for as fast as possible
+FILTER_SAMPLES = "--raw" not in sys.argv  # Kalman-filter device samples before display and recording
+SHOW_STATS = "--stats" in sys.argv  # Timing overlay in the status area, dumped as JSON on close
+TUNE_RADIO = "--tune" in sys.argv  # Send Doppler-corrected downlink frequencies to rigctld
+FUSE_PREDICTION = False  # Pull the filtered position towards the predicted track of the shown pass
 ANIMATION_INTERVAL = 50  # Animation update interval in milliseconds
+MAX_SPEED_INTERVAL = 1  # Animation interval (ms) of a max-speed replay, so frames are not timer-bound
+USE_BLIT = True  # Only redraw changed artists over a cached static background
+STATS_INTERVAL = 1.0  # Seconds between refreshes of the timing overlay
+DOPPLER_RATE = float(_option("--doppler-rate", TUNE_RATE))  # Range / Doppler updates per second (readout and radio)
+NOTICE_SECONDS = 5.0  # How long a message replaces the device status in the status line
 
 # Default location values
 DEFAULT_LAT = 01.234567  # Home
 DEFAULT_LON = 0.123456
 DEFAULT_ALT = 1337  # meters
 MIN_ELEVATION = 30  # minimum elevation in degrees for satellite passes
-
-# Data storage
-tracking_points_theta = deque(maxlen=1000)  # Store theta values for tracking line
-tracking_points_r = deque(maxlen=1000)  # Store r values for tracking line
-is_tracking = False  # Flag to indicate if we're tracking position
+PREDICTION_DAYS = 2  # how far ahead to search for passes
 
 # User can edit these three satellites (names from Celestrak database)
 USER_SELECTED_SATELLITES = [
@@ -33,140 +67,495 @@ USER_SELECTED_SATELLITES = [
     "METOP-C",
 ]
 
-# Create figure with modern styling
-plt.style.use('ggplot')  # More modern style
-fig = plt.figure(figsize=(7, 9))  # Slightly taller to accommodate controls
-fig.canvas.manager.set_window_title('EZ-Trak')
-# Reorganized grid to move the Next Passes box higher up and add recording controls
-grid = plt.GridSpec(8, 4, height_ratios=[0.2, 0.2, 0.1, 0.1, 2.8, 0.8, 0.3, 0.3])
-
-# Location input area (moved to top)
-loc_label_ax = fig.add_subplot(grid[0, 0])
-loc_label_ax.axis('off')
-loc_label_ax.text(0.05, 0.5, "Location:", ha='left', va='center', fontweight='bold')
-
-lat_ax = fig.add_subplot(grid[0, 1])
-lat_text = TextBox(lat_ax, 'Lat: ', initial=str(DEFAULT_LAT), color='lightblue', hovercolor='lightgreen')
-
-lon_ax = fig.add_subplot(grid[0, 2])
-lon_text = TextBox(lon_ax, 'Lon: ', initial=str(DEFAULT_LON), color='lightblue', hovercolor='lightgreen')
-
-alt_ax = fig.add_subplot(grid[0, 3])
-alt_text = TextBox(alt_ax, 'Alt(m): ', initial=str(DEFAULT_ALT), color='lightblue', hovercolor='lightgreen')
-
-# Dummy function for all buttons
-def dummy_function(event=None):
-    pass
-
-# Button row
-update_tle_ax = fig.add_subplot(grid[1, 3])
-update_tle_button = Button(update_tle_ax, 'Update TLE', color='lightblue', hovercolor='lightgreen')
-update_tle_button.on_clicked(dummy_function)
-
-# Next Pass button
-next_pass_button_ax = fig.add_subplot(grid[1, 2])
-next_pass_button = Button(next_pass_button_ax, 'Next Pass', color='lightblue', hovercolor='lightgreen')
-next_pass_button.on_clicked(dummy_function)
-
-# Status display area
-status_ax = fig.add_subplot(grid[1, 0:2])
-status_ax.axis('off')
-status_text = status_ax.text(0.05, 0.5, "Status: Disconnected", 
-                             ha='left', va='center', fontsize=10, fontweight='bold',
-                             color='blue', bbox=dict(facecolor='white', alpha=0.8, 
-                                                  edgecolor='gray', boxstyle='round,pad=0.5'))
-
-# Reset button moved to bottom row
-reset_ax = fig.add_subplot(grid[6, 3])
-reset_button = Button(reset_ax, 'Reset Device', color='salmon', hovercolor='red')
-reset_button.on_clicked(dummy_function)
-
-# Recording control buttons
-record_ax = fig.add_subplot(grid[7, 0:2])
-record_button = Button(record_ax, 'Start Recording', color='lightgreen', hovercolor='green')
-record_button.on_clicked(dummy_function)
-
-clear_ax = fig.add_subplot(grid[7, 2:4])
-clear_button = Button(clear_ax, 'Clear Trace', color='lightcoral', hovercolor='red')
-clear_button.on_clicked(dummy_function)
-
-# Create the main circular plot
-ax = fig.add_subplot(grid[2:5, :], polar=True)
-ax.set_theta_zero_location('N')  # 0 degrees at North
-ax.set_theta_direction(-1)  # Clockwise
-ax.set_rlim(0, 72)  # Set max radius to 90*0.8 to match our 20% reduction
-ax.set_yticklabels([])  # Hide radial ticks
-
-# Add compass labels
-ax.set_xticks(np.pi/180. * np.array([0, 90, 180, 270]))
-ax.set_xticklabels(['N (0°)', 'E (90°)', 'S (180°)', 'W (270°)'])
-
-# Add concentric circles for elevation - including 0° for the horizon
-elevation_circles = [0, 15, 30, 45, 60, 75]
-for elevation in elevation_circles:
-    # Apply 20% reduction for consistency with other parts of the code
-    radius = (90-elevation) * 0.8
-    circle = plt.Circle((0, 0), radius, transform=ax.transData._b, 
-                       fill=False, edgecolor='gray', alpha=0.5, ls='--')
-    ax.add_artist(circle)
-    ax.text(0, radius, f"{elevation}°", ha='center', va='bottom',
-           bbox=dict(facecolor='white', alpha=0.7, edgecolor='none'))
-
-# Center text for 90° elevation
-ax.text(0, 0, "90°", ha='center', va='center',
-       bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'))
-
-# Add crosshair (horizontal and vertical lines through the center)
-ax.axhline(y=0, color='gray', linestyle='-', alpha=0.5)
-ax.axvline(x=0, color='gray', linestyle='-', alpha=0.5)
-
-# Initialize the position marker (red dot for current position)
-position_marker, = ax.plot([], [], 'ro', markersize=10)
-
-# Initialize the satellite pass lines
-satellite_line, = ax.plot([], [], 'b-', linewidth=2, alpha=0.7)
-pass_start_marker, = ax.plot([], [], 'go', markersize=8)
-pass_end_marker, = ax.plot([], [], 'yo', markersize=8)
-
-# Initialize the tracking line (red line for tracked positions)
-tracking_line, = ax.plot([], [], 'r-', linewidth=2, alpha=0.8)
-
-# Next Pass display area
-next_pass_ax = fig.add_subplot(grid[5, 0:2])
-next_pass_ax.axis('off')
-next_pass_text = next_pass_ax.text(0.05, 0.95, "Next Passes:", 
-                             ha='left', va='top', fontsize=10,
-                             bbox=dict(facecolor='white', alpha=0.7, 
-                                     edgecolor='gray', boxstyle='round,pad=0.5'))
-
-# Current data display area
-data_ax = fig.add_subplot(grid[5, 2:])
-data_ax.axis('off')
-current_text = data_ax.text(0.5, 0.5, "Azimuth: --- Elevation: ---", 
-                           ha='center', va='center', fontsize=10,
-                           bbox=dict(facecolor='white', alpha=0.7, 
-                                   edgecolor='gray', boxstyle='round,pad=0.5'))
-
-# Current pass indicator
-current_pass_ax = fig.add_subplot(grid[6, 0:3])
-current_pass_ax.axis('off')
-current_pass_text = current_pass_ax.text(0.05, 0.5, "Current Pass: ---", 
-                                      ha='left', va='center', fontsize=10,
-                                      bbox=dict(facecolor='white', alpha=0.7, 
-                                              edgecolor='gray', boxstyle='round,pad=0.5'))
-
-# Animation update function - just draws the static elements
-def update_animation(frame):
-    return position_marker, satellite_line, pass_start_marker, pass_end_marker, tracking_line, status_text, current_text, next_pass_text, current_pass_text
-
-# Set up simple animation
-ani = FuncAnimation(fig, update_animation, interval=ANIMATION_INTERVAL, blit=False, cache_frame_data=False)
+class EzTrackApp:
+    """The EZ-Trak tracker window, built inside a Tk root or a launcher Toplevel.
+
+    The TLE store and pass cache can be passed in so a launcher hosting
+    several windows shares them instead of loading its own copies.
+    """
+
+    def __init__(self, root, location=(DEFAULT_LAT, DEFAULT_LON, DEFAULT_ALT),
+                 satellites=USER_SELECTED_SATELLITES, min_elevation=MIN_ELEVATION,
+                 tle_store=None, pass_cache=None, simulate=SIMULATE_DEVICE, track_filter=None,
+                 show_stats=SHOW_STATS, replay=REPLAY_FILE, replay_speed=REPLAY_SPEED, tune=TUNE_RADIO,
+                 doppler_rate=DOPPLER_RATE):
+        self.root = root
+        self.root.title('EZ-Trak')
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.satellites = list(satellites)
+        self.min_elevation = min_elevation
+
+        # Data storage
+        self.trace = TraceStore()  # Recorded (time, az, el, rssi) samples for the tracking line
+        self.is_tracking = False  # Flag to indicate if we're tracking position
+        self.recorder = None  # RecordingWriter while a recording is in progress
+        self.predictor = None  # PassPredictor for the selected satellites
+        self.passes = []  # Upcoming passes, sorted by AOS
+        self.pass_index = 0  # Pass currently drawn on the polar plot
+        self.ephemeris = None  # PassEphemeris table of the shown pass, for per-frame lookups
+        self.tle_store = tle_store or TLEStore()  # Local TLE cache shared with the launcher and rotator app
+        self.pass_cache = pass_cache or PassCache()  # Predicted passes, shared with the launcher and rotator app
+        self.instruments = Instruments("eztrack")  # Latency, frame and prediction time histograms
+        self.show_stats = show_stats
+        self._stats_shown_at = 0.0
+        self._undrawn = None  # BLE arrival times of samples not yet on screen
+        self.replay_meter = None  # ThroughputMeter while replaying a recorded session
+        self._replay_line = ""  # Sustained rates shown after the device status
+        self._replay_done = False
+        self._notice = ("", 0.0)  # Message shown instead of the device status, and until when
+        if replay is not None:
+            speed = None if str(replay_speed) == "max" else float(replay_speed)
+            self.device = ReplayReader(replay, speed)
+            self.replay_meter = self.instruments.throughput = ThroughputMeter()
+            recorded = [self.device.metadata.get(key) for key in ("lat", "lon", "alt")]
+            if all(isinstance(value, (int, float)) for value in recorded):
+                # Review the session from where it was recorded
+                location = tuple(recorded)
+        elif simulate:
+            self.device = SimulatedReader()
+        else:
+            self.device = BLEReader(DEVICE_NAME)  # Background sample reader
+        if track_filter is None and FILTER_SAMPLES:
+            track_filter = KalmanFilter()
+        self.track_filter = track_filter  # Smoothing stage with process(t, az, el), or None for raw samples
+        self.decimator = DisplayDecimator()  # Skips redraws for movements below the display threshold
+        self.satellite_decimator = DisplayDecimator()
+        # Range, range rate and Doppler-corrected downlinks, computed (and tuned) in the background
+        self.doppler = DopplerTuner(RigctlClient() if tune else None, doppler_rate)
+        self._doppler_shown = None
+        self.sky_layer = None  # SkyLayer of the whole catalog, built when first shown
+        self.show_sky = False
+
+        # Create figure with modern styling, scoped so other windows in the process keep theirs
+        with style.context('ggplot'):
+            self.fig = Figure(figsize=(7, 9))  # Slightly taller to accommodate controls
+            self.canvas = FigureCanvasTkAgg(self.fig, master=root)
+            self._build_figure(location)
+
+        # Show the figure and start reading the device
+        self.fig.tight_layout()
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.device.start()
+        self.doppler.start()
+
+        # Set up the animation
+        max_speed = self.replay_meter is not None and self.device.speed is None
+        interval = MAX_SPEED_INTERVAL if max_speed else ANIMATION_INTERVAL
+        if USE_BLIT:
+            # Static background is cached on every full draw; ticks blit changed artists only
+            self.blit_manager = BlitManager(self.canvas, self.update_animation(None))
+            self.animation_timer = self.canvas.new_timer(interval=interval)
+            self.animation_timer.add_callback(self.blit_frame)
+            self.animation_timer.start()
+        else:
+            self.ani = FuncAnimation(self.fig, self.animation_frame, interval=interval,
+                                     blit=False, cache_frame_data=False)
+            self.canvas.mpl_connect('draw_event', self._samples_shown)
+
+    def _build_figure(self, location):
+        """Lay out the controls, readouts and polar plot on the figure."""
+        fig = self.fig
+        lat, lon, alt = location
+        # Reorganized grid to move the Next Passes box higher up and add recording controls
+        grid = fig.add_gridspec(8, 4, height_ratios=[0.2, 0.2, 0.1, 0.1, 2.8, 0.8, 0.3, 0.3])
+
+        # Location input area (moved to top)
+        loc_label_ax = fig.add_subplot(grid[0, 0])
+        loc_label_ax.axis('off')
+        loc_label_ax.text(0.05, 0.5, "Location:", ha='left', va='center', fontweight='bold')
+
+        lat_ax = fig.add_subplot(grid[0, 1])
+        self.lat_text = TextBox(lat_ax, 'Lat: ', initial=str(lat), color='lightblue', hovercolor='lightgreen')
+
+        lon_ax = fig.add_subplot(grid[0, 2])
+        self.lon_text = TextBox(lon_ax, 'Lon: ', initial=str(lon), color='lightblue', hovercolor='lightgreen')
+
+        alt_ax = fig.add_subplot(grid[0, 3])
+        self.alt_text = TextBox(alt_ax, 'Alt(m): ', initial=str(alt), color='lightblue', hovercolor='lightgreen')
+
+        self.lat_text.on_submit(self.location_changed)
+        self.lon_text.on_submit(self.location_changed)
+        self.alt_text.on_submit(self.location_changed)
+
+        # Button row
+        update_tle_ax = fig.add_subplot(grid[1, 3])
+        self.update_tle_button = Button(update_tle_ax, 'Update TLE', color='lightblue', hovercolor='lightgreen')
+        self.update_tle_button.on_clicked(self.update_tle)
+
+        # Next Pass button
+        next_pass_button_ax = fig.add_subplot(grid[1, 2])
+        self.next_pass_button = Button(next_pass_button_ax, 'Next Pass', color='lightblue', hovercolor='lightgreen')
+        self.next_pass_button.on_clicked(self.next_pass)
+
+        # Status display area
+        status_ax = fig.add_subplot(grid[1, 0:2])
+        status_ax.axis('off')
+        self.status_text = status_ax.text(0.05, 0.5, "Status: Disconnected",
+                                          ha='left', va='center', fontsize=10, fontweight='bold',
+                                          color='blue', bbox=dict(facecolor='white', alpha=0.8,
+                                                               edgecolor='gray', boxstyle='round,pad=0.5'))
+        self.stats_text = status_ax.text(0.05, 0.0, "", ha='left', va='bottom', fontsize=7,
+                                         family='monospace', color='dimgray', visible=self.show_stats)
+
+        # Reset button moved to bottom row
+        reset_ax = fig.add_subplot(grid[6, 3])
+        self.reset_button = Button(reset_ax, 'Reset Device', color='salmon', hovercolor='red')
+        self.reset_button.on_clicked(lambda event: self.device.send_command("RESET"))
+
+        # Recording control buttons
+        record_ax = fig.add_subplot(grid[7, 0:2])
+        self.record_button = Button(record_ax, 'Start Recording', color='lightgreen', hovercolor='green')
+        self.record_button.on_clicked(self.toggle_recording)
+
+        clear_ax = fig.add_subplot(grid[7, 2])
+        self.clear_button = Button(clear_ax, 'Clear Trace', color='lightcoral', hovercolor='red')
+        self.clear_button.on_clicked(self.clear_trace)
+
+        sky_ax = fig.add_subplot(grid[7, 3])
+        self.sky_button = Button(sky_ax, 'Sky View', color='lightblue', hovercolor='lightgreen')
+        self.sky_button.on_clicked(self.toggle_sky_view)
+
+        # Create the main circular plot
+        ax = self.ax = fig.add_subplot(grid[2:5, :], polar=True)
+        ax.set_theta_zero_location('N')  # 0 degrees at North
+        ax.set_theta_direction(-1)  # Clockwise
+        ax.set_rlim(0, 72)  # Set max radius to 90*0.8 to match our 20% reduction
+        ax.set_yticklabels([])  # Hide radial ticks
+
+        # Add compass labels
+        ax.set_xticks(np.pi/180. * np.array([0, 90, 180, 270]))
+        ax.set_xticklabels(['N (0°)', 'E (90°)', 'S (180°)', 'W (270°)'])
+
+        # Add concentric circles for elevation - including 0° for the horizon
+        elevation_circles = [0, 15, 30, 45, 60, 75]
+        for elevation in elevation_circles:
+            # Apply 20% reduction for consistency with other parts of the code
+            radius = (90-elevation) * 0.8
+            circle = Circle((0, 0), radius, transform=ax.transData._b,
+                            fill=False, edgecolor='gray', alpha=0.5, ls='--')
+            ax.add_artist(circle)
+            ax.text(0, radius, f"{elevation}°", ha='center', va='bottom',
+                   bbox=dict(facecolor='white', alpha=0.7, edgecolor='none'))
+
+        # Center text for 90° elevation
+        ax.text(0, 0, "90°", ha='center', va='center',
+               bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'))
+
+        # Add crosshair (horizontal and vertical lines through the center)
+        ax.axhline(y=0, color='gray', linestyle='-', alpha=0.5)
+        ax.axvline(x=0, color='gray', linestyle='-', alpha=0.5)
+
+        # Initialize the position marker (red dot for current position)
+        self.position_marker, = ax.plot([], [], 'ro', markersize=10)
+
+        # Initialize the satellite pass lines
+        self.satellite_line, = ax.plot([], [], 'b-', linewidth=2, alpha=0.7)
+        self.pass_start_marker, = ax.plot([], [], 'go', markersize=8)
+        self.pass_end_marker, = ax.plot([], [], 'yo', markersize=8)
+        self.satellite_marker, = ax.plot([], [], 'bD', markersize=7)  # Where the satellite is now
+
+        # Initialize the tracking line (red line for tracked positions)
+        self.tracking_line, = ax.plot([], [], 'r-', linewidth=2, alpha=0.8)
+
+        # Next Pass display area
+        next_pass_ax = fig.add_subplot(grid[5, 0:2])
+        next_pass_ax.axis('off')
+        self.next_pass_text = next_pass_ax.text(0.05, 0.95, "Next Passes:",
+                                                ha='left', va='top', fontsize=10,
+                                                bbox=dict(facecolor='white', alpha=0.7,
+                                                        edgecolor='gray', boxstyle='round,pad=0.5'))
+
+        # Current data display area
+        data_ax = fig.add_subplot(grid[5, 2:])
+        data_ax.axis('off')
+        self.current_text = data_ax.text(0.5, 0.5, "Azimuth: --- Elevation: ---",
+                                         ha='center', va='center', fontsize=10,
+                                         bbox=dict(facecolor='white', alpha=0.7,
+                                                 edgecolor='gray', boxstyle='round,pad=0.5'))
+        self.doppler_text = data_ax.text(0.5, 0.0, "", ha='center', va='bottom', fontsize=8, color='dimgray')
+
+        # Current pass indicator
+        current_pass_ax = fig.add_subplot(grid[6, 0:3])
+        current_pass_ax.axis('off')
+        self.current_pass_text = current_pass_ax.text(0.05, 0.5, "Current Pass: ---",
+                                                      ha='left', va='center', fontsize=10,
+                                                      bbox=dict(facecolor='white', alpha=0.7,
+                                                              edgecolor='gray', boxstyle='round,pad=0.5'))
+
+    def location(self):
+        """The entered (lat, lon, alt); raises ValueError if a field is not a number."""
+        return float(self.lat_text.text), float(self.lon_text.text), float(self.alt_text.text)
+
+    def load_selected_tles(self):
+        """Return the (name, line1, line2) entries of the selected satellites from the TLE store."""
+        return self.tle_store.entries(self.satellites)
+
+    def compute_passes(self):
+        """Predict passes for all selected satellites at the entered location."""
+        tles = self.load_selected_tles()
+        if not tles:
+            self.notify("No TLE data")
+            return
+        try:
+            lat, lon, alt = self.location()
+        except ValueError:
+            self.notify("Invalid location")
+            return
+        started = time.perf_counter()
+        if self.predictor is None or self.predictor.tles != tles:
+            self.predictor = PassPredictor(tles, lat, lon, alt, self.min_elevation, keep_states=True)
+        else:
+            # Same satellites: the kept states are re-used, only the new location is transformed
+            self.predictor.set_location(lat, lon, alt)
+            self.predictor.min_elevation = float(self.min_elevation)
+        self.passes = self.pass_cache.find_passes(self.predictor, PREDICTION_DAYS)
+        self.instruments.record(PREDICTION, time.perf_counter() - started)
+        self.pass_index = 0
+
+    def location_changed(self, text=None):
+        """Drop the passes predicted for the old location; they are re-predicted on demand."""
+        self.pass_cache.clear()
+        if self.sky_layer is not None:
+            try:
+                self.sky_layer.set_location(*self.location())
+            except ValueError:
+                pass
+        if self.passes:
+            self.passes = []
+            self.next_pass()
+
+    def show_pass(self, index):
+        """Draw pass `index` on the polar plot and list the passes that follow it."""
+        sat_pass = self.passes[index]
+        self.ephemeris = PassEphemeris(self.predictor, sat_pass)
+        self.satellite_decimator.reset()
+        azimuth, elevation = self.ephemeris.track()
+        theta = np.radians(azimuth)
+        r = (90 - elevation) * 0.8
+        self.satellite_line.set_data(theta, r)
+        self.pass_start_marker.set_data(theta[:1], r[:1])
+        self.pass_end_marker.set_data(theta[-1:], r[-1:])
+        upcoming = [format_pass(p) for p in self.passes[index:index + 3]]
+        self.next_pass_text.set_text("Next Passes:\n" + "\n".join(upcoming))
+        self.current_pass_text.set_text(f"Current Pass: {format_pass(sat_pass)}")
+        self.doppler.set_target(self.ephemeris, DOWNLINKS.get(sat_pass.name, []))
+        if FUSE_PREDICTION and hasattr(self.track_filter, "predicted"):
+            self.track_filter.predicted = self.ephemeris
+
+    def next_pass(self, event=None):
+        """Show the next predicted pass, predicting passes first if needed."""
+        if not self.passes:
+            self.compute_passes()
+            if not self.passes:
+                self.next_pass_text.set_text("Next Passes:\nNone found")
+                self.ephemeris = None
+                self.satellite_marker.set_data([], [])
+                self.doppler.set_target(None, [])
+                return
+        else:
+            self.pass_index = (self.pass_index + 1) % len(self.passes)
+        self.show_pass(self.pass_index)
+        if not USE_BLIT:
+            # Blitted, the pass artists are redrawn on the next tick without a full figure draw
+            self.canvas.draw_idle()
+
+    def update_tle(self, event=None):
+        """Revalidate the cached TLE sources in the background; tle_updated() follows."""
+        if self.tle_store.refresh_in_background(self.root, self.tle_updated, force=True):
+            self.notify("Updating TLE...")
+            self.canvas.draw_idle()
+
+    def tle_updated(self, results):
+        """Report a finished TLE refresh and re-predict passes."""
+        errors = [source for source, result in results.items() if result.startswith("error")]
+        if errors:
+            self.notify(f"TLE update failed ({', '.join(errors)})")
+        else:
+            self.notify("TLE updated")
+        if "updated" in results.values():
+            self.pass_cache.clear()
+        if self.passes:
+            self.passes = []
+            self.next_pass()
+        self.canvas.draw_idle()
+
+    def notify(self, message):
+        """Show a message in the status line for NOTICE_SECONDS, then the device status again."""
+        self._notice = (message, time.time() + NOTICE_SECONDS)
+        self.status_text.set_text(f"Status: {message}")
+
+    def recording_metadata(self):
+        """Header fields for a new recording: observer, selected satellite and its TLE."""
+        metadata = {"created": time.time(), "device": DEVICE_NAME,
+                    "lat": self.lat_text.text, "lon": self.lon_text.text, "alt": self.alt_text.text,
+                    "filter": self.track_filter.settings() if hasattr(self.track_filter, "settings") else None}
+        try:
+            lat, lon, alt = self.location()
+            metadata.update(lat=lat, lon=lon, alt=alt)
+        except ValueError:
+            pass
+        if self.passes:
+            sat_pass = self.passes[self.pass_index]
+            name, line1, line2 = self.predictor.tles[sat_pass.index]
+            satrec = self.predictor.satrecs[sat_pass.index]
+            metadata.update(satellite=name, tle=[line1, line2],
+                            tle_epoch=satrec.jdsatepoch + satrec.jdsatepochF)
+        return metadata
+
+    def toggle_recording(self, event=None):
+        """Start or stop recording device samples to the trace and a session file."""
+        self.is_tracking = not self.is_tracking
+        if self.is_tracking:
+            os.makedirs(RECORDINGS_DIR, exist_ok=True)
+            path = os.path.join(RECORDINGS_DIR, time.strftime("%Y%m%d-%H%M%S.ezt"))
+            self.recorder = RecordingWriter(path, self.recording_metadata())
+        elif self.recorder is not None:
+            self.recorder.close()
+            self.notify(f"Recording saved to {self.recorder.path}")
+            self.recorder = None
+        self.record_button.label.set_text('Stop Recording' if self.is_tracking else 'Start Recording')
+        self.canvas.draw_idle()
+
+    def clear_trace(self, event=None):
+        """Empty the trace; the store keeps its buffers for the next recording."""
+        self.trace.clear()
+        self.tracking_line.set_data([], [])
+
+    def toggle_sky_view(self, event=None):
+        """Show or hide every catalog satellite currently above the horizon."""
+        if self.sky_layer is None:
+            tles = self.tle_store.entries()
+            if not tles:
+                self.notify("No TLE data")
+                return
+            try:
+                location = self.location()
+            except ValueError:
+                self.notify("Invalid location")
+                return
+            # Below the pass line and markers, same radius scale as the rest of the plot
+            self.sky_layer = SkyLayer(self.ax, tles, location, radius_scale=0.8, zorder=1.5)
+            if USE_BLIT:
+                self.blit_manager.add_artist(self.sky_layer.collection)
+        self.show_sky = not self.show_sky
+        if not self.show_sky:
+            self.sky_layer.clear()
+        self.sky_button.label.set_text('Hide Sky' if self.show_sky else 'Sky View')
+        self.canvas.draw_idle()
+
+    def update_animation(self, frame):
+        """Animation update function - drains the device buffer and updates the dynamic artists."""
+        if time.time() - self._stats_shown_at >= STATS_INTERVAL:
+            self._stats_shown_at = time.time()
+            if self.show_stats:
+                self.stats_text.set_text(self.instruments.overlay_text())
+            if self.replay_meter is not None and not self._replay_done:
+                self._replay_line = f" ({self.replay_meter.line()})"
+        message, shown_until = self._notice
+        if time.time() < shown_until:
+            status = f"Status: {message}"
+        else:
+            status = f"Status: {self.device.status}{self._replay_line}"
+        if self.status_text.get_text() != status:
+            self.status_text.set_text(status)
+        if self.show_sky:
+            self.sky_layer.update()
+        if self.ephemeris is not None:
+            # Table lookup, no SGP4 in the animation loop
+            direction = self.ephemeris.direction(time.time())
+            if direction is None:
+                if len(self.satellite_marker.get_xdata()):
+                    self.satellite_marker.set_data([], [])
+                    self.satellite_decimator.reset()
+            elif self.satellite_decimator.changed(*direction):
+                self.satellite_marker.set_data([np.radians(direction[0])], [(90 - direction[1]) * 0.8])
+        rig = self.doppler.rig
+        doppler = (self.doppler.latest, rig.status if rig is not None else None)
+        if doppler != self._doppler_shown:
+            # Only reads the tuner thread's latest values
+            self._doppler_shown = doppler
+            text = format_sample(self.doppler.latest) if self.ephemeris is not None else ""
+            if rig is not None and rig.status != "Connected":
+                text += f"\nRadio: {rig.status}"
+            self.doppler_text.set_text(text)
+        t, az, el = self.device.ring.drain()
+        if self.replay_meter is not None and not self._replay_done:
+            self.replay_progress(az.size)
+        if az.size:
+            self._undrawn = t
+            if self.track_filter is not None:
+                t, az, el = self.track_filter.process(t, az, el)
+            if self.is_tracking:
+                self.trace.extend(t, az, el)
+                if self.recorder is not None:
+                    self.recorder.append(t, az, el)
+            # Artists are only touched (and so redrawn) when the position visibly moved
+            if self.decimator.changed(az[-1], el[-1]):
+                self.position_marker.set_data([np.radians(az[-1])], [(90 - el[-1]) * 0.8])
+                self.current_text.set_text(f"Azimuth: {az[-1]:.1f}° Elevation: {el[-1]:.1f}°")
+                if self.is_tracking:
+                    self.tracking_line.set_data(np.radians(self.trace.column('az')),
+                                                (90 - self.trace.column('el')) * 0.8)
+        return (self.position_marker, self.satellite_line, self.pass_start_marker, self.pass_end_marker,
+                self.satellite_marker, self.tracking_line, self.status_text, self.current_text, self.next_pass_text,
+                self.current_pass_text, self.stats_text, self.doppler_text)
+
+    def replay_progress(self, samples):
+        """Count a replay frame; keep the sustained rates in the status line once the session is through."""
+        if self.device.finished and samples == 0 and not len(self.device.ring):
+            self._replay_done = True
+            self._replay_line = f" (replayed {len(self.device)} samples: {self.replay_meter.line()})"
+            return
+        self.replay_meter.frame(samples)
+
+    def animation_frame(self, frame):
+        """FuncAnimation callback for the non-blitted mode: the update, timed."""
+        started = time.perf_counter()
+        artists = self.update_animation(frame)
+        self.instruments.record(FRAME, time.perf_counter() - started)
+        return artists
+
+    def blit_frame(self):
+        """Timer callback for the blitted rendering mode."""
+        started = time.perf_counter()
+        self.update_animation(None)
+        self.blit_manager.update()
+        self._samples_shown()
+        self.instruments.record(FRAME, time.perf_counter() - started)
+
+    def _samples_shown(self, event=None):
+        """Record the BLE-notification-to-screen latency of the samples just drawn."""
+        if self._undrawn is not None:
+            self.instruments.record_many(BLE_TO_SCREEN, time.time() - self._undrawn)
+            self._undrawn = None
+
+    def dump_stats(self, path=None):
+        """Write the timing histograms as JSON; returns the file path."""
+        return self.instruments.dump(path)
+
+    def on_close(self):
+        """Stop the device and any recording, then close the window."""
+        if USE_BLIT:
+            self.animation_timer.stop()
+        else:
+            self.ani.event_source.stop()
+        self.device.stop()
+        self.doppler.close()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.show_stats:
+            messagebox.showinfo("Timing statistics", f"Timing statistics written to {self.dump_stats()}",
+                                parent=self.root)
+        self.root.destroy()
 
 # Main function just shows the GUI
 def main():
-    # Show the plot (blocks until window is closed)
-    plt.tight_layout()
-    plt.show()
+    root = tk.Tk()
+    app = EzTrackApp(root)
+    # Blocks until the window is closed
+    root.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
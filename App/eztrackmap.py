@@ -0,0 +1,199 @@
+# EZ_TRAK_MAP.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Ground tracks and coverage footprints of the selected satellites on a world map
+#
+# The map is plain longitude/latitude axes over the bundled coastline (see
+# coastline.py). Every artist is created once and updated in place: the
+# ground tracks are re-propagated every TRACK_REFRESH seconds in one
+# SatrecArray call for all satellites, and each tick only propagates the
+# current positions and moves the markers and footprint outlines. The
+# changed artists are blitted, so the view stays cheap next to the tracker.
+
+import tkinter as tk
+import matplotlib
+matplotlib.use('TkAgg')
+from matplotlib.animation import FuncAnimation
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+import numpy as np
+import time
+from blitting import BlitManager
+from coastline import load_coastline, split_dateline
+from passpredict import EARTH_FLATTENING, EARTH_RADIUS, PassPredictor, ecef_positions, topocentric
+from tlestore import TLEStore
+
+# Configuration
+MAP_INTERVAL = 1000  # Milliseconds between position updates
+USE_BLIT = True  # Only redraw changed artists over a cached static background
+TRACK_PAST = 600.0  # Seconds of ground track drawn behind each satellite
+TRACK_AHEAD = 6000.0  # Seconds drawn ahead (about one low-orbit revolution)
+TRACK_STEP = 30.0  # Seconds between ground track points
+TRACK_REFRESH = 60.0  # Seconds between ground track recomputations
+FOOTPRINT_POINTS = 73  # Points per footprint outline
+
+# Default location
+DEFAULT_LAT = 01.234567  # Default latitude
+DEFAULT_LON = 0.123456  # Default longitude
+DEFAULT_ALT = 1337  # Default altitude in meters
+MIN_ELEVATION = 20  # Footprint edge: minimum elevation in degrees
+
+# User can edit these satellites
+USER_SELECTED_SATELLITES = [
+    "NOAA 19",
+    "METOP-C",
+]
+
+
+def subsatellite_points(r_ecef):
+    """Geodetic latitude, longitude (degrees) and height (km) below ECEF positions (..., 3)."""
+    x, y, z = r_ecef[..., 0], r_ecef[..., 1], r_ecef[..., 2]
+    e2 = EARTH_FLATTENING * (2 - EARTH_FLATTENING)
+    p = np.hypot(x, y)
+    lat = np.arctan2(z, p * (1 - e2))
+    for _ in range(3):
+        n = EARTH_RADIUS / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+        height = p / np.cos(lat) - n
+        lat = np.arctan2(z, p * (1 - e2 * n / (n + height)))
+    n = EARTH_RADIUS / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+    return np.degrees(lat), np.degrees(np.arctan2(y, x)), p / np.cos(lat) - n
+
+
+def footprint(lat, lon, height, min_elevation, points=FOOTPRINT_POINTS):
+    """Outlines (lon, lat), each (n_sats, points), of where each satellite is above min_elevation."""
+    elevation = np.radians(min_elevation)
+    # Earth central angle from the sub-satellite point to the footprint edge
+    reach = np.arccos(EARTH_RADIUS / (EARTH_RADIUS + np.asarray(height)) * np.cos(elevation)) - elevation
+    reach = reach[:, None]
+    bearing = np.linspace(0.0, 2 * np.pi, points)
+    lat_r = np.radians(lat)[:, None]
+    edge_lat = np.arcsin(np.sin(lat_r) * np.cos(reach) + np.cos(lat_r) * np.sin(reach) * np.cos(bearing))
+    edge_lon = np.radians(lon)[:, None] + np.arctan2(np.sin(bearing) * np.sin(reach) * np.cos(lat_r),
+                                                     np.cos(reach) - np.sin(lat_r) * np.sin(edge_lat))
+    return (np.degrees(edge_lon) + 180.0) % 360.0 - 180.0, np.degrees(edge_lat)
+
+
+class MapApp:
+    """World map of the selected satellites, built inside a Tk root or a launcher Toplevel."""
+
+    def __init__(self, root, location=(DEFAULT_LAT, DEFAULT_LON, DEFAULT_ALT),
+                 satellites=USER_SELECTED_SATELLITES, min_elevation=MIN_ELEVATION,
+                 tle_store=None, pass_cache=None):
+        # pass_cache is accepted for the launcher's shared settings; the map predicts no passes
+        self.root = root
+        self.root.title("EZ-Trak Ground Track")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.location = tuple(float(value) for value in location)
+        self.min_elevation = float(min_elevation)
+        self.tle_store = tle_store or TLEStore()
+        tles = self.tle_store.entries(list(satellites))
+        # Only the satellites' SatrecArray and the observer are used
+        self.predictor = PassPredictor(tles, *self.location, self.min_elevation) if tles else None
+        self._tracks_at = None  # Time the ground tracks were last computed
+
+        self.fig = Figure(figsize=(9, 5))
+        self.canvas = FigureCanvasTkAgg(self.fig, master=root)
+        self._build_figure()
+        self.fig.tight_layout()
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        if USE_BLIT:
+            # Static background (coastline, grid) is cached; ticks blit the moving artists only
+            self.blit_manager = BlitManager(self.canvas, self.update_map(None))
+            self.animation_timer = self.canvas.new_timer(interval=MAP_INTERVAL)
+            self.animation_timer.add_callback(self.blit_frame)
+            self.animation_timer.start()
+        else:
+            self.ani = FuncAnimation(self.fig, self.update_map, interval=MAP_INTERVAL,
+                                     blit=False, cache_frame_data=False)
+
+    def _build_figure(self):
+        """Lay out the map: coastline, graticule, observer and one set of artists per satellite."""
+        ax = self.ax = self.fig.add_subplot(111)
+        ax.set_xlim(-180, 180)
+        ax.set_ylim(-90, 90)
+        ax.set_aspect('equal')
+        ax.set_xticks(range(-180, 181, 60))
+        ax.set_yticks(range(-90, 91, 30))
+        ax.set_facecolor('#eef4fa')
+        ax.grid(True, color='white', linewidth=0.8)
+
+        coastline = load_coastline()
+        if coastline is not None:
+            ax.plot(*coastline, color='dimgray', linewidth=0.6)
+        else:
+            ax.text(0.5, 0.02, "Coastline data not installed (python coastline.py build <file>)",
+                    transform=ax.transAxes, ha='center', va='bottom', fontsize=8, color='gray')
+
+        lat, lon, _ = self.location
+        ax.plot([lon], [lat], 'r^', markersize=8)  # Observer
+
+        names = self.predictor.names if self.predictor is not None else []
+        self.track_lines, self.footprint_lines, self.markers, self.labels = [], [], [], []
+        for i, name in enumerate(names):
+            color = f"C{i}"
+            self.track_lines.append(ax.plot([], [], '-', color=color, linewidth=1.2, alpha=0.8)[0])
+            self.footprint_lines.append(ax.plot([], [], '-', color=color, linewidth=1.0, alpha=0.5)[0])
+            self.markers.append(ax.plot([], [], 'o', color=color, markersize=7)[0])
+            self.labels.append(ax.text(0, 0, "", color=color, fontsize=8, va='bottom', clip_on=True))
+        if not names:
+            ax.set_title("No TLE data for the selected satellites", fontsize=10)
+
+    def _update_tracks(self, now):
+        """Recompute every ground track in one propagation call."""
+        self._tracks_at = now
+        t = now + np.arange(-TRACK_PAST, TRACK_AHEAD + TRACK_STEP, TRACK_STEP)
+        r, error = ecef_positions(self.predictor.sat_array, t)
+        lat, lon, _ = subsatellite_points(r)
+        lat[error], lon[error] = np.nan, np.nan
+        for line, track_lon, track_lat in zip(self.track_lines, lon, lat):
+            line.set_data(*split_dateline(track_lon, track_lat))
+
+    def update_map(self, frame):
+        """Animation update function - moves the satellites and returns the dynamic artists."""
+        artists = tuple(self.track_lines + self.footprint_lines + self.markers + self.labels)
+        if self.predictor is None:
+            return artists
+        now = time.time()
+        if self._tracks_at is None or now - self._tracks_at >= TRACK_REFRESH:
+            self._update_tracks(now)
+        r, error = ecef_positions(self.predictor.sat_array, [now])
+        r, error = r[:, 0], error[:, 0]
+        lat, lon, height = subsatellite_points(r)
+        edge_lon, edge_lat = footprint(lat, lon, height, self.min_elevation)
+        _, elevation, _ = topocentric(r, *self.location)
+        for i, name in enumerate(self.predictor.names):
+            if error[i]:
+                self.markers[i].set_data([], [])
+                self.footprint_lines[i].set_data([], [])
+                self.labels[i].set_text("")
+                continue
+            self.markers[i].set_data([lon[i]], [lat[i]])
+            self.footprint_lines[i].set_data(*split_dateline(edge_lon[i], edge_lat[i]))
+            in_view = " (in view)" if elevation[i] >= self.min_elevation else ""
+            self.labels[i].set_position((lon[i], lat[i] + 2))
+            self.labels[i].set_text(f" {name}{in_view}")
+        return artists
+
+    def blit_frame(self):
+        """Timer callback for the blitted rendering mode."""
+        self.update_map(None)
+        self.blit_manager.update()
+
+    def on_close(self):
+        """Stop the updates and close the window."""
+        if USE_BLIT:
+            self.animation_timer.stop()
+        else:
+            self.ani.event_source.stop()
+        self.root.destroy()
+
+def main():
+    """Main function to start the application."""
+    root = tk.Tk()
+    app = MapApp(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
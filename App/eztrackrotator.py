@@ -1,27 +1,42 @@
 # EZ_TRACK_ROTATOR.py
 # MIT License
 # Copyright (c) 2025 Benb0jangles
-# Simplified GUI-only version with no functionality
+# Satellite pass tracking with a hamlib rotctld rotator controller
 
 import tkinter as tk
 from tkinter import ttk
+from tkinter import messagebox
 import matplotlib
 matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
 import numpy as np
+import sys
+import time
+from blitting import BlitManager
+from instruments import FRAME, PREDICTION, ROTCTL_ROUND_TRIP, Instruments
+from passpredict import PassPredictor, format_pass
+from passcache import PassCache
+from rotctl import RotctlClient
+from trackscheduler import TrackScheduler
+from tlestore import TLEStore
 
 # Configuration
 DEFAULT_IP = "192.168.1.100"  # Default IP address of the ESP32-S3
 DEFAULT_PORT = 4533  # Default port for rotctl (standard for hamlib)
 ANIMATION_INTERVAL = 100  # Animation update interval in milliseconds
+USE_BLIT = True  # Only redraw changed artists over a cached static background
+SHOW_STATS = "--stats" in sys.argv  # Timing readout next to the status, dumped as JSON on close
+STATS_INTERVAL = 1.0  # Seconds between refreshes of the timing readout
 
 # Default location
 DEFAULT_LAT = 01.234567  # Default latitude
 DEFAULT_LON = 0.123456  # Default longitude
 DEFAULT_ALT = 1337  # Default altitude in meters
 MIN_ELEVATION = 20  # Minimum elevation in degrees for satellite passes
+PREDICTION_DAYS = 2  # How far ahead to search for passes
 
 # Rotator limits
 MIN_AZ = 0
@@ -37,12 +52,30 @@ USER_SELECTED_SATELLITES = [
 ]
 
 class RotatorApp:
-    def __init__(self, root):
+    def __init__(self, root, location=(DEFAULT_LAT, DEFAULT_LON, DEFAULT_ALT),
+                 satellites=USER_SELECTED_SATELLITES, min_elevation=MIN_ELEVATION,
+                 tle_store=None, pass_cache=None, show_stats=SHOW_STATS):
+        # root may be a Tk root or a launcher Toplevel; the stores are shared when given
         self.root = root
         self.root.title("EZ-Track Rotator Control")
         self.root.geometry("1000x800")
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
+        # Pass prediction state
+        self.predictor = None
+        self.passes = []
+        self.pass_index = 0
+        self.satellites = list(satellites)
+        self.min_elevation = min_elevation
+        self.tle_store = tle_store or TLEStore()
+        self.pass_cache = pass_cache or PassCache()  # Shared with the launcher and the tracker app
+        self.rotator = None  # RotctlClient while connected
+        self._shown_position = None  # Last rotator position drawn on the plot
+        self.scheduler = None  # TrackScheduler while tracking a pass
+        self.instruments = Instruments("rotator")  # Frame, prediction and rotctl round-trip histograms
+        self.show_stats = show_stats
+        self._stats_shown_at = 0.0
+        
         # Create the main frame
         self.main_frame = ttk.Frame(root, padding="10")
         self.main_frame.pack(fill=tk.BOTH, expand=True)
@@ -63,12 +96,8 @@ class RotatorApp:
         self.port_entry = ttk.Entry(self.top_frame, textvariable=self.port_var, width=6)
         self.port_entry.pack(side=tk.LEFT, padx=5)
         
-        # Dummy function for all buttons
-        def dummy_function(*args, **kwargs):
-            pass
-        
         # Connect button
-        self.connect_button = ttk.Button(self.top_frame, text="Connect", command=dummy_function)
+        self.connect_button = ttk.Button(self.top_frame, text="Connect", command=self.toggle_connection)
         self.connect_button.pack(side=tk.LEFT, padx=10)
         
         # Status label
@@ -76,28 +105,34 @@ class RotatorApp:
         self.status_label = ttk.Label(self.top_frame, textvariable=self.status_var, foreground="red")
         self.status_label.pack(side=tk.LEFT, padx=10)
         
+        # Timing readout
+        self.stats_var = tk.StringVar(value="")
+        self.stats_label = ttk.Label(self.top_frame, textvariable=self.stats_var, foreground="gray")
+        if self.show_stats:
+            self.stats_label.pack(side=tk.LEFT, padx=10)
+        
         # Create the location frame
         self.location_frame = ttk.LabelFrame(self.main_frame, text="Observer Location", padding="5")
         self.location_frame.pack(fill=tk.X, pady=5)
         
         # Location entries
         ttk.Label(self.location_frame, text="Latitude:").grid(row=0, column=0, padx=5, pady=2, sticky=tk.W)
-        self.lat_var = tk.StringVar(value=str(DEFAULT_LAT))
+        self.lat_var = tk.StringVar(value=str(location[0]))
         self.lat_entry = ttk.Entry(self.location_frame, textvariable=self.lat_var, width=10)
         self.lat_entry.grid(row=0, column=1, padx=5, pady=2)
         
         ttk.Label(self.location_frame, text="Longitude:").grid(row=0, column=2, padx=5, pady=2, sticky=tk.W)
-        self.lon_var = tk.StringVar(value=str(DEFAULT_LON))
+        self.lon_var = tk.StringVar(value=str(location[1]))
         self.lon_entry = ttk.Entry(self.location_frame, textvariable=self.lon_var, width=10)
         self.lon_entry.grid(row=0, column=3, padx=5, pady=2)
         
         ttk.Label(self.location_frame, text="Altitude (m):").grid(row=0, column=4, padx=5, pady=2, sticky=tk.W)
-        self.alt_var = tk.StringVar(value=str(DEFAULT_ALT))
+        self.alt_var = tk.StringVar(value=str(location[2]))
         self.alt_entry = ttk.Entry(self.location_frame, textvariable=self.alt_var, width=6)
         self.alt_entry.grid(row=0, column=5, padx=5, pady=2)
         
         # Update location button
-        self.update_loc_button = ttk.Button(self.location_frame, text="Update Location", command=dummy_function)
+        self.update_loc_button = ttk.Button(self.location_frame, text="Update Location", command=self.update_location)
         self.update_loc_button.grid(row=0, column=6, padx=10, pady=2)
         
         # Create the control frame with two columns
@@ -125,15 +160,15 @@ class RotatorApp:
         self.target_el_entry.grid(row=3, column=1, sticky=tk.W, pady=5)
         
         # Move button
-        self.move_button = ttk.Button(self.manual_frame, text="Move to Position", command=dummy_function)
+        self.move_button = ttk.Button(self.manual_frame, text="Move to Position", command=self.move_to_target)
         self.move_button.grid(row=4, column=0, columnspan=2, pady=10)
         
         # Home button
-        self.home_button = ttk.Button(self.manual_frame, text="Home Rotator", command=dummy_function)
+        self.home_button = ttk.Button(self.manual_frame, text="Home Rotator", command=self.home_rotator)
         self.home_button.grid(row=5, column=0, columnspan=2, pady=5)
         
         # Stop button
-        self.stop_button = ttk.Button(self.manual_frame, text="Stop", command=dummy_function)
+        self.stop_button = ttk.Button(self.manual_frame, text="Stop", command=self.stop_rotator)
         self.stop_button.grid(row=6, column=0, columnspan=2, pady=5)
         
         # Right column - Satellite tracking
@@ -147,12 +182,13 @@ class RotatorApp:
         self.satellite_combo.grid(row=0, column=1, sticky=tk.W, pady=5)
         
         # Set some sample values for the combobox
-        self.satellite_combo['values'] = USER_SELECTED_SATELLITES
-        if USER_SELECTED_SATELLITES:
+        self.satellite_combo['values'] = self.satellites
+        if self.satellites:
             self.satellite_combo.current(0)
+        self.satellite_combo.bind("<<ComboboxSelected>>", self.select_satellite)
         
         # Update TLE button
-        self.update_tle_button = ttk.Button(self.tracking_frame, text="Update TLE Data", command=dummy_function)
+        self.update_tle_button = ttk.Button(self.tracking_frame, text="Update TLE Data", command=self.update_tle)
         self.update_tle_button.grid(row=1, column=0, columnspan=2, pady=5)
         
         # Next pass info
@@ -161,11 +197,11 @@ class RotatorApp:
         ttk.Label(self.tracking_frame, textvariable=self.next_pass_var).grid(row=2, column=1, sticky=tk.W, pady=5)
         
         # Cycle through passes button
-        self.next_pass_button = ttk.Button(self.tracking_frame, text="Next Pass", command=dummy_function)
+        self.next_pass_button = ttk.Button(self.tracking_frame, text="Next Pass", command=self.next_pass)
         self.next_pass_button.grid(row=3, column=0, columnspan=2, pady=5)
         
         # Start tracking button
-        self.track_button = ttk.Button(self.tracking_frame, text="Start Tracking", command=dummy_function)
+        self.track_button = ttk.Button(self.tracking_frame, text="Start Tracking", command=self.toggle_tracking)
         self.track_button.grid(row=4, column=0, columnspan=2, pady=10)
         
         # Create the plot frame
@@ -173,7 +209,7 @@ class RotatorApp:
         self.plot_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
         # Create the circular plot
-        self.fig = plt.figure(figsize=(8, 8))
+        self.fig = Figure(figsize=(8, 8))
         self.ax = self.fig.add_subplot(111, polar=True)
         self.ax.set_theta_zero_location('N')  # 0 degrees at North
         self.ax.set_theta_direction(-1)  # Clockwise
@@ -187,8 +223,8 @@ class RotatorApp:
         elevation_circles = [0, 15, 30, 45, 60, 75]
         for elevation in elevation_circles:
             radius = 90 - elevation
-            circle = plt.Circle((0, 0), radius, transform=self.ax.transData._b, 
-                               fill=False, edgecolor='gray', alpha=0.5, ls='--')
+            circle = Circle((0, 0), radius, transform=self.ax.transData._b, 
+                           fill=False, edgecolor='gray', alpha=0.5, ls='--')
             self.ax.add_artist(circle)
             self.ax.text(0, radius, f"{elevation}°", ha='center', va='bottom',
                        bbox=dict(facecolor='white', alpha=0.7, edgecolor='none'))
@@ -210,15 +246,254 @@ class RotatorApp:
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
-        # Simple animation update function - does nothing
-        def update_plot(frame):
-            return self.position_marker, self.satellite_line, self.pass_start_marker, self.pass_end_marker
-        
         # Set up animation
-        self.ani = FuncAnimation(self.fig, update_plot, interval=ANIMATION_INTERVAL, blit=False)
+        if USE_BLIT:
+            # Static background is cached on every full draw; ticks blit changed artists only
+            self.blit_manager = BlitManager(self.canvas, self.update_plot(None))
+            self.animation_timer = self.canvas.new_timer(interval=ANIMATION_INTERVAL)
+            self.animation_timer.add_callback(self.blit_frame)
+            self.animation_timer.start()
+        else:
+            self.ani = FuncAnimation(self.fig, self.animation_frame, interval=ANIMATION_INTERVAL, blit=False)
+        
+    def update_plot(self, frame):
+        """Animation update function - drives tracking, refreshes the readout and returns the dynamic artists."""
+        if self.scheduler is not None:
+            self.track_step()
+        if self.show_stats and time.time() - self._stats_shown_at >= STATS_INTERVAL:
+            self._stats_shown_at = time.time()
+            self.stats_var.set(self.instruments.overlay_text())
+        if self.rotator is not None:
+            if self.status_var.get() != self.rotator.status:
+                self.status_var.set(self.rotator.status)
+                self.status_label.configure(foreground="green" if self.rotator.connected else "red")
+            position = self.rotator.position
+            if position is not None and position is not self._shown_position:
+                self._shown_position = position
+                az, el = position[0], position[1]
+                self.current_pos_var.set(f"AZ: {az:.1f}° EL: {el:.1f}°")
+                if el > 90:
+                    # Past zenith the dish points back over the opposite azimuth
+                    az, el = az + 180, 180 - el
+                self.position_marker.set_data([np.radians(az)], [90 - el])
+        return self.position_marker, self.satellite_line, self.pass_start_marker, self.pass_end_marker
+    
+    def animation_frame(self, frame):
+        """FuncAnimation callback for the non-blitted mode: the update, timed."""
+        started = time.perf_counter()
+        artists = self.update_plot(frame)
+        self.instruments.record(FRAME, time.perf_counter() - started)
+        return artists
+    
+    def blit_frame(self):
+        """Timer callback for the blitted rendering mode."""
+        started = time.perf_counter()
+        self.update_plot(None)
+        self.blit_manager.update()
+        self.instruments.record(FRAME, time.perf_counter() - started)
+    
+    def dump_stats(self, path=None):
+        """Write the timing histograms as JSON; returns the file path."""
+        return self.instruments.dump(path)
+    
+    def load_selected_tles(self):
+        """Return the (name, line1, line2) entries of the selected satellites from the TLE store."""
+        return self.tle_store.entries(self.satellites)
+    
+    def update_tle(self):
+        """Revalidate the cached TLE sources in the background; tle_updated() follows."""
+        if self.tle_store.refresh_in_background(self.root, self.tle_updated, force=True):
+            self.next_pass_var.set("Updating TLE data...")
+
+    def tle_updated(self, results):
+        """Report a finished TLE refresh and re-predict passes."""
+        errors = [source for source, result in results.items() if result.startswith("error")]
+        if errors:
+            self.next_pass_var.set(f"TLE update failed ({', '.join(errors)})")
+        else:
+            self.next_pass_var.set("TLE data updated")
+        if "updated" in results.values():
+            self.pass_cache.clear()
+        if self.passes:
+            self.passes = []
+            self.next_pass()
+    
+    def compute_passes(self):
+        """Predict passes for all selected satellites at the entered location."""
+        tles = self.load_selected_tles()
+        if not tles:
+            self.next_pass_var.set("No TLE data available")
+            return
+        try:
+            lat = float(self.lat_var.get())
+            lon = float(self.lon_var.get())
+            alt = float(self.alt_var.get())
+        except ValueError:
+            self.next_pass_var.set("Invalid location")
+            return
+        started = time.perf_counter()
+        if self.predictor is None or self.predictor.tles != tles:
+            self.predictor = PassPredictor(tles, lat, lon, alt, self.min_elevation, keep_states=True)
+        else:
+            # Same satellites: the kept states are re-used, only the new location is transformed
+            self.predictor.set_location(lat, lon, alt)
+            self.predictor.min_elevation = float(self.min_elevation)
+        self.passes = self.pass_cache.find_passes(self.predictor, PREDICTION_DAYS)
+        self.instruments.record(PREDICTION, time.perf_counter() - started)
+        self.pass_index = 0
+    
+    def update_location(self):
+        """Forget passes predicted for the old location and re-predict for the new one."""
+        self.pass_cache.clear()
+        self.passes = []
+        self.next_pass()
+    
+    def show_pass(self, index):
+        """Select pass `index` and draw it on the polar plot."""
+        sat_pass = self.passes[index]
+        self.satellite_var.set(sat_pass.name)
+        self.next_pass_var.set(format_pass(sat_pass))
+        azimuth, elevation = self.predictor.pass_track(sat_pass)
+        theta = np.radians(azimuth)
+        r = 90 - elevation
+        self.satellite_line.set_data(theta, r)
+        self.pass_start_marker.set_data(theta[:1], r[:1])
+        self.pass_end_marker.set_data(theta[-1:], r[-1:])
+        if not USE_BLIT:
+            # Blitted, the pass artists are redrawn on the next tick without a full figure draw
+            self.canvas.draw_idle()
+    
+    def next_pass(self):
+        """Cycle to the next predicted pass, predicting passes first if needed."""
+        if not self.passes:
+            self.compute_passes()
+            if not self.passes:
+                if self.predictor is not None:
+                    self.next_pass_var.set("No passes found")
+                return
+        else:
+            self.pass_index = (self.pass_index + 1) % len(self.passes)
+        self.show_pass(self.pass_index)
+    
+    def selected_pass(self):
+        """Index of the pass to track for the satellite chosen in the combobox, or None.
+
+        That is the displayed pass if it belongs to the chosen satellite,
+        otherwise the satellite's first predicted pass.
+        """
+        name = self.satellite_var.get()
+        if self.passes[self.pass_index].name == name:
+            return self.pass_index
+        return next((i for i, sat_pass in enumerate(self.passes) if sat_pass.name == name), None)
+    
+    def select_satellite(self, event=None):
+        """Show the next pass of the satellite chosen in the combobox."""
+        if not self.passes:
+            self.compute_passes()
+            if not self.passes:
+                return
+        index = self.selected_pass()
+        if index is None:
+            self.next_pass_var.set(f"No passes of {self.satellite_var.get()}")
+            return
+        self.pass_index = index
+        self.show_pass(index)
+    
+    def toggle_connection(self):
+        """Connect to rotctld at the entered address, or disconnect."""
+        if self.rotator is not None:
+            self.rotator.close()
+            self.rotator = None
+            self.scheduler = None
+            self.track_button.configure(text="Start Tracking")
+            self.status_var.set("Disconnected")
+            self.status_label.configure(foreground="red")
+            self.connect_button.configure(text="Connect")
+            return
+        try:
+            port = int(self.port_var.get())
+        except ValueError:
+            self.status_var.set("Invalid port")
+            return
+        self.rotator = RotctlClient(self.ip_var.get().strip(), port,
+                                    round_trips=self.instruments.histograms[ROTCTL_ROUND_TRIP])
+        self.rotator.start()
+        self.connect_button.configure(text="Disconnect")
+    
+    def move_to_target(self):
+        """Send the rotator to the entered target position."""
+        if self.rotator is None:
+            self.status_var.set("Not connected")
+            return
+        try:
+            az = float(self.target_az_var.get())
+            el = float(self.target_el_var.get())
+        except ValueError:
+            self.status_var.set("Invalid target position")
+            return
+        self.rotator.set_position(min(max(az, MIN_AZ), MAX_AZ), min(max(el, MIN_EL), MAX_EL))
+    
+    def home_rotator(self):
+        """Park the rotator."""
+        if self.rotator is not None:
+            self.rotator.park()
+    
+    def stop_rotator(self):
+        """Stop the rotator immediately."""
+        if self.rotator is not None:
+            self.rotator.stop_rotator()
+    
+    def toggle_tracking(self):
+        """Start tracking the chosen satellite's pass with the rotator, or stop tracking."""
+        if self.scheduler is not None:
+            self.scheduler = None
+            self.track_button.configure(text="Start Tracking")
+            return
+        if self.rotator is None:
+            self.status_var.set("Not connected")
+            return
+        if not self.passes:
+            self.compute_passes()
+            if not self.passes:
+                return
+        index = self.selected_pass()
+        if index is None:
+            self.next_pass_var.set(f"No passes of {self.satellite_var.get()}")
+            return
+        self.pass_index = index
+        self.show_pass(index)
+        sat_pass = self.passes[index]
+        self.scheduler = TrackScheduler.from_pass(
+            self.predictor, sat_pass, limits=(MIN_AZ, MAX_AZ, MIN_EL, MAX_EL))
+        mode = " (flipped)" if self.scheduler.flipped else ""
+        self.next_pass_var.set(f"Tracking {format_pass(sat_pass)}{mode}")
+        self.track_button.configure(text="Stop Tracking")
+    
+    def track_step(self):
+        """Send the scheduler's next lead-compensated target, if it has moved past the deadband."""
+        now = time.time()
+        if self.scheduler.finished(now):
+            self.scheduler = None
+            self.track_button.configure(text="Start Tracking")
+            self.next_pass_var.set("Pass complete")
+            return
+        position = self.rotator.position
+        command = self.scheduler.next_command(
+            now, self.rotator.latency, position[:2] if position is not None else None)
+        if command is not None:
+            self.rotator.set_position(*command)
     
     def on_close(self):
         """Handle window close event."""
+        if USE_BLIT:
+            self.animation_timer.stop()
+        else:
+            self.ani.event_source.stop()
+        if self.rotator is not None:
+            self.rotator.close()
+        if self.show_stats:
+            messagebox.showinfo("Timing statistics", f"Timing statistics written to {self.dump_stats()}",
+                                parent=self.root)
         self.root.destroy()
 
 def main():
@@ -0,0 +1,168 @@
+# eztrak_analyze.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Offline pointing-accuracy analysis of recorded EZ-TRAK sessions
+#
+# Usage:
+#   python eztrak_analyze.py ~/.eztrak/recordings/*.ezt
+#   python eztrak_analyze.py sessions/*.ezt --tle weather.txt --workers 8 --csv report.csv
+#   python eztrak_analyze.py raw_session.ezt --kalman
+#
+# For every session the satellite az/el is predicted at each recorded sample
+# time with the same pass predictor that draws the tracker's pass line, and
+# the angular error against the hand-tracked az/el is reported per pass
+# together with the operator's lag and time above the minimum elevation.
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from passpredict import (PassPredictor, SECONDS_PER_DAY, datetime_to_jd, jd_to_datetime,
+                         parse_tle_text, unix_to_jd)
+from recordfile import read_recording
+from satindex import SatelliteIndex
+from trackfilter import angular_separation, filter_session
+
+# Configuration
+MIN_ELEVATION = 30  # Minimum elevation in degrees, as in eztrack.py
+MAX_LAG = 10.0  # Seconds searched either side for the operator lag
+LAG_STEP = 0.25  # Seconds between trial lags
+
+
+def estimate_lag(predictor, jd, az, el):
+    """Seconds by which the recorded pointing trails the satellite (negative: leads).
+
+    Every trial lag is evaluated in one batch; the best one is refined with
+    a parabola through its neighbours.
+    """
+    lags = np.arange(-MAX_LAG, MAX_LAG + LAG_STEP / 2, LAG_STEP)
+    shifted = (jd[None, :] - lags[:, None] / SECONDS_PER_DAY).ravel()
+    pred_az, pred_el, _ = predictor.look_angles(np.zeros(shifted.size, dtype=np.intp), shifted)
+    error = angular_separation(np.tile(az, lags.size), np.tile(el, lags.size), pred_az, pred_el)
+    rms = np.sqrt(np.mean(error.reshape(lags.size, -1) ** 2, axis=1))
+    best = int(np.argmin(rms))
+    if 0 < best < lags.size - 1:
+        y0, y1, y2 = rms[best - 1:best + 2]
+        denominator = y0 - 2 * y1 + y2
+        if denominator > 0:
+            return float(lags[best] + 0.5 * LAG_STEP * (y0 - y2) / denominator)
+    return float(lags[best])
+
+
+def find_tle(metadata, catalog_path=None):
+    """The (name, line1, line2) to analyze against: from a catalog file, else the file header."""
+    name = metadata.get("satellite")
+    if catalog_path is not None:
+        with open(catalog_path) as f:
+            entries = parse_tle_text(f.read())
+        if name is None and len(entries) == 1:
+            return entries[0]
+        index = SatelliteIndex([e[0] for e in entries], [e[1] for e in entries])
+        row = index.lookup(name) if name else None
+        if row is None:
+            raise ValueError(f"satellite {name!r} not found in {catalog_path}")
+        return entries[row]
+    if "tle" not in metadata:
+        raise ValueError("recording has no TLE; pass --tle")
+    return (name or "satellite", metadata["tle"][0], metadata["tle"][1])
+
+
+def analyze_session(path, catalog_path=None, min_elevation=MIN_ELEVATION, kalman=False):
+    """Analyze one recording; returns a list of per-pass result dicts.
+
+    With `kalman` set, raw recordings are Kalman-filtered first (sessions
+    already filtered while recording are used as they are).
+    """
+    metadata, columns = read_recording(path)
+    t, az, el = columns["time"], columns["az"].astype(np.float64), columns["el"].astype(np.float64)
+    if t.size < 2:
+        return []
+    if kalman and not metadata.get("filter"):
+        az, el = filter_session(t, az, el)
+    tle = find_tle(metadata, catalog_path)
+    predictor = PassPredictor([tle], metadata["lat"], metadata["lon"], metadata["alt"], min_elevation)
+
+    jd = unix_to_jd(t)
+    pred_az, pred_el, _ = predictor.look_angles(np.zeros(jd.size, dtype=np.intp), jd)
+    error = angular_separation(az, el, pred_az, pred_el)
+    dt = np.diff(t, append=t[-1])
+    dt[-1] = np.median(dt[:-1])
+
+    start = jd_to_datetime(jd[0])
+    passes = predictor.find_passes(start, days=(jd[-1] - jd[0]) + 1 / SECONDS_PER_DAY)
+    results = []
+    for sat_pass in passes:
+        in_pass = (jd >= datetime_to_jd(sat_pass.aos)) & (jd <= datetime_to_jd(sat_pass.los))
+        if not np.any(in_pass):
+            continue
+        results.append({
+            "file": os.path.basename(path),
+            "satellite": sat_pass.name,
+            "aos": sat_pass.aos.isoformat(),
+            "los": sat_pass.los.isoformat(),
+            "max_elevation": round(sat_pass.max_elevation, 2),
+            "samples": int(np.count_nonzero(in_pass)),
+            "rms_error": round(float(np.sqrt(np.mean(error[in_pass] ** 2))), 3),
+            "max_error": round(float(np.max(error[in_pass])), 3),
+            "lag": round(estimate_lag(predictor, jd[in_pass], az[in_pass], el[in_pass]), 3),
+            "time_above_predicted": round(float(np.sum(dt[in_pass])), 1),
+            "time_above_recorded": round(float(np.sum(dt[in_pass & (el >= min_elevation)])), 1),
+        })
+    return results
+
+
+def _analyze_job(job):
+    path, catalog_path, min_elevation, kalman = job
+    try:
+        return analyze_session(path, catalog_path, min_elevation, kalman)
+    except (OSError, ValueError, KeyError) as e:
+        return [{"file": os.path.basename(path), "error": str(e)}]
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Grade recorded EZ-TRAK sessions against predicted passes.")
+    parser.add_argument("recordings", nargs="+", help="recording files (.ezt)")
+    parser.add_argument("--tle", help="TLE catalog to use instead of the TLE stored in each recording")
+    parser.add_argument("--min-elevation", type=float, default=MIN_ELEVATION,
+                        help=f"minimum pass elevation in degrees (default {MIN_ELEVATION})")
+    parser.add_argument("--kalman", action="store_true",
+                        help="Kalman-filter raw recordings before grading them")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    jobs = [(path, args.tle, args.min_elevation, args.kalman) for path in args.recordings]
+    if len(jobs) == 1 or args.workers == 1:
+        results = [r for job in jobs for r in _analyze_job(job)]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = [r for rs in pool.map(_analyze_job, jobs, chunksize=4) for r in rs]
+
+    if args.csv:
+        fields = sorted({key for r in results for key in r})
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(results)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            if "error" in r:
+                print(f"{r['file']}: error: {r['error']}")
+            else:
+                print(f"{r['file']}: {r['satellite']} {r['aos'][:16]} max {r['max_elevation']:.0f}° "
+                      f"RMS {r['rms_error']:.2f}° lag {r['lag']:+.2f}s "
+                      f"above min {r['time_above_recorded']:.0f}/{r['time_above_predicted']:.0f}s")
+    return 0 if all("error" not in r for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
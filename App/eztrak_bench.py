@@ -0,0 +1,375 @@
+# eztrak_bench.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Startup, import-cost and hot-path benchmarks for the EZ-TRAK tools
+#
+# Usage:
+#   python eztrak_bench.py                    # run and compare with the saved baseline
+#   python eztrak_bench.py --save-baseline    # run and store the results as the baseline
+#   xvfb-run python eztrak_bench.py           # also time the real windows on a virtual display
+#
+# Everything runs headless on the Agg backend: per-module import cost of each
+# entry point (from python -X importtime), the rendering stages the apps go
+# through at startup (backend selection, ggplot style, GridSpec layout,
+# tight_layout, first draw), redraw frame time with and without blitting,
+# TLE parsing and pass prediction on a synthetic catalog. When a Tk display
+# is available (including Xvfb) the wall-clock time to first rendered frame
+# and peak RSS of the launcher, tracker, rotator and map windows are measured too.
+# Startup figures are taken in fresh interpreters so earlier imports don't
+# hide their cost, and each timing is the best of --repeat runs.
+#
+# Results are compared with a stored baseline; any metric slower than the
+# baseline by more than the threshold ratio (and by more than a small
+# absolute noise floor) is reported as a regression and the exit code is 1.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# numpy, matplotlib and the app modules are imported inside the benchmarks,
+# so that child processes measuring startup pay for them only once, on the clock.
+
+# Configuration
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(os.path.expanduser("~"), ".eztrak", "bench", "baseline.json")
+THRESHOLD = 1.25  # Ratio to the baseline above which a metric counts as a regression
+NOISE_FLOOR = {"s": 0.002, "MB": 2.0}  # Absolute differences below these are ignored
+REPEAT = 3  # Runs per timing; the best is kept
+FRAMES = 50  # Redraws timed per frame benchmark
+CATALOG_SIZE = 2000  # Synthetic satellites for the TLE parsing benchmark
+PREDICTION_SATELLITES = 200  # Satellites in the pass prediction benchmark
+PREDICTION_DAYS = 2
+
+# Modules whose import is timed for each entry point; the launcher runs its
+# window at import time, so its dependencies are imported instead.
+ENTRY_IMPORTS = {
+    "eztrak_welcome": ["tkinter", "tkinter.ttk", "passcache", "passpredict", "tlestore"],
+    "eztrack": ["eztrack"],
+    "eztrackrotator": ["eztrackrotator"],
+    "eztrackmap": ["eztrackmap"],
+}
+
+
+def _child(mode, *args):
+    """Run a benchmark mode of this script in a fresh interpreter; returns its JSON output."""
+    command = [sys.executable, os.path.abspath(__file__), "--child", mode, *args]
+    result = subprocess.run(command, cwd=APP_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{mode} failed: {result.stderr.strip().splitlines()[-1:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def has_display():
+    """True if a Tk window can be opened (a real or virtual display)."""
+    try:
+        import tkinter
+        tkinter.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+def synthetic_tles(n, seed=1):
+    """n deterministic low-earth-orbit TLEs, so the benchmarks need no network."""
+    import numpy as np
+    from sgp4 import exporter
+    from sgp4.api import Satrec, WGS72
+
+    rng = np.random.default_rng(seed)
+    tles = []
+    for k in range(n):
+        satrec = Satrec()
+        satrec.sgp4init(WGS72, "i", 10000 + k, 26000.5, 2.8e-5, 0.0, 0.0, 0.001,
+                        rng.uniform(0, 2 * np.pi), np.radians(rng.uniform(50, 99)),
+                        rng.uniform(0, 2 * np.pi), 2 * np.pi / rng.uniform(90, 105),
+                        rng.uniform(0, 2 * np.pi))
+        line1, line2 = exporter.export_tle(satrec)
+        tles.append((f"SAT {k}", line1, line2))
+    return tles
+
+
+# Benchmarks run in child processes
+
+def import_costs(entry):
+    """Cumulative import time in seconds of each module imported directly by an entry point."""
+    code = "; ".join(f"import {module}" for module in ENTRY_IMPORTS[entry])
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_DIR,
+                            capture_output=True, text=True, env=dict(os.environ, MPLBACKEND="Agg"))
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {entry} failed: {result.stderr.strip().splitlines()[-1:]}")
+    # Each module is listed after the modules it imported, indented one level deeper
+    costs = {"total": 0.0}
+    children = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        seconds = int(cumulative) / 1e6
+        if depth == 1:
+            children[name] = seconds
+        elif depth == 0:
+            if name in ENTRY_IMPORTS[entry]:
+                costs.update(children)
+                costs[name] = seconds
+                costs["total"] += seconds
+            children = {}
+    return costs
+
+
+def render_stages():
+    """Time the headless rendering stages an app goes through before its first frame."""
+    stages = {}
+    t0 = time.perf_counter()
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.widgets import Button, TextBox
+    import numpy as np
+    t1 = time.perf_counter()
+    stages["backend"] = t1 - t0
+
+    from matplotlib import style
+    style.use("ggplot")
+    t2 = time.perf_counter()
+    stages["style"] = t2 - t1
+
+    # The tracker's layout: an 8x4 GridSpec of controls around a polar plot
+    fig = Figure(figsize=(7, 9))
+    FigureCanvasAgg(fig)
+    grid = fig.add_gridspec(8, 4, height_ratios=[0.2, 0.2, 0.1, 0.1, 2.8, 0.8, 0.3, 0.3])
+    widgets = [TextBox(fig.add_subplot(grid[0, col]), label) for col, label in ((1, "Lat: "), (2, "Lon: "), (3, "Alt(m): "))]
+    widgets += [Button(fig.add_subplot(grid[1, col]), label) for col, label in ((2, "Next Pass"), (3, "Update TLE"))]
+    widgets += [Button(fig.add_subplot(grid[6, 3]), "Reset Device"),
+                Button(fig.add_subplot(grid[7, 0:2]), "Start Recording"),
+                Button(fig.add_subplot(grid[7, 2:4]), "Clear Trace")]
+    for cell in (grid[1, 0:2], grid[5, 0:2], grid[5, 2:], grid[6, 0:3]):
+        text_ax = fig.add_subplot(cell)
+        text_ax.axis("off")
+        text_ax.text(0.05, 0.5, "---", bbox=dict(facecolor="white", boxstyle="round,pad=0.5"))
+    ax = fig.add_subplot(grid[2:5, :], polar=True)
+    ax.set_theta_zero_location("N")
+    ax.set_theta_direction(-1)
+    ax.set_rlim(0, 72)
+    for elevation in (0, 15, 30, 45, 60, 75):
+        ax.text(0, (90 - elevation) * 0.8, f"{elevation}°", bbox=dict(facecolor="white", edgecolor="none"))
+    ax.plot(np.radians(np.linspace(0, 180, 100)), np.linspace(72, 10, 100), "b-")
+    t3 = time.perf_counter()
+    stages["layout"] = t3 - t2
+
+    fig.tight_layout()
+    t4 = time.perf_counter()
+    stages["tight_layout"] = t4 - t3
+
+    fig.canvas.draw()
+    stages["first_draw"] = time.perf_counter() - t4
+    stages["total"] = time.perf_counter() - t0
+    stages["peak_rss"] = _peak_rss_mb()
+    return stages
+
+
+def entry_first_frame(entry):
+    """Open an entry point's real window and report when its first frame was rendered."""
+    import tkinter as tk
+    if entry == "eztrak_welcome":
+        # The launcher enters its main loop at import; render once and return instead
+        tk.Misc.mainloop = lambda self, n=0: self.update()
+        import eztrak_welcome  # noqa: F401
+    elif entry == "eztrack":
+        import eztrack
+        root = tk.Tk()
+        eztrack.EzTrackApp(root, simulate=True)
+        root.update()
+    elif entry == "eztrackmap":
+        import eztrackmap
+        root = tk.Tk()
+        eztrackmap.MapApp(root)
+        root.update()
+    else:
+        import eztrackrotator
+        root = tk.Tk()
+        eztrackrotator.RotatorApp(root)
+        root.update()
+    return {"rendered_at": time.time(), "peak_rss": _peak_rss_mb()}
+
+
+# Benchmarks run in this process
+
+def frame_times(frames=FRAMES):
+    """Mean full redraw and blitted redraw time of a polar plot with a moving marker."""
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    import numpy as np
+    from blitting import BlitManager
+
+    fig = Figure(figsize=(7, 9))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111, polar=True)
+    ax.set_rlim(0, 72)
+    marker, = ax.plot([], [], "ro", markersize=10)
+    readout = fig.text(0.5, 0.02, "", ha="center")
+    fig.canvas.draw()
+    theta = np.linspace(0, 2 * np.pi, frames)
+
+    start = time.perf_counter()
+    for k in range(frames):
+        marker.set_data([theta[k]], [36])
+        fig.canvas.draw()
+    full = (time.perf_counter() - start) / frames
+
+    manager = BlitManager(fig.canvas, [marker, readout])
+    fig.canvas.draw()
+    start = time.perf_counter()
+    for k in range(frames):
+        marker.set_data([theta[k]], [36])
+        readout.set_text(f"Azimuth: {np.degrees(theta[k]):.1f}°")
+        manager.update()
+    blit = (time.perf_counter() - start) / frames
+    return {"full_draw": full, "blit": blit}
+
+
+def compute_times(tles):
+    """TLE parsing and pass prediction time."""
+    from datetime import datetime, timezone
+    from passpredict import PassPredictor, parse_tle_text
+    from tlestore import entries_to_arrays
+
+    text = "\n".join(f"{name}\n{line1}\n{line2}" for name, line1, line2 in tles) + "\n"
+    start = time.perf_counter()
+    parsed = parse_tle_text(text)
+    entries_to_arrays(parsed)
+    parse = time.perf_counter() - start
+
+    predictor = PassPredictor(tles[:PREDICTION_SATELLITES], 51.5, -0.1, 30, 20)
+    window = datetime(2021, 3, 1, tzinfo=timezone.utc)
+    start = time.perf_counter()
+    predictor.find_passes(window, days=PREDICTION_DAYS)
+    predict = time.perf_counter() - start
+    return {"tle_parse": parse, "pass_prediction": predict}
+
+
+def _best(runs):
+    """Element-wise minimum of a list of flat metric dicts (None values pass through)."""
+    best = {}
+    for run in runs:
+        for key, value in run.items():
+            if value is not None and (best.get(key) is None or value < best[key]):
+                best[key] = value
+            best.setdefault(key, value)
+    return best
+
+
+def run_benchmarks(repeat=REPEAT, windows=None):
+    """Run every benchmark; returns {metric: (value, unit)}."""
+    results = {}
+    for entry in ENTRY_IMPORTS:
+        for module, seconds in _best([import_costs(entry) for _ in range(repeat)]).items():
+            results[f"import.{entry}.{module}"] = (seconds, "s")
+    for stage, value in _best([_child("render") for _ in range(repeat)]).items():
+        if value is not None:
+            results[f"render.{stage}"] = (value, "MB" if stage == "peak_rss" else "s")
+
+    if windows is None:
+        windows = has_display()
+    if windows:
+        for entry in ENTRY_IMPORTS:
+            runs = []
+            for _ in range(repeat):
+                start = time.time()
+                child = _child("entry", entry)
+                runs.append({"first_frame": child["rendered_at"] - start, "peak_rss": child["peak_rss"]})
+            for key, value in _best(runs).items():
+                if value is not None:
+                    results[f"window.{entry}.{key}"] = (value, "MB" if key == "peak_rss" else "s")
+
+    for key, value in _best([frame_times() for _ in range(repeat)]).items():
+        results[f"frame.{key}"] = (value, "s")
+    tles = synthetic_tles(CATALOG_SIZE)
+    for key, value in _best([compute_times(tles) for _ in range(repeat)]).items():
+        results[f"compute.{key}"] = (value, "s")
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Metrics slower than the baseline: list of (metric, value, baseline value, ratio)."""
+    regressions = []
+    for metric, (value, unit) in results.items():
+        if metric not in baseline:
+            continue
+        reference = baseline[metric][0]
+        if value - reference > NOISE_FLOOR[unit] and reference > 0 and value / reference > threshold:
+            regressions.append((metric, value, reference, value / reference))
+    return regressions
+
+
+def _format(value, unit):
+    return f"{value * 1000:9.1f} ms" if unit == "s" else f"{value:9.1f} MB"
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark EZ-TRAK startup and hot paths.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help=f"baseline file (default {BASELINE_PATH})")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"slowdown ratio that counts as a regression (default {THRESHOLD})")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help=f"runs per timing, best kept (default {REPEAT})")
+    parser.add_argument("--no-windows", action="store_true", help="skip the real-window benchmarks")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        mode = args.child[0]
+        output = render_stages() if mode == "render" else entry_first_frame(args.child[1])
+        print(json.dumps(output))
+        return 0
+
+    results = run_benchmarks(args.repeat, windows=False if args.no_windows else None)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.json:
+        print(json.dumps({"results": results, "regressions": regressions}, indent=2))
+    else:
+        for metric, (value, unit) in results.items():
+            line = f"{metric:56s} {_format(value, unit)}"
+            if metric in baseline:
+                line += f"   baseline {_format(*baseline[metric])}"
+            print(line)
+        if not baseline:
+            print(f"No baseline at {args.baseline}; run with --save-baseline to store one")
+        for metric, value, reference, ratio in regressions:
+            print(f"REGRESSION {metric}: {ratio:.2f}x slower than the baseline")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"created": time.time(), "python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
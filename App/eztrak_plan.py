@@ -0,0 +1,233 @@
+# eztrak_plan.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Multi-observer, multi-satellite pass planning across CPU cores
+#
+# Usage:
+#   python eztrak_plan.py --observer home=51.5,-0.1,30 --observer club=52.2,0.1,15
+#   python eztrak_plan.py --observers sites.csv --tle catalog.txt --days 3 --csv schedule.csv
+#
+# The full pass matrix (every observer x every satellite) is computed by a
+# process pool. The parsed orbital elements of the catalog are placed once
+# in shared memory; each worker maps them, rebuilds its SGP4 records and
+# predicts passes for (observer, block of satellites) jobs, so no TLE data is
+# pickled per job and the work splits evenly across cores. Each observer then
+# gets a conflict-free schedule: passes are taken in order of decreasing
+# maximum elevation, skipping any that overlap one already scheduled at that
+# site, so every time slot goes to the best pass available in it.
+
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import shared_memory
+
+import numpy as np
+from sgp4.api import Satrec, WGS72
+
+from passpredict import PassPredictor, parse_tle_text
+from tlestore import TLEStore
+
+# Configuration
+MIN_ELEVATION = 20  # Minimum pass elevation in degrees
+PLAN_DAYS = 1  # Days planned ahead
+SATELLITES_PER_JOB = 64  # Satellites per worker job
+SLEW_GAP = 60  # Seconds kept free between scheduled passes for the antenna to reposition
+
+# Orbital elements stored per satellite, in sgp4init argument order
+ELEMENT_FIELDS = ("satnum", "epoch", "bstar", "ndot", "nddot", "ecco", "argpo",
+                  "inclo", "mo", "no_kozai", "nodeo")
+SGP4_EPOCH_JD = 2433281.5  # 1949 December 31 00:00 UT, the origin of the sgp4init epoch
+
+# Pass matrix columns
+MATRIX_FIELDS = ("observer", "satellite", "aos", "tca", "los", "max_elevation",
+                 "aos_azimuth", "los_azimuth")
+
+
+def tle_elements(tles):
+    """Parsed orbital elements of (name, line1, line2) entries as an (n, 11) float64 array."""
+    elements = np.empty((len(tles), len(ELEMENT_FIELDS)))
+    for i, (_, line1, line2) in enumerate(tles):
+        satrec = Satrec.twoline2rv(line1, line2)
+        elements[i] = [satrec.satnum, (satrec.jdsatepoch - SGP4_EPOCH_JD) + satrec.jdsatepochF,
+                       satrec.bstar, satrec.ndot, satrec.nddot, satrec.ecco, satrec.argpo,
+                       satrec.inclo, satrec.mo, satrec.no_kozai, satrec.nodeo]
+    return elements
+
+
+def elements_to_satrecs(elements):
+    """Rebuild SGP4 records from tle_elements() rows; they propagate identically."""
+    satrecs = []
+    for row in elements:
+        satrec = Satrec()
+        satrec.sgp4init(WGS72, "i", int(row[0]), *row[1:])
+        satrecs.append(satrec)
+    return satrecs
+
+
+def parse_observer(text):
+    """An observer from "name=lat,lon,alt" or "lat,lon,alt"."""
+    name, _, coordinates = text.rpartition("=")
+    lat, lon, alt = (float(v) for v in coordinates.split(","))
+    return name or f"{lat:.4f},{lon:.4f}", lat, lon, alt
+
+
+def read_observers(path):
+    """Observers from a CSV file with name, lat, lon and alt columns."""
+    with open(path, newline="") as f:
+        return [(row["name"], float(row["lat"]), float(row["lon"]), float(row.get("alt") or 0))
+                for row in csv.DictReader(f)]
+
+
+# Worker side: the element array is mapped from shared memory once per process
+
+_shared = None  # SharedMemory kept open for the lifetime of the worker
+_satrecs = None
+
+
+def _attach(shm_name, shape):
+    global _shared, _satrecs
+    _shared = shared_memory.SharedMemory(name=shm_name)
+    elements = np.ndarray(shape, dtype=np.float64, buffer=_shared.buf)
+    _satrecs = elements_to_satrecs(elements)
+
+
+def _predict_job(job):
+    """Passes of one observer over a block of satellites, as rows of MATRIX_FIELDS."""
+    observer, lat, lon, alt, first, last, start, days, min_elevation = job
+    satrecs = _satrecs[first:last]
+    placeholders = [(str(first + i), "", "") for i in range(len(satrecs))]
+    predictor = PassPredictor(placeholders, lat, lon, alt, min_elevation, satrecs=satrecs)
+    passes = predictor.find_passes(datetime.fromtimestamp(start, timezone.utc), days=days)
+    rows = np.empty((len(passes), len(MATRIX_FIELDS)))
+    for k, p in enumerate(passes):
+        rows[k] = (observer, first + p.index, p.aos.timestamp(), p.tca.timestamp(), p.los.timestamp(),
+                   p.max_elevation, p.aos_azimuth, p.los_azimuth)
+    return rows
+
+
+def pass_matrix(tles, observers, start=None, days=PLAN_DAYS, min_elevation=MIN_ELEVATION,
+                workers=None, per_job=SATELLITES_PER_JOB):
+    """Every pass of every satellite over every observer, as an (n, 8) array of MATRIX_FIELDS."""
+    if start is None:
+        start = time.time()
+    elements = tle_elements(tles)
+    shm = shared_memory.SharedMemory(create=True, size=max(elements.nbytes, 1))
+    try:
+        np.ndarray(elements.shape, dtype=np.float64, buffer=shm.buf)[:] = elements
+        jobs = [(o, lat, lon, alt, first, min(first + per_job, len(tles)), start, days, min_elevation)
+                for o, (_, lat, lon, alt) in enumerate(observers)
+                for first in range(0, len(tles), per_job)]
+        if workers == 1:
+            _attach(shm.name, elements.shape)
+            results = [_predict_job(job) for job in jobs]
+            _shared.close()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                     initargs=(shm.name, elements.shape)) as pool:
+                results = list(pool.map(_predict_job, jobs))
+    finally:
+        shm.close()
+        shm.unlink()
+    matrix = np.concatenate(results) if results else np.empty((0, len(MATRIX_FIELDS)))
+    return matrix[np.lexsort((matrix[:, 2], matrix[:, 0]))]
+
+
+def schedule(matrix, gap=SLEW_GAP):
+    """Conflict-free subset of the pass matrix: per observer, best max elevation first.
+
+    A pass is kept only if it does not overlap (within `gap` seconds) a
+    higher pass already kept for the same observer.
+    """
+    chosen = []
+    for observer in np.unique(matrix[:, 0]):
+        rows = matrix[matrix[:, 0] == observer]
+        taken_start = np.empty(0)
+        taken_end = np.empty(0)
+        for row in rows[np.argsort(-rows[:, 5], kind="stable")]:
+            aos, los = row[2] - gap, row[4] + gap
+            if np.any((aos < taken_end) & (los > taken_start)):
+                continue
+            taken_start = np.append(taken_start, row[2])
+            taken_end = np.append(taken_end, row[4])
+            chosen.append(row)
+    if not chosen:
+        return np.empty((0, len(MATRIX_FIELDS)))
+    chosen = np.array(chosen)
+    return chosen[np.lexsort((chosen[:, 2], chosen[:, 0]))]
+
+
+def _records(matrix, observers, names):
+    """Rows of the matrix as dicts with names and ISO times."""
+    def iso(t):
+        return datetime.fromtimestamp(t, timezone.utc).isoformat(timespec="seconds")
+    return [{"observer": observers[int(r[0])][0], "satellite": names[int(r[1])],
+             "aos": iso(r[2]), "tca": iso(r[3]), "los": iso(r[4]),
+             "max_elevation": round(float(r[5]), 2), "aos_azimuth": round(float(r[6]), 1),
+             "los_azimuth": round(float(r[7]), 1)} for r in matrix]
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Plan satellite passes for several observers at once.")
+    parser.add_argument("--observer", action="append", type=parse_observer, default=[],
+                        help='observer as "name=lat,lon,alt" (repeatable)')
+    parser.add_argument("--observers", help="CSV file of observers (name, lat, lon, alt columns)")
+    parser.add_argument("--tle", help="TLE catalog file (default: the cached TLE store)")
+    parser.add_argument("--satellite", action="append", help="only plan these satellites (repeatable)")
+    parser.add_argument("--days", type=float, default=PLAN_DAYS, help=f"days to plan (default {PLAN_DAYS})")
+    parser.add_argument("--min-elevation", type=float, default=MIN_ELEVATION,
+                        help=f"minimum pass elevation in degrees (default {MIN_ELEVATION})")
+    parser.add_argument("--gap", type=float, default=SLEW_GAP,
+                        help=f"seconds between scheduled passes (default {SLEW_GAP})")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--all", action="store_true", help="output the full pass matrix instead of the schedule")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    observers = list(args.observer)
+    if args.observers:
+        observers += read_observers(args.observers)
+    if not observers:
+        parser.error("no observers given (use --observer or --observers)")
+    if args.tle:
+        with open(args.tle) as f:
+            tles = parse_tle_text(f.read())
+        if args.satellite:
+            wanted = set(args.satellite)
+            tles = [t for t in tles if t[0] in wanted]
+    else:
+        tles = TLEStore().entries(args.satellite)
+    if not tles:
+        print("No TLE data - download it from the launcher or pass --tle", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    matrix = pass_matrix(tles, observers, days=args.days, min_elevation=args.min_elevation,
+                         workers=args.workers)
+    elapsed = time.perf_counter() - started
+    results = matrix if args.all else schedule(matrix, args.gap)
+    records = _records(results, observers, [name for name, _, _ in tles])
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(records[0]) if records else ["observer"])
+            writer.writeheader()
+            writer.writerows(records)
+    if args.json:
+        print(json.dumps(records, indent=2))
+    else:
+        for r in records:
+            print(f"{r['observer']}: {r['satellite']} {r['aos'][5:16].replace('T', ' ')}"
+                  f"-{r['los'][11:16]} max {r['max_elevation']:.0f}°")
+        print(f"{len(matrix)} passes for {len(observers)} observers x {len(tles)} satellites "
+              f"in {elapsed:.1f}s; {len(results)} {'listed' if args.all else 'scheduled'}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
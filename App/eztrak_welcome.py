@@ -1,8 +1,5 @@
 import tkinter as tk
 from tkinter import ttk
-import subprocess
-import sys
-import os
 
 # Create the main window
 root = tk.Tk()
@@ -25,6 +22,85 @@ title_label = ttk.Label(header_frame, text="Welcome to EZ-Trak Satellite Trackin
                         font=("Arial", 16, "bold"))
 title_label.pack(side=tk.TOP)
 
+# Local TLE and pass caches shared with the tracking apps. They (and NumPy,
+# SGP4 and requests behind them) are only imported when first needed, so the
+# launcher window comes up without waiting for them.
+tle_store = None
+pass_cache = None
+PREDICTION_DAYS = 2  # Days of passes predicted ahead, as in the tracking apps
+predictor = None  # Kept between edits so location and threshold changes reuse its propagated states
+
+def get_tle_store():
+    """The shared TLE store, opened on first use"""
+    global tle_store
+    if tle_store is None:
+        from tlestore import TLEStore
+        tle_store = TLEStore()
+    return tle_store
+
+def get_pass_cache():
+    """The shared pass cache, opened on first use"""
+    global pass_cache
+    if pass_cache is None:
+        from passcache import PassCache
+        pass_cache = PassCache()
+    return pass_cache
+
+def predict_passes():
+    """Predict passes for the selected satellites into the shared pass cache"""
+    global predictor
+    from passpredict import PassPredictor
+    names = [name.strip() for name in (sat1_var.get(), sat2_var.get()) if name.strip()]
+    tles = get_tle_store().entries(names)
+    if not tles:
+        return None
+    lat, lon, alt = float(lat_var.get()), float(lon_var.get()), float(alt_var.get())
+    min_elevation = float(min_elev_var.get())
+    if predictor is None or predictor.tles != tles:
+        predictor = PassPredictor(tles, lat, lon, alt, min_elevation, keep_states=True)
+    else:
+        predictor.set_location(lat, lon, alt)
+        predictor.min_elevation = min_elevation
+    return get_pass_cache().find_passes(predictor, PREDICTION_DAYS)
+
+def update_location():
+    """Invalidate passes predicted for the old location and predict for the new one"""
+    if pass_cache is not None:
+        pass_cache.clear()
+    try:
+        passes = predict_passes()
+    except ValueError:
+        status_var.set("Invalid location or minimum elevation")
+        return
+    if passes is None:
+        status_var.set("Location updated (no TLE data to predict passes)")
+    else:
+        status_var.set(f"Location updated - {len(passes)} passes in the next {PREDICTION_DAYS} days")
+
+def update_satellites():
+    """Predict passes for the newly selected satellites"""
+    try:
+        passes = predict_passes()
+    except ValueError:
+        status_var.set("Invalid location or minimum elevation")
+        return
+    if passes is None:
+        status_var.set("No TLE data for the selected satellites - click Download TLE or Verify Satellites")
+    else:
+        status_var.set(f"Satellites updated - {len(passes)} passes in the next {PREDICTION_DAYS} days")
+
+def update_min_elevation():
+    """Re-apply the new minimum elevation to the predicted passes"""
+    try:
+        passes = predict_passes()
+    except ValueError:
+        status_var.set("Invalid location or minimum elevation")
+        return
+    if passes is None:
+        status_var.set("Min elevation updated (no TLE data to predict passes)")
+    else:
+        status_var.set(f"Min elevation {min_elev_var.get()}° - {len(passes)} passes in the next {PREDICTION_DAYS} days")
+
 # Create the location frame
 location_frame = ttk.LabelFrame(main_frame, text="Observer Location", padding="10")
 location_frame.pack(fill=tk.X, pady=10)
@@ -45,11 +121,7 @@ alt_var = tk.StringVar()
 alt_entry = ttk.Entry(location_frame, textvariable=alt_var, width=15)
 alt_entry.grid(row=1, column=1, padx=5, pady=5)
 
-# Dummy function for buttons
-def dummy_function():
-    pass
-
-update_loc_button = ttk.Button(location_frame, text="Update Location", command=dummy_function)
+update_loc_button = ttk.Button(location_frame, text="Update Location", command=update_location)
 update_loc_button.grid(row=1, column=2, columnspan=2, padx=5, pady=5, sticky=tk.E)
 
 # Create the satellite frame
@@ -59,16 +131,16 @@ satellite_frame.pack(fill=tk.X, pady=10)
 # Row 0-1: Satellite entries
 ttk.Label(satellite_frame, text="Satellite 1:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
 sat1_var = tk.StringVar(value="NOAA 19")
-sat1_entry = ttk.Entry(satellite_frame, textvariable=sat1_var, width=20)
+sat1_entry = ttk.Combobox(satellite_frame, textvariable=sat1_var, width=20)
 sat1_entry.grid(row=0, column=1, padx=5, pady=5)
 
 ttk.Label(satellite_frame, text="Satellite 2:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
 sat2_var = tk.StringVar(value="METOP-C")
-sat2_entry = ttk.Entry(satellite_frame, textvariable=sat2_var, width=20)
+sat2_entry = ttk.Combobox(satellite_frame, textvariable=sat2_var, width=20)
 sat2_entry.grid(row=1, column=1, padx=5, pady=5)
 
 # Row 2: Update Satellites button
-update_sat_button = ttk.Button(satellite_frame, text="Update Satellites", command=dummy_function)
+update_sat_button = ttk.Button(satellite_frame, text="Update Satellites", command=update_satellites)
 update_sat_button.grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky=tk.E)
 
 # Row 3: Min elevation entry
@@ -78,7 +150,7 @@ min_elev_entry = ttk.Entry(satellite_frame, textvariable=min_elev_var, width=5)
 min_elev_entry.grid(row=3, column=1, padx=5, pady=5, sticky=tk.W)
 
 # Row 4: Update Min Elevation button
-update_min_elev_button = ttk.Button(satellite_frame, text="Update Min Elevation", command=dummy_function)
+update_min_elev_button = ttk.Button(satellite_frame, text="Update Min Elevation", command=update_min_elevation)
 update_min_elev_button.grid(row=4, column=0, columnspan=2, padx=5, pady=5, sticky=tk.E)
 
 # Create the buttons frame
@@ -89,36 +161,94 @@ buttons_frame.pack(fill=tk.X, pady=10)
 button_grid = ttk.Frame(buttons_frame)
 button_grid.pack(pady=10)
 
-download_button = ttk.Button(button_grid, text="Download TLE", command=dummy_function)
+def download_tle():
+    """Download or revalidate the TLE sources into the local store, off the Tk thread"""
+    if get_tle_store().refresh_in_background(root, tle_downloaded, force=True):
+        status_var.set("Downloading TLE data...")
+
+def tle_downloaded(results):
+    """Report a finished TLE download"""
+    errors = [source for source, result in results.items() if result.startswith("error")]
+    if "updated" in results.values() and pass_cache is not None:
+        pass_cache.clear()
+    if errors:
+        status_var.set(f"TLE download failed for {', '.join(errors)} ({tle_store.summary()})")
+    else:
+        status_var.set(f"TLE data up to date ({tle_store.summary()})")
+
+def verify_satellites():
+    """Check that the selected satellites exist in the cached TLE catalog"""
+    index = get_tle_store().index()
+    if index is None:
+        status_var.set("No TLE data - click Download TLE first")
+        return
+    names = [name.strip() for name in (sat1_var.get(), sat2_var.get()) if name.strip()]
+    problems = []
+    for name in names:
+        if index.lookup(name) is None:
+            suggestions = index.search(name, limit=3)
+            hint = f" (did you mean {' / '.join(suggestions)}?)" if suggestions else ""
+            problems.append(f"{name}{hint}")
+    if problems:
+        status_var.set(f"Not found: {'; '.join(problems)}")
+    else:
+        status_var.set("All satellites found in TLE data")
+
+def autocomplete_satellite(event):
+    """Offer catalog names matching what has been typed so far"""
+    index = get_tle_store().index()
+    if index is not None and event.widget.get().strip():
+        event.widget['values'] = index.complete(event.widget.get())
+
+sat1_entry.bind('<KeyRelease>', autocomplete_satellite)
+sat2_entry.bind('<KeyRelease>', autocomplete_satellite)
+
+download_button = ttk.Button(button_grid, text="Download TLE", command=download_tle)
 download_button.grid(row=0, column=0, padx=10, pady=5)
 
-verify_button = ttk.Button(button_grid, text="Verify Satellites", command=dummy_function)
+verify_button = ttk.Button(button_grid, text="Verify Satellites", command=verify_satellites)
 verify_button.grid(row=0, column=1, padx=10, pady=5)
 
 # Functions to launch the applications
+# The apps open as windows of this process, so matplotlib, the TLE store and
+# the pass cache are loaded once and shared. Each app module is imported on
+# first launch, keeping the launcher itself quick to start.
+open_apps = {}  # Window key -> (Toplevel, app) for the apps currently open
+
+def app_settings():
+    """Location, satellites and minimum elevation from the launcher fields"""
+    return {
+        "location": (float(lat_var.get()), float(lon_var.get()), float(alt_var.get())),
+        "satellites": [name.strip() for name in (sat1_var.get(), sat2_var.get()) if name.strip()],
+        "min_elevation": float(min_elev_var.get()),
+        "tle_store": get_tle_store(),
+        "pass_cache": get_pass_cache(),
+    }
+
+def open_app(key, create):
+    """Open an app in a new Toplevel, or raise its window if it is already open"""
+    window, _ = open_apps.get(key, (None, None))
+    if window is not None and window.winfo_exists():
+        window.deiconify()
+        window.lift()
+        return
+    window = tk.Toplevel(root)
+    try:
+        open_apps[key] = (window, create(window))
+    except Exception:
+        window.destroy()
+        raise
+
 def launch_eztrack():
-    """Function to launch eztrack.py"""
+    """Function to open EZ-Trak"""
     try:
         # Update status
         status_var.set("Launching EZ-Trak...")
         root.update()
         
-        # Get the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Build the full path to eztrack.py
-        eztrack_path = os.path.join(script_dir, 'eztrack.py')
-        
-        # Check if the file exists
-        if not os.path.exists(eztrack_path):
-            status_var.set(f"Error: Cannot find {eztrack_path}")
-            return
-        
-        # Determine the Python executable to use
-        python_exe = sys.executable
-        
-        # Launch the subprocess
-        subprocess.Popen([python_exe, eztrack_path])
+        settings = app_settings()
+        import eztrack
+        open_app("eztrack", lambda window: eztrack.EzTrackApp(window, **settings))
         
         # Update status
         status_var.set("EZ-Trak launched successfully")
@@ -126,34 +256,37 @@ def launch_eztrack():
         status_var.set(f"Error launching EZ-Trak: {str(e)}")
 
 def launch_eztrackrotator():
-    """Function to launch eztrackrotator.py"""
+    """Function to open EZ-Trak Rotator"""
     try:
         # Update status
         status_var.set("Launching EZ-Trak Rotator...")
         root.update()
         
-        # Get the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Build the full path to eztrackrotator.py
-        eztrackrotator_path = os.path.join(script_dir, 'eztrackrotator.py')
-        
-        # Check if the file exists
-        if not os.path.exists(eztrackrotator_path):
-            status_var.set(f"Error: Cannot find {eztrackrotator_path}")
-            return
-        
-        # Determine the Python executable to use
-        python_exe = sys.executable
-        
-        # Launch the subprocess
-        subprocess.Popen([python_exe, eztrackrotator_path])
+        settings = app_settings()
+        import eztrackrotator
+        open_app("eztrackrotator", lambda window: eztrackrotator.RotatorApp(window, **settings))
         
         # Update status
         status_var.set("EZ-Trak Rotator launched successfully")
     except Exception as e:
         status_var.set(f"Error launching EZ-Trak Rotator: {str(e)}")
 
+def launch_eztrackmap():
+    """Function to open the ground track map"""
+    try:
+        # Update status
+        status_var.set("Launching Ground Track Map...")
+        root.update()
+        
+        settings = app_settings()
+        import eztrackmap
+        open_app("eztrackmap", lambda window: eztrackmap.MapApp(window, **settings))
+        
+        # Update status
+        status_var.set("Ground Track Map launched successfully")
+    except Exception as e:
+        status_var.set(f"Error launching Ground Track Map: {str(e)}")
+
 # Launch buttons in a separate frame
 launch_frame = ttk.LabelFrame(main_frame, text="Launch Applications", padding="10")
 launch_frame.pack(fill=tk.X, pady=10)
@@ -164,6 +297,9 @@ launch_eztrack_button.pack(fill=tk.X, pady=5)
 launch_rotator_button = ttk.Button(launch_frame, text="Launch EZ-Trak Rotator", command=launch_eztrackrotator)
 launch_rotator_button.pack(fill=tk.X, pady=5)
 
+launch_map_button = ttk.Button(launch_frame, text="Launch Ground Track Map", command=launch_eztrackmap)
+launch_map_button.pack(fill=tk.X, pady=5)
+
 # Status bar at the bottom
 status_frame = ttk.Frame(main_frame)
 status_frame.pack(fill=tk.X, side=tk.BOTTOM, pady=10)
@@ -177,5 +313,14 @@ lat_var.set("01.2345")
 lon_var.set("-01.2345")
 alt_var.set("00")
 
+def close_launcher():
+    """Close open app windows cleanly (stopping devices and recordings) before exiting"""
+    for window, app in list(open_apps.values()):
+        if window.winfo_exists():
+            app.on_close()
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", close_launcher)
+
 # Run the application
 root.mainloop()
\ No newline at end of file
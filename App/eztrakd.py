@@ -0,0 +1,390 @@
+# eztrakd.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Headless EZ-TRAK tracking daemon with a local JSON query API
+#
+# Usage:
+#   python eztrakd.py --lat 51.5 --lon -0.1 --alt 30 --satellite "NOAA 19" --satellite "METOP-C"
+#   python eztrakd.py --simulate --rotator 192.168.1.100:4533 --auto-track --host 0.0.0.0
+#
+# Runs the device reader, the optional rotctld client and pass scheduler,
+# and session recording without any GUI - matplotlib is never imported.
+# The tracking loop drains the device at sensor rate rather than at the
+# GUI animation interval. The TLE sources are revalidated on their own
+# thread whenever the store's MAX_AGE runs out, and passes are re-predicted
+# from the new elements. State is served as JSON over HTTP:
+#
+#   GET  /status             everything below in one document
+#   GET  /position           latest az/el sample and device status
+#   GET  /passes             upcoming passes
+#   GET  /recording          recording state
+#   POST /recording/start    start recording samples to ~/.eztrak/recordings
+#   POST /recording/stop
+#   POST /tracking/start     track the next pass with the rotator (?pass=N for another)
+#   POST /tracking/stop      also pauses --auto-track until the next /tracking/start
+
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from bleingest import DEVICE_NAME, BLEReader, SimulatedReader
+from passcache import PassCache
+from passpredict import PassPredictor
+from recordfile import RECORDINGS_DIR, RecordingWriter
+from rotctl import DEFAULT_PORT as ROTCTL_PORT, RotctlClient
+from tlestore import TLEStore
+from trackscheduler import TrackScheduler
+
+# Configuration
+DEFAULT_HOST = "127.0.0.1"  # Listen on this machine only unless --host is given
+DEFAULT_PORT = 8733  # HTTP port of the query API
+LOOP_INTERVAL = 0.01  # Seconds between device drains (faster than any sensor rate)
+PASS_REFRESH = 600  # Seconds between pass list refreshes
+TLE_RETRY = 900  # Seconds before a failed TLE refresh is tried again
+TRACK_LEAD = 60  # Seconds before AOS that auto-tracking starts pointing the rotator
+PREDICTION_DAYS = 2
+MIN_ELEVATION = 20
+ROTATOR_LIMITS = (0, 360, 0, 180)  # min az, max az, min el, max el
+
+DEFAULT_SATELLITES = ["NOAA 19", "METOP-C"]
+
+
+def pass_to_dict(sat_pass):
+    """JSON-friendly form of a predicted pass."""
+    return {
+        "satellite": sat_pass.name,
+        "aos": sat_pass.aos.isoformat(),
+        "tca": sat_pass.tca.isoformat(),
+        "los": sat_pass.los.isoformat(),
+        "max_elevation": round(sat_pass.max_elevation, 2),
+        "aos_azimuth": round(sat_pass.aos_azimuth, 2),
+        "los_azimuth": round(sat_pass.los_azimuth, 2),
+    }
+
+
+class TrackingDaemon:
+    """Device ingest, recording, pass scheduling and rotator tracking on one background loop."""
+
+    def __init__(self, location, satellites=DEFAULT_SATELLITES, min_elevation=MIN_ELEVATION,
+                 simulate=False, rotator=None, auto_track=False, tle_store=None, pass_cache=None):
+        self.location = location
+        self.satellites = list(satellites)
+        self.min_elevation = min_elevation
+        self.auto_track = auto_track
+        self.tle_store = tle_store or TLEStore()
+        self.pass_cache = pass_cache or PassCache()
+        self.device = SimulatedReader() if simulate else BLEReader(DEVICE_NAME)
+        self.rotator = RotctlClient(*rotator) if rotator else None
+        self.predictor = None
+        self.passes = []
+        self.scheduler = None
+        self.tracked_pass = None
+        self.recorder = None
+        self.sample = None  # Latest (time, az, el)
+        self.tle_results = {}  # {source: status} of the last TLE refresh
+        self.manual_stop = False  # Tracking stopped by request; auto-track waits for a start
+        self.loop_rate = 0.0  # Measured tracking loop iterations per second
+        self._passes_at = 0.0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = None
+
+    # Lifecycle
+
+    def start(self):
+        """Start the device, rotator and tracking loop in the background."""
+        self.device.start()
+        if self.rotator is not None:
+            self.rotator.start()
+        self.refresh_passes()
+        self._thread = threading.Thread(target=self._run, name="ezTrakDaemon", daemon=True)
+        self._thread.start()
+        # Network requests stay off the tracking loop
+        threading.Thread(target=self._run_tle_refresh, name="ezTrakTLE", daemon=True).start()
+
+    def close(self):
+        """Stop the loop, close any recording and disconnect the device and rotator."""
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+        self.stop_recording()
+        self.device.stop()
+        if self.rotator is not None:
+            self.rotator.close()
+
+    def _run(self):
+        iterations = 0
+        window_start = time.monotonic()
+        while not self._closed.wait(LOOP_INTERVAL):
+            self.step(time.time())
+            iterations += 1
+            elapsed = time.monotonic() - window_start
+            if elapsed >= 1.0:
+                self.loop_rate = iterations / elapsed
+                iterations = 0
+                window_start = time.monotonic()
+
+    def _run_tle_refresh(self):
+        while not self._closed.is_set():
+            self._closed.wait(self.refresh_tles())
+
+    def step(self, now):
+        """One loop iteration: drain samples, keep passes fresh and drive the rotator."""
+        t, az, el = self.device.ring.drain(now)
+        with self._lock:
+            if az.size:
+                self.sample = (float(t[-1]), float(az[-1]), float(el[-1]))
+                if self.recorder is not None:
+                    self.recorder.append(t, az, el)
+            if self.passes and self.passes[0].los.timestamp() < now:
+                self.passes = [p for p in self.passes if p.los.timestamp() >= now]
+        # Passes come from the cache, so refreshing is cheap; retry sooner when there are none
+        if now - self._passes_at > (PASS_REFRESH if self.passes else PASS_REFRESH / 10):
+            self.refresh_passes(now)
+        if self.rotator is not None:
+            with self._lock:
+                if (self.auto_track and not self.manual_stop and self.scheduler is None
+                        and self.passes and self.passes[0].aos.timestamp() - now < TRACK_LEAD):
+                    self._start_tracking(self.passes[0])
+                if self.scheduler is not None:
+                    self._track_step(now)
+
+    # Passes
+
+    def refresh_tles(self):
+        """Revalidate the TLE sources that are due; returns seconds until the next check."""
+        results = self.tle_store.refresh()
+        self.tle_results = results
+        if "updated" in results.values():
+            # The tracking loop re-predicts from the new elements on its next step
+            self.pass_cache.clear()
+            self._passes_at = 0.0
+        if any(result.startswith("error") for result in results.values()):
+            return TLE_RETRY
+        return max(self.tle_store.time_to_refresh(), 1.0)
+
+    def refresh_passes(self, now=None):
+        """Re-predict upcoming passes through the shared pass cache."""
+        self._passes_at = time.time() if now is None else now
+        tles = self.tle_store.entries(self.satellites)
+        if not tles:
+            return
+        predictor = PassPredictor(tles, *self.location, self.min_elevation)
+        passes = self.pass_cache.find_passes(predictor, PREDICTION_DAYS, now=self._passes_at)
+        with self._lock:
+            self.predictor, self.passes = predictor, passes
+
+    # Recording
+
+    def recording_metadata(self):
+        """Header fields for a new recording, as written by the tracker app."""
+        lat, lon, alt = self.location
+        metadata = {"created": time.time(), "device": DEVICE_NAME, "lat": lat, "lon": lon, "alt": alt}
+        sat_pass = self.tracked_pass or (self.passes[0] if self.passes else None)
+        if sat_pass is not None:
+            name, line1, line2 = self.predictor.tles[sat_pass.index]
+            satrec = self.predictor.satrecs[sat_pass.index]
+            metadata.update(satellite=name, tle=[line1, line2],
+                            tle_epoch=satrec.jdsatepoch + satrec.jdsatepochF)
+        return metadata
+
+    def start_recording(self):
+        with self._lock:
+            if self.recorder is None:
+                os.makedirs(RECORDINGS_DIR, exist_ok=True)
+                path = os.path.join(RECORDINGS_DIR, time.strftime("%Y%m%d-%H%M%S.ezt"))
+                self.recorder = RecordingWriter(path, self.recording_metadata())
+            return self.recorder.path
+
+    def stop_recording(self):
+        with self._lock:
+            recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+            return recorder.path
+        return None
+
+    # Tracking
+
+    def start_tracking(self, index=0):
+        """Track pass `index` of the upcoming passes; returns the pass, or None."""
+        with self._lock:
+            if self.rotator is None or not 0 <= index < len(self.passes):
+                return None
+            self.manual_stop = False
+            self._start_tracking(self.passes[index])
+            return self.tracked_pass
+
+    def stop_tracking(self):
+        """Stop tracking; auto-track stays paused until start_tracking() is called."""
+        with self._lock:
+            self.manual_stop = True
+            self.scheduler = None
+            self.tracked_pass = None
+
+    def _start_tracking(self, sat_pass):
+        self.scheduler = TrackScheduler.from_pass(self.predictor, sat_pass, limits=ROTATOR_LIMITS)
+        self.tracked_pass = sat_pass
+
+    def _track_step(self, now):
+        if self.scheduler.finished(now):
+            self.scheduler = None
+            self.tracked_pass = None
+            return
+        position = self.rotator.position
+        command = self.scheduler.next_command(
+            now, self.rotator.latency, position[:2] if position is not None else None)
+        if command is not None:
+            self.rotator.set_position(*command)
+
+    # Queries
+
+    def position(self):
+        sample = self.sample
+        result = {"device": self.device.status, "counters": self.device.ring.counters(),
+                  "loop_rate": round(self.loop_rate, 1), "time": None, "az": None, "el": None}
+        if sample is not None:
+            result.update(time=sample[0], az=round(sample[1], 2), el=round(sample[2], 2))
+        return result
+
+    def recording(self):
+        recorder = self.recorder
+        if recorder is None:
+            return {"active": False}
+        return {"active": True, "path": recorder.path, "samples": recorder.samples_written}
+
+    def tracking(self):
+        result = {"rotator": None, "active": self.scheduler is not None,
+                  "auto_track": self.auto_track and not self.manual_stop}
+        if self.rotator is not None:
+            position = self.rotator.position
+            result["rotator"] = {"status": self.rotator.status, "connected": self.rotator.connected,
+                                 "position": list(position[:2]) if position is not None else None,
+                                 "latency": self.rotator.latency}
+        sat_pass = self.tracked_pass
+        if sat_pass is not None:
+            result["pass"] = pass_to_dict(sat_pass)
+        return result
+
+    def status(self):
+        lat, lon, alt = self.location
+        return {"observer": {"lat": lat, "lon": lon, "alt": alt},
+                "position": self.position(),
+                "passes": [pass_to_dict(p) for p in self.passes],
+                "recording": self.recording(),
+                "tracking": self.tracking(),
+                "tle": {"sources": self.tle_store.summary(), "last_refresh": self.tle_results}}
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """Serves the daemon state as JSON."""
+
+    def _reply(self, body, code=200):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        tracker = self.server.tracker
+        routes = {
+            "/status": tracker.status,
+            "/position": tracker.position,
+            "/passes": lambda: [pass_to_dict(p) for p in tracker.passes],
+            "/recording": tracker.recording,
+            "/tracking": tracker.tracking,
+        }
+        route = routes.get(urlparse(self.path).path.rstrip("/"))
+        if route is None:
+            self._reply({"error": "not found"}, 404)
+        else:
+            self._reply(route())
+
+    def do_POST(self):
+        tracker = self.server.tracker
+        url = urlparse(self.path)
+        path = url.path.rstrip("/")
+        if path == "/recording/start":
+            self._reply({"recording": tracker.start_recording()})
+        elif path == "/recording/stop":
+            self._reply({"saved": tracker.stop_recording()})
+        elif path == "/tracking/start":
+            try:
+                index = int(parse_qs(url.query).get("pass", ["0"])[0])
+            except ValueError:
+                self._reply({"error": "invalid pass index"}, 400)
+                return
+            sat_pass = tracker.start_tracking(index)
+            if sat_pass is None:
+                self._reply({"error": "no rotator or no such pass"}, 409)
+            else:
+                self._reply({"tracking": pass_to_dict(sat_pass)})
+        elif path == "/tracking/stop":
+            tracker.stop_tracking()
+            self._reply({"tracking": None})
+        else:
+            self._reply({"error": "not found"}, 404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DaemonHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP front end of a TrackingDaemon; use port 0 to pick a free port."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, tracker, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        super().__init__((host, port), DaemonRequestHandler)
+        self.tracker = tracker
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+def _rotator_address(text):
+    host, _, port = text.partition(":")
+    return host, int(port) if port else ROTCTL_PORT
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Headless EZ-TRAK tracking daemon with a JSON API.")
+    parser.add_argument("--lat", type=float, required=True, help="observer latitude in degrees")
+    parser.add_argument("--lon", type=float, required=True, help="observer longitude in degrees")
+    parser.add_argument("--alt", type=float, default=0.0, help="observer altitude in meters")
+    parser.add_argument("--satellite", action="append", help="satellite to schedule (repeatable)")
+    parser.add_argument("--min-elevation", type=float, default=MIN_ELEVATION,
+                        help=f"minimum pass elevation in degrees (default {MIN_ELEVATION})")
+    parser.add_argument("--simulate", action="store_true", help="use the simulated device instead of BLE")
+    parser.add_argument("--rotator", type=_rotator_address, help="rotctld address as host[:port]")
+    parser.add_argument("--auto-track", action="store_true", help="track every pass with the rotator")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to serve on (default {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to serve on (default {DEFAULT_PORT})")
+    args = parser.parse_args(argv)
+
+    tracker = TrackingDaemon((args.lat, args.lon, args.alt), args.satellite or DEFAULT_SATELLITES,
+                             args.min_elevation, args.simulate, args.rotator, args.auto_track)
+    server = DaemonHTTPServer(tracker, args.host, args.port)
+    tracker.start()
+    print(f"EZ-TRAK daemon serving on http://{args.host}:{server.port}/status")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        tracker.close()
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# fakerotctld.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Minimal stand-in for hamlib's rotctld, for running the rotator app without hardware
+#
+# Usage:
+#   python fakerotctld.py [--port 4533] [--rate 6] [--delay 0.02]
+#
+# Implements the rotctld commands the EZ-TRAK client uses (P, p, S, K, q)
+# with a rotator that slews at a fixed rate towards its target. An
+# optional per-command delay imitates a slow network or controller,
+# drop_clients() cuts every connection to exercise the client's reconnect,
+# and clearing `serving` holds every command until it is set again.
+
+import argparse
+import socket
+import socketserver
+import threading
+import time
+
+# Configuration
+DEFAULT_PORT = 4533
+SLEW_RATE = 6.0  # Degrees per second on each axis
+PARK_POSITION = (0.0, 0.0)
+
+
+class FakeRotator:
+    """Two-axis rotator that slews linearly towards its target."""
+
+    def __init__(self, rate=SLEW_RATE):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.commands = []  # Every command received, for inspection
+        self._az = self._el = 0.0
+        self._target = (0.0, 0.0)
+        self._time = time.monotonic()
+
+    def _advance(self):
+        now = time.monotonic()
+        step = self.rate * (now - self._time)
+        self._time = now
+        target_az, target_el = self._target
+        self._az += max(-step, min(step, target_az - self._az))
+        self._el += max(-step, min(step, target_el - self._el))
+
+    def position(self):
+        with self.lock:
+            self._advance()
+            return self._az, self._el
+
+    def set_target(self, az, el):
+        with self.lock:
+            self._advance()
+            self._target = (az, el)
+
+    def stop(self):
+        with self.lock:
+            self._advance()
+            self._target = (self._az, self._el)
+
+
+class RotctlHandler(socketserver.StreamRequestHandler):
+    """One client connection; commands are answered strictly in order."""
+
+    def setup(self):
+        super().setup()
+        with self.server.clients_lock:
+            self.server.clients.add(self.connection)
+
+    def finish(self):
+        with self.server.clients_lock:
+            self.server.clients.discard(self.connection)
+        try:
+            super().finish()
+        except OSError:
+            pass  # Connection already dropped
+
+    def handle(self):
+        rotator = self.server.rotator
+        for raw in self.rfile:
+            line = raw.decode(errors="replace").strip()
+            if not line:
+                continue
+            rotator.commands.append(line)
+            self.server.serving.wait()
+            if self.server.delay:
+                time.sleep(self.server.delay)
+            parts = line.split()
+            command = parts[0]
+            if command in ("P", "\\set_pos") and len(parts) == 3:
+                try:
+                    rotator.set_target(float(parts[1]), float(parts[2]))
+                    reply = "RPRT 0\n"
+                except ValueError:
+                    reply = "RPRT -1\n"
+            elif command in ("p", "\\get_pos"):
+                az, el = rotator.position()
+                reply = f"{az:.6f}\n{el:.6f}\n"
+            elif command in ("S", "\\stop"):
+                rotator.stop()
+                reply = "RPRT 0\n"
+            elif command in ("K", "\\park"):
+                rotator.set_target(*PARK_POSITION)
+                reply = "RPRT 0\n"
+            elif command in ("q", "Q"):
+                return
+            else:
+                reply = "RPRT -4\n"
+            self.wfile.write(reply.encode())
+
+
+class FakeRotctld(socketserver.ThreadingTCPServer):
+    """Threaded fake rotctld; use port 0 to pick a free port."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, rate=SLEW_RATE, delay=0.0):
+        super().__init__((host, port), RotctlHandler)
+        self.rotator = FakeRotator(rate)
+        self.delay = delay
+        self.serving = threading.Event()  # Cleared, commands are held unanswered
+        self.serving.set()
+        self.clients = set()  # Sockets of the connected clients
+        self.clients_lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        """Serve from a daemon thread and return self."""
+        threading.Thread(target=self.serve_forever, name="fakeRotctld", daemon=True).start()
+        return self
+
+    def drop_clients(self):
+        """Cut every client connection, as a rotctld restart or network failure would."""
+        with self.clients_lock:
+            clients = list(self.clients)
+        for sock in clients:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake hamlib rotctld for testing EZ-TRAK Rotator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--rate", type=float, default=SLEW_RATE, help="slew rate in degrees per second")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds of delay per command")
+    args = parser.parse_args()
+    server = FakeRotctld(args.host, args.port, args.rate, args.delay)
+    print(f"Fake rotctld listening on {args.host}:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
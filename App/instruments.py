@@ -0,0 +1,186 @@
+# instruments.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Low-overhead timing histograms for the tracking apps
+#
+# Every measurement lands in a fixed log-spaced bin (8 per decade from
+# 10 microseconds to 100 seconds), so recording is one log and one list
+# increment, memory never grows, and percentiles are read off the bins
+# (within about 15% of the exact value). Histograms may be recorded from a
+# background thread (the rotctl client does) while the GUI reads them; a
+# read can be a sample behind, never wrong.
+
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+# Configuration
+LOW = 1e-5  # Seconds at the bottom of the first bin
+DECADES = 7  # Up to 100 seconds
+BINS_PER_DECADE = 8
+STATS_DIR = os.path.join(os.path.expanduser("~"), ".eztrak", "stats")
+
+# Measurements taken by the apps, with their overlay labels
+BLE_TO_SCREEN = "ble_to_screen"
+FRAME = "frame"
+PREDICTION = "prediction"
+ROTCTL_ROUND_TRIP = "rotctl_round_trip"
+LABELS = {BLE_TO_SCREEN: "BLE>screen", FRAME: "frame", PREDICTION: "predict",
+          ROTCTL_ROUND_TRIP: "rotctl"}
+
+
+class Histogram:
+    """Log-binned histogram of durations in seconds."""
+
+    def __init__(self):
+        n = DECADES * BINS_PER_DECADE
+        self.counts = [0] * (n + 2)  # Underflow, n bins, overflow
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bin(self, seconds):
+        if seconds < LOW:
+            return 0
+        return min(int(math.log10(seconds / LOW) * BINS_PER_DECADE) + 1, len(self.counts) - 1)
+
+    def record(self, seconds):
+        """Add one duration."""
+        self.counts[self._bin(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def record_many(self, seconds):
+        """Add an array of durations in one go."""
+        seconds = np.asarray(seconds, dtype=np.float64)
+        if seconds.size == 0:
+            return
+        bins = np.ones(seconds.size, dtype=np.intp)
+        positive = seconds >= LOW
+        bins[~positive] = 0
+        bins[positive] += (np.log10(seconds[positive] / LOW) * BINS_PER_DECADE).astype(np.intp)
+        for b, n in enumerate(np.bincount(np.minimum(bins, len(self.counts) - 1),
+                                          minlength=len(self.counts)).tolist()):
+            self.counts[b] += n
+        self.count += seconds.size
+        self.total += float(seconds.sum())
+        self.max = max(self.max, float(seconds.max()))
+
+    def edges(self):
+        """Upper edge in seconds of every bin (the last is open-ended)."""
+        n = len(self.counts) - 2
+        return [LOW * 10 ** (k / BINS_PER_DECADE) for k in range(n + 1)] + [math.inf]
+
+    def percentile(self, q):
+        """Approximate q-th percentile (0-100) in seconds: geometric middle of its bin."""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for b, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                if b == 0:
+                    return LOW
+                if b == len(self.counts) - 1:
+                    return self.max
+                return min(LOW * 10 ** ((b - 0.5) / BINS_PER_DECADE), self.max)
+        return self.max
+
+    def summary(self):
+        """Count, mean, p50/p90/p99 and max in milliseconds."""
+        if not self.count:
+            return {"count": 0}
+        ms = {f"p{q}_ms": round(self.percentile(q) * 1000, 3) for q in (50, 90, 99)}
+        return dict(count=self.count, mean_ms=round(self.total / self.count * 1000, 3),
+                    max_ms=round(self.max * 1000, 3), **ms)
+
+    def to_dict(self):
+        """Summary plus the raw bins."""
+        return dict(self.summary(), bin_upper_edges_s=self.edges()[:-1], counts=list(self.counts))
+
+
+class Instruments:
+    """Named histograms of one app, with an overlay line and a JSON dump."""
+
+    def __init__(self, app):
+        self.app = app
+        self.started = time.time()
+        self.histograms = {name: Histogram() for name in LABELS}
+        self.throughput = None  # ThroughputMeter of a replay, included in the dump when set
+
+    def record(self, name, seconds):
+        self.histograms[name].record(seconds)
+
+    def record_many(self, name, seconds):
+        self.histograms[name].record_many(seconds)
+
+    def overlay_text(self):
+        """One line of p50/p99 milliseconds per measurement taken so far."""
+        parts = []
+        for name, histogram in self.histograms.items():
+            if histogram.count:
+                parts.append(f"{LABELS[name]} {histogram.percentile(50) * 1000:.1f}/"
+                             f"{histogram.percentile(99) * 1000:.1f}")
+        return "p50/p99 ms: " + "  ".join(parts) if parts else "p50/p99 ms: no data yet"
+
+    def to_dict(self):
+        result = {"app": self.app, "started": self.started, "dumped": time.time(),
+                  "histograms": {name: h.to_dict() for name, h in self.histograms.items()}}
+        if self.throughput is not None:
+            result["throughput"] = self.throughput.summary()
+        return result
+
+    def dump(self, path=None):
+        """Write every histogram as JSON (default: a timestamped file in STATS_DIR); returns the path."""
+        if path is None:
+            os.makedirs(STATS_DIR, exist_ok=True)
+            path = os.path.join(STATS_DIR, time.strftime(f"{self.app}-%Y%m%d-%H%M%S.json"))
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+class ThroughputMeter:
+    """Sustained samples and frames per second of a run, counted from its first samples."""
+
+    def __init__(self):
+        self.started = None
+        self.last = None
+        self.samples = 0
+        self.frames = 0
+
+    def frame(self, samples, now=None):
+        """Count one rendered frame that consumed `samples` samples."""
+        if now is None:
+            now = time.perf_counter()
+        if self.started is None:
+            if samples:
+                self.started = now
+        else:
+            self.frames += 1
+            self.samples += samples
+        self.last = now
+
+    def rates(self):
+        """(samples/s, frames/s) so far."""
+        elapsed = self.last - self.started if self.started is not None else 0.0
+        if elapsed <= 0:
+            return 0.0, 0.0
+        return self.samples / elapsed, self.frames / elapsed
+
+    def summary(self):
+        samples_per_second, frames_per_second = self.rates()
+        seconds = self.last - self.started if self.started is not None else 0.0
+        return {"samples": self.samples, "frames": self.frames, "seconds": round(seconds, 3),
+                "samples_per_second": round(samples_per_second, 1),
+                "frames_per_second": round(frames_per_second, 2)}
+
+    def line(self):
+        samples_per_second, frames_per_second = self.rates()
+        return f"{samples_per_second:.0f} samples/s, {frames_per_second:.1f} fps"
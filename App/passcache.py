@@ -0,0 +1,165 @@
+# passcache.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Pass prediction cache shared by the launcher, tracker and rotator apps
+#
+# Predicted passes are cached per satellite under a key made of the
+# observer location, NORAD ID, TLE epoch, prediction window and minimum
+# elevation. A small in-process LRU sits in front of an on-disk layer in
+# ~/.eztrak/passes, so a pass list computed by one app is reused by the
+# others, and cycling "Next Pass" never predicts twice. Moving the observer
+# or refreshing the TLE changes the key, so stale entries are never served.
+# Other apps may be reading the same directory, so clear() only forgets this
+# process's in-memory copies; files nobody has written for MAX_FILE_AGE are
+# removed by prune(), which runs when a cache is opened.
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+
+from passpredict import PassPredictor, Pass
+
+# Configuration
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".eztrak", "passes")
+MEMORY_ENTRIES = 256  # Satellites kept in the in-process LRU
+WINDOW_ALIGN = 3600  # Prediction windows start on whole hours so keys repeat
+MAX_FILE_AGE = 7 * 86400  # Seconds before unused cache files are pruned
+
+
+def _timestamp(dt):
+    return dt.timestamp()
+
+
+def _datetime(t):
+    return datetime.fromtimestamp(float(t), timezone.utc)
+
+
+class PassCache:
+    """Two-level (memory LRU + disk) cache of per-satellite pass lists."""
+
+    def __init__(self, cache_dir=CACHE_DIR, memory_entries=MEMORY_ENTRIES):
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self.prune()
+
+    @staticmethod
+    def key(lat, lon, alt, satrec, window_start, days, min_elevation):
+        """Cache key for one satellite's passes; also used as the file name."""
+        epoch = satrec.jdsatepoch + satrec.jdsatepochF
+        text = (f"{lat:.5f}|{lon:.5f}|{alt:.1f}|{satrec.satnum}|{epoch:.8f}|"
+                f"{window_start:.0f}|{days:g}|{min_elevation:g}")
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def get(self, key):
+        """Cached pass rows for a key: a dict of arrays, or None."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                rows = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            return None
+        self._remember(key, rows)
+        return rows
+
+    def put(self, key, rows):
+        """Store pass rows in memory and on disk."""
+        self._remember(key, rows)
+        tmp = self._path(key) + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **rows)
+        os.replace(tmp, self._path(key))
+
+    def _remember(self, key, rows):
+        self._memory[key] = rows
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        """Forget the passes held in memory; files on disk are left to prune()."""
+        self._memory.clear()
+
+    def prune(self, max_age=MAX_FILE_AGE):
+        """Remove cache files not written for max_age seconds."""
+        cutoff = time.time() - max_age
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if name.endswith(".npz") and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass  # Removed by another app meanwhile
+
+    def find_passes(self, predictor, days, now=None):
+        """PassPredictor.find_passes() through the cache; returns passes not yet over.
+
+        Satellites with cached results are served from the cache; all the
+        others are predicted together in one batch and then cached.
+        """
+        if now is None:
+            now = time.time()
+        window_start = np.floor(now / WINDOW_ALIGN) * WINDOW_ALIGN
+        window_days = days + WINDOW_ALIGN / 86400.0
+        keys = [self.key(predictor.lat, predictor.lon, predictor.alt, satrec,
+                         window_start, window_days, predictor.min_elevation)
+                for satrec in predictor.satrecs]
+        rows = {}
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                rows[i] = cached
+        self.hits += len(rows)
+        self.misses += len(missing)
+
+        if missing:
+            if predictor.keep_states:
+                # Predicting through the predictor itself reuses its kept states
+                computed = predictor.find_passes(_datetime(window_start), days=window_days,
+                                                 satellites=missing)
+            else:
+                batch = PassPredictor([predictor.tles[i] for i in missing], predictor.lat,
+                                      predictor.lon, predictor.alt, predictor.min_elevation)
+                computed = [p._replace(index=missing[p.index])
+                            for p in batch.find_passes(_datetime(window_start), days=window_days)]
+            for i in missing:
+                own = [p for p in computed if p.index == i]
+                rows[i] = {
+                    "aos": np.array([_timestamp(p.aos) for p in own]),
+                    "tca": np.array([_timestamp(p.tca) for p in own]),
+                    "los": np.array([_timestamp(p.los) for p in own]),
+                    "max_elevation": np.array([p.max_elevation for p in own]),
+                    "aos_azimuth": np.array([p.aos_azimuth for p in own]),
+                    "tca_azimuth": np.array([p.tca_azimuth for p in own]),
+                    "los_azimuth": np.array([p.los_azimuth for p in own]),
+                }
+                self.put(keys[i], rows[i])
+
+        passes = []
+        for i, r in rows.items():
+            for k in np.nonzero(r["los"] > now)[0]:
+                passes.append(Pass(
+                    predictor.names[i], i, _datetime(r["aos"][k]), _datetime(r["tca"][k]),
+                    _datetime(r["los"][k]), float(r["max_elevation"][k]),
+                    float(r["aos_azimuth"][k]), float(r["tca_azimuth"][k]),
+                    float(r["los_azimuth"][k])))
+        passes.sort(key=lambda p: p.aos)
+        return passes
@@ -0,0 +1,457 @@
+# passpredict.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Vectorized satellite pass prediction for EZ-TRAK
+#
+# Every satellite is propagated over the whole prediction window as NumPy
+# arrays (SGP4 via the sgp4 package that ships with skyfield). Passes are
+# found on a coarse time grid and the AOS/TCA/LOS instants are refined
+# afterwards, so there are no per-timestep Python loops anywhere.
+#
+# A predictor built with keep_states=True propagates the Earth-fixed
+# positions and velocities of its satellites every STATE_STEP seconds and
+# keeps them. The prediction grid and the AOS/LOS/TCA refinement both
+# interpolate those states (cubic Hermite, tens of metres for a low orbit) instead
+# of calling SGP4, so moving the observer or changing the minimum elevation
+# re-predicts without propagating at all. States are only kept for up to
+# KEEP_STATES_MAX satellites; above that they cost more to propagate and
+# hold than the screened prediction does.
+
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray
+
+# Configuration
+COARSE_STEP = 60.0  # Coarse search grid step in seconds
+SCREEN_STEP = 300.0  # Geometric screening step in seconds (see _elevation_grid)
+PREDICTION_DAYS = 2  # Default prediction window in days
+ROOT_TOLERANCE = 0.5  # AOS/LOS refinement tolerance in seconds
+TCA_ITERATIONS = 24  # Golden-section iterations for the time of closest approach
+KEEP_STATES_MAX = 50  # Satellites up to which keep_states keeps the prediction grid
+STATE_STEP = 180.0  # Seconds between the kept states of a keep_states predictor
+
+# WGS84 ellipsoid
+EARTH_RADIUS = 6378.137  # km
+EARTH_FLATTENING = 1 / 298.257223563
+EARTH_ROTATION = 7.2921159e-5  # rad/s
+
+J2000 = 2451545.0
+UNIX_EPOCH_JD = 2440587.5  # Julian date of 1970-01-01 00:00 UTC
+SECONDS_PER_DAY = 86400.0
+J2000_EPOCH = datetime(2000, 1, 1, 12, tzinfo=timezone.utc)
+
+# A single predicted pass; times are timezone-aware UTC datetimes
+Pass = namedtuple('Pass', [
+    'name', 'index', 'aos', 'tca', 'los',
+    'max_elevation', 'aos_azimuth', 'tca_azimuth', 'los_azimuth',
+])
+
+
+def parse_tle_text(text):
+    """Parse a 3-line (or bare 2-line) TLE catalog into (name, line1, line2) tuples."""
+    lines = [line.rstrip() for line in text.splitlines() if line.strip()]
+    entries = []
+    i = 0
+    while i < len(lines) - 1:
+        if lines[i].startswith('1 ') and lines[i + 1].startswith('2 '):
+            # Bare two-line element set, name it after the catalog number
+            entries.append((lines[i][2:7].strip(), lines[i], lines[i + 1]))
+            i += 2
+        elif (i + 2 < len(lines) and lines[i + 1].startswith('1 ')
+              and lines[i + 2].startswith('2 ')):
+            name = lines[i][2:] if lines[i].startswith('0 ') else lines[i]
+            entries.append((name.strip(), lines[i + 1], lines[i + 2]))
+            i += 3
+        else:
+            i += 1
+    return entries
+
+
+def datetime_to_jd(dt):
+    """Convert a datetime (naive values are taken as UTC) to a Julian date."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return J2000 + (dt - J2000_EPOCH).total_seconds() / SECONDS_PER_DAY
+
+
+def unix_to_jd(t):
+    """Unix timestamps (seconds) to Julian dates."""
+    return UNIX_EPOCH_JD + np.asarray(t, dtype=np.float64) / SECONDS_PER_DAY
+
+
+def jd_to_datetime(jd):
+    """Convert a Julian date to a timezone-aware UTC datetime."""
+    return J2000_EPOCH + timedelta(days=float(jd) - J2000)
+
+
+def observer_ecef(lat, lon, alt):
+    """Observer position on the WGS84 ellipsoid in km (alt in meters)."""
+    lat_r = np.radians(lat)
+    lon_r = np.radians(lon)
+    e2 = EARTH_FLATTENING * (2 - EARTH_FLATTENING)
+    n = EARTH_RADIUS / np.sqrt(1 - e2 * np.sin(lat_r) ** 2)
+    h = alt / 1000.0
+    return np.array([
+        (n + h) * np.cos(lat_r) * np.cos(lon_r),
+        (n + h) * np.cos(lat_r) * np.sin(lon_r),
+        (n * (1 - e2) + h) * np.sin(lat_r),
+    ])
+
+
+def gmst(jd):
+    """Greenwich mean sidereal time in radians (IAU 1982, UT1 taken as UTC)."""
+    t = (jd - J2000) / 36525.0
+    seconds = (67310.54841 + (876600.0 * 3600.0 + 8640184.812866) * t
+               + 0.093104 * t ** 2 - 6.2e-6 * t ** 3)
+    return np.remainder(seconds, SECONDS_PER_DAY) * (2 * np.pi / SECONDS_PER_DAY)
+
+
+def teme_to_ecef(r, jd):
+    """Rotate TEME positions (..., 3) at Julian dates jd into the Earth-fixed frame."""
+    theta = gmst(jd)
+    c, s = np.cos(theta), np.sin(theta)
+    x, y, z = r[..., 0], r[..., 1], r[..., 2]
+    return np.stack([c * x + s * y, -s * x + c * y, z], axis=-1)
+
+
+def topocentric(r_ecef, lat, lon, alt):
+    """Azimuth, elevation (degrees) and range (km) of ECEF positions (..., 3)."""
+    lat_r = np.radians(lat)
+    lon_r = np.radians(lon)
+    d = r_ecef - observer_ecef(lat, lon, alt)
+    dx, dy, dz = d[..., 0], d[..., 1], d[..., 2]
+    sin_lat, cos_lat = np.sin(lat_r), np.cos(lat_r)
+    sin_lon, cos_lon = np.sin(lon_r), np.cos(lon_r)
+    east = -sin_lon * dx + cos_lon * dy
+    north = -sin_lat * cos_lon * dx - sin_lat * sin_lon * dy + cos_lat * dz
+    up = cos_lat * cos_lon * dx + cos_lat * sin_lon * dy + sin_lat * dz
+    horizontal = np.hypot(east, north)
+    azimuth = np.degrees(np.arctan2(east, north)) % 360.0
+    elevation = np.degrees(np.arctan2(up, horizontal))
+    return azimuth, elevation, np.hypot(horizontal, up)
+
+
+def _split_jd(jd):
+    """Split Julian dates into the (whole, fraction) pair SGP4 expects."""
+    jd = np.asarray(jd, dtype=np.float64)
+    whole = np.floor(jd)
+    return whole, jd - whole
+
+
+def ecef_positions(satellites, t):
+    """Earth-fixed positions (km) and error flags at unix times t.
+
+    `satellites` is a Satrec, giving (n_times, 3) positions, or a
+    SatrecArray, giving (n_sats, n_times, 3).
+    """
+    # Whole days and the fraction are split before adding the epoch, so the
+    # times keep microsecond resolution (a single Julian date float does not)
+    t = np.asarray(t, dtype=np.float64)
+    days = np.floor(t / SECONDS_PER_DAY)
+    whole, fraction = UNIX_EPOCH_JD + days, (t - days * SECONDS_PER_DAY) / SECONDS_PER_DAY
+    if isinstance(satellites, SatrecArray):
+        error, r, _ = satellites.sgp4(whole, fraction)
+    else:
+        error, r, _ = satellites.sgp4_array(whole, fraction)
+    return teme_to_ecef(r, whole + fraction), error != 0
+
+
+class PassPredictor:
+    """Batch pass predictor for a set of satellites and one observer."""
+
+    def __init__(self, tles, lat, lon, alt, min_elevation=20, satrecs=None, keep_states=False):
+        """`satrecs`, if given, are already-built Satrec objects for the tles (skips parsing).
+
+        With `keep_states` the satellite states over the whole (unscreened)
+        prediction window are propagated and kept for reuse; meant for the
+        handful of satellites an app tracks, so it is ignored for more than
+        KEEP_STATES_MAX satellites.
+        """
+        self.tles = list(tles)
+        self.names = [name for name, _, _ in tles]
+        if satrecs is None:
+            satrecs = [Satrec.twoline2rv(line1, line2) for _, line1, line2 in tles]
+        self.satrecs = list(satrecs)
+        self.sat_array = SatrecArray(self.satrecs) if self.satrecs else None
+        # Peak angular rate of each orbit (rad/s), used to pad the screening test
+        e = np.array([s.ecco for s in self.satrecs])
+        n = np.array([s.no_kozai for s in self.satrecs]) / 60.0
+        self.max_angular_rate = n * (1 + e) ** 2 / (1 - e ** 2) ** 1.5
+        self.lat = float(lat)
+        self.lon = float(lon)
+        self.alt = float(alt)
+        self.min_elevation = float(min_elevation)
+        self.keep_states = keep_states and len(self.satrecs) <= KEEP_STATES_MAX
+        self._states = None  # (state jd, ECEF positions, velocities, propagation errors)
+        self._grid = None  # (jd, interpolated ECEF positions, errors) of the last prediction grid
+        self._elevations = None  # ((lat, lon, alt), elevation curves) on that grid
+
+    def set_location(self, lat, lon, alt):
+        """Change the observer location."""
+        self.lat, self.lon, self.alt = float(lat), float(lon), float(alt)
+
+    def look_angles_grid(self, jd):
+        """Az/el/range for every satellite at every time in jd, each shaped (n_sats, n_times)."""
+        whole, fraction = _split_jd(jd)
+        error, r, _ = self.sat_array.sgp4(whole, fraction)
+        azimuth, elevation, distance = topocentric(teme_to_ecef(r, jd), self.lat, self.lon, self.alt)
+        # Propagation failures (decayed objects etc.) are never above the horizon
+        elevation[error != 0] = -90.0
+        return azimuth, elevation, distance
+
+    def _keep_states(self, jd):
+        """Propagate and keep the states every STATE_STEP seconds over grid jd, unless they cover it."""
+        states = self._states
+        if states is not None and states[0][0] <= jd[0] and jd[-1] <= states[0][-1]:
+            return
+        n = int(np.ceil((jd[-1] - jd[0]) * SECONDS_PER_DAY / STATE_STEP)) + 1
+        state_jd = jd[0] + np.arange(max(n, 2)) * (STATE_STEP / SECONDS_PER_DAY)
+        whole, fraction = _split_jd(state_jd)
+        error, r, v = self.sat_array.sgp4(whole, fraction)
+        r_ecef = teme_to_ecef(r, state_jd)
+        # The Earth-fixed frame rotates under TEME: v_ecef = R v - omega x r_ecef
+        v_ecef = teme_to_ecef(v, state_jd)
+        v_ecef[..., 0] += EARTH_ROTATION * r_ecef[..., 1]
+        v_ecef[..., 1] -= EARTH_ROTATION * r_ecef[..., 0]
+        self._states = (state_jd, r_ecef, v_ecef, error != 0)
+        self._grid = None
+
+    def _interpolate_states(self, rows, jd):
+        """ECEF positions and error flags from the kept states by cubic Hermite interpolation.
+
+        `rows` are satellite indices broadcast against jd: matching 1-D
+        arrays give one position per pair, a column of indices gives every
+        satellite at every time.
+        """
+        state_jd, r, v, error = self._states
+        x = (np.asarray(jd, dtype=np.float64) - state_jd[0]) * (SECONDS_PER_DAY / STATE_STEP)
+        # x is never negative, so truncation is the floor
+        k = np.minimum(x.astype(np.intp), state_jd.size - 2)
+        s = (x - k)[..., None]
+        s2, u = s * s, 1 - s
+        position = ((1 + 2 * s) * u * u * r[rows, k] + s * u * u * STATE_STEP * v[rows, k]
+                    + s2 * (3 - 2 * s) * r[rows, k + 1] - s2 * u * STATE_STEP * v[rows, k + 1])
+        return position, error[rows, k] | error[rows, k + 1]
+
+    def _kept_elevation_grid(self, jd):
+        """Elevation curves on grid jd from the kept states; only the topocentric step is redone."""
+        self._keep_states(jd)
+        if self._grid is None or not np.array_equal(self._grid[0], jd):
+            rows = np.arange(len(self.satrecs))[:, None]
+            self._grid = (jd,) + self._interpolate_states(rows, jd)
+            self._elevations = None
+        _, r_ecef, error = self._grid
+        location = (self.lat, self.lon, self.alt)
+        if self._elevations is None or self._elevations[0] != location:
+            elevation = topocentric(r_ecef, *location)[1]
+            elevation[error] = -90.0
+            self._elevations = (location, elevation)
+        return self._elevations[1]
+
+    def _elevation_grid(self, jd, step):
+        """Elevation of every satellite on the grid jd, screened geometrically first.
+
+        Positions are first computed on a sparse SCREEN_STEP grid. A satellite
+        can only be above min_elevation when its geocentric angle from the
+        observer is inside the visibility cone for that elevation, padded by
+        how far the satellite and the Earth can turn in half a screening step.
+        Only the fine samples near such candidates are propagated; all others
+        are reported at -90 degrees.
+        """
+        if self.keep_states:
+            return self._kept_elevation_grid(jd)
+        ratio = int(round(SCREEN_STEP / step))
+        if ratio <= 1:
+            return self.look_angles_grid(jd)[1]
+        n_steps = jd.size
+        n_screen = -(-(n_steps - 1) // ratio) + 1
+        jd_screen = jd[0] + np.arange(n_screen) * (ratio * step / SECONDS_PER_DAY)
+        whole, fraction = _split_jd(jd_screen)
+        error, r, _ = self.sat_array.sgp4(whole, fraction)
+        r_ecef = teme_to_ecef(r, jd_screen)
+
+        site = observer_ecef(self.lat, self.lon, self.alt)
+        site_radius = np.linalg.norm(site)
+        sat_radius = np.linalg.norm(r_ecef, axis=-1)
+        cos_angle = (r_ecef @ site) / (sat_radius * site_radius)
+        angle = np.arccos(np.clip(cos_angle, -1.0, 1.0))
+        el = np.radians(self.min_elevation)
+        cone = np.arccos(np.clip(site_radius / sat_radius * np.cos(el), -1.0, 1.0)) - el
+        half_step = 0.5 * ratio * step
+        margin = (self.max_angular_rate[:, None] + EARTH_ROTATION) * half_step + np.radians(1.0)
+        candidate = (angle <= cone + margin) & (error == 0)
+
+        # Map every fine sample onto its nearest screening sample, then widen by
+        # one fine step on each side so every crossing keeps its bracket
+        mask = candidate[:, np.rint(np.arange(n_steps) / ratio).astype(np.intp)]
+        widened = mask.copy()
+        widened[:, 1:] |= mask[:, :-1]
+        widened[:, :-1] |= mask[:, 1:]
+
+        elevation = np.full(mask.shape, -90.0)
+        rows, cols = np.nonzero(widened)
+        if rows.size:
+            elevation[rows, cols] = self.look_angles(rows, jd[cols])[1]
+        return elevation
+
+    def look_angles(self, sat_index, jd):
+        """Az/el/range for arbitrary (satellite, time) pairs.
+
+        sat_index and jd are matching 1-D arrays. The loop runs over the
+        distinct satellites only, each call propagating all of that
+        satellite's times in one vectorized SGP4 call.
+        """
+        sat_index = np.asarray(sat_index)
+        jd = np.asarray(jd, dtype=np.float64)
+        r = np.empty(jd.shape + (3,))
+        error = np.zeros(jd.shape, dtype=bool)
+        order = np.argsort(sat_index, kind='stable')
+        satellites, starts = np.unique(sat_index[order], return_index=True)
+        for i, group in zip(satellites, np.split(order, starts[1:])):
+            whole, fraction = _split_jd(jd[group])
+            e, r_i, _ = self.satrecs[i].sgp4_array(whole, fraction)
+            r[group] = r_i
+            error[group] = e != 0
+        azimuth, elevation, distance = topocentric(teme_to_ecef(r, jd), self.lat, self.lon, self.alt)
+        elevation[error] = -90.0
+        return azimuth, elevation, distance
+
+    def _interpolated_look_angles(self, sat_index, jd):
+        """look_angles() from the kept states; the refinement of a keep_states prediction uses it."""
+        position, error = self._interpolate_states(np.asarray(sat_index), jd)
+        azimuth, elevation, distance = topocentric(position, self.lat, self.lon, self.alt)
+        elevation[error] = -90.0
+        return azimuth, elevation, distance
+
+    def _refine_crossings(self, sat_index, lo, hi, rising, look):
+        """Bisect threshold crossings between bracketing Julian dates lo and hi."""
+        lo = lo.copy()
+        hi = hi.copy()
+        tolerance = ROOT_TOLERANCE / SECONDS_PER_DAY
+        while lo.size and np.max(hi - lo) > tolerance:
+            mid = 0.5 * (lo + hi)
+            _, elevation, _ = look(sat_index, mid)
+            above = elevation >= self.min_elevation
+            # For a rise the crossing lies after mid if mid is still below
+            move_lo = ~above if rising else above
+            lo = np.where(move_lo, mid, lo)
+            hi = np.where(move_lo, hi, mid)
+        return 0.5 * (lo + hi)
+
+    def _refine_maxima(self, sat_index, lo, hi, look):
+        """Golden-section search for the elevation maximum inside [lo, hi]."""
+        ratio = (np.sqrt(5.0) - 1) / 2
+        a, b = lo.copy(), hi.copy()
+        c = b - ratio * (b - a)
+        d = a + ratio * (b - a)
+        _, fc, _ = look(sat_index, c)
+        _, fd, _ = look(sat_index, d)
+        for _ in range(TCA_ITERATIONS):
+            left = fc > fd
+            b = np.where(left, d, b)
+            a = np.where(left, a, c)
+            new_c = b - ratio * (b - a)
+            new_d = a + ratio * (b - a)
+            # Re-use the surviving interior point, evaluate only the new one
+            probe = np.where(left, new_c, new_d)
+            _, fp, _ = look(sat_index, probe)
+            fd, fc = np.where(left, fc, fp), np.where(left, fp, fd)
+            c, d = new_c, new_d
+        return 0.5 * (a + b)
+
+    def find_passes(self, start=None, days=PREDICTION_DAYS, step=COARSE_STEP, satellites=None):
+        """Predict all passes at or above min_elevation, sorted by AOS.
+
+        A pass already in progress at `start` is reported with AOS equal to
+        `start`; one still in progress at the end of the window is cut off there.
+        `satellites` restricts the search to those satellite indices.
+        """
+        if self.sat_array is None:
+            return []
+        if start is None:
+            start = datetime.now(timezone.utc)
+        jd0 = datetime_to_jd(start)
+        n_steps = int(np.ceil(days * SECONDS_PER_DAY / step)) + 1
+        jd = jd0 + np.arange(n_steps) * (step / SECONDS_PER_DAY)
+
+        elevation = self._elevation_grid(jd, step)
+        if satellites is not None:
+            satellites = np.asarray(satellites, dtype=np.intp)
+            elevation = elevation[satellites]
+        above = elevation >= self.min_elevation
+
+        # Pad with "below" on both ends so every pass has a rise and a set edge
+        padded = np.zeros((above.shape[0], n_steps + 2), dtype=np.int8)
+        padded[:, 1:-1] = above
+        edges = np.diff(padded, axis=1)
+        rows, rise = np.nonzero(edges == 1)
+        _, set_ = np.nonzero(edges == -1)
+        if rows.size == 0:
+            return []
+        sat_index = rows if satellites is None else satellites[rows]
+        # With kept states the refinement interpolates the grid instead of propagating
+        look = self._interpolated_look_angles if self.keep_states else self.look_angles
+
+        # AOS: refine inside [jd[rise-1], jd[rise]] unless the window started mid-pass
+        aos = jd[rise].copy()
+        inside = rise > 0
+        aos[inside] = self._refine_crossings(
+            sat_index[inside], jd[rise[inside] - 1], jd[rise[inside]], rising=True, look=look)
+
+        # LOS: refine inside [jd[set-1], jd[set]] unless the window ended mid-pass
+        los = jd[np.minimum(set_, n_steps) - 1].copy()
+        inside = set_ < n_steps
+        los[inside] = self._refine_crossings(
+            sat_index[inside], jd[set_[inside] - 1], jd[set_[inside]], rising=False, look=look)
+
+        # Coarse argmax of each pass segment, found with one segmented reduction
+        lengths = set_ - rise
+        flat = rows.repeat(lengths) * n_steps + (
+            np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            + rise.repeat(lengths))
+        samples = elevation.ravel()[flat]
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        segment_max = np.maximum.reduceat(samples, offsets)
+        segment_id = np.arange(lengths.size).repeat(lengths)
+        hits = np.nonzero(samples == segment_max[segment_id])[0]
+        _, first = np.unique(segment_id[hits], return_index=True)
+        peak = flat[hits[first]] % n_steps
+
+        tca = self._refine_maxima(
+            sat_index,
+            np.maximum(jd[np.maximum(peak - 1, 0)], aos),
+            np.minimum(jd[np.minimum(peak + 1, n_steps - 1)], los), look)
+
+        times = np.concatenate([aos, tca, los])
+        # The reported angles always come from SGP4, one call per satellite
+        azimuth, elevation, _ = self.look_angles(np.tile(sat_index, 3), times)
+        azimuth = azimuth.reshape(3, -1)
+        max_elevation = elevation.reshape(3, -1)[1]
+
+        passes = [
+            Pass(self.names[s], int(s), jd_to_datetime(aos[k]), jd_to_datetime(tca[k]),
+                 jd_to_datetime(los[k]), float(max_elevation[k]),
+                 float(azimuth[0, k]), float(azimuth[1, k]), float(azimuth[2, k]))
+            for k, s in enumerate(sat_index)
+        ]
+        passes.sort(key=lambda p: p.aos)
+        return passes
+
+    def pass_track(self, sat_pass, step=10.0):
+        """Az/el arrays sampled every `step` seconds from AOS to LOS of a pass."""
+        jd0 = datetime_to_jd(sat_pass.aos)
+        jd1 = datetime_to_jd(sat_pass.los)
+        n = max(int(np.ceil((jd1 - jd0) * SECONDS_PER_DAY / step)) + 1, 2)
+        jd = np.linspace(jd0, jd1, n)
+        azimuth, elevation, _ = self.look_angles(np.full(n, sat_pass.index), jd)
+        return azimuth, elevation
+
+
+def format_pass(sat_pass):
+    """Short one-line description of a pass for the status panels."""
+    aos = sat_pass.aos.astimezone()
+    duration = (sat_pass.los - sat_pass.aos).total_seconds() / 60
+    return (f"{sat_pass.name}: {aos:%d/%m %H:%M} "
+            f"{duration:.0f}min max {sat_pass.max_elevation:.0f}°")
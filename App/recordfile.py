@@ -0,0 +1,175 @@
+# recordfile.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Compact binary recording format for EZ-TRAK sessions (.ezt)
+#
+# Layout:
+#   8 bytes   magic b"EZTRAK\x00\x01"
+#   4 bytes   little-endian uint32 length of the JSON header
+#   n bytes   UTF-8 JSON header (observer lat/lon/alt, satellite, TLE, ...)
+#   padding   zeros up to the next multiple of 64 bytes
+#   blocks    fixed-size blocks of BLOCK_SAMPLES samples, see BLOCK_DTYPE
+#
+# Every block holds its sample count followed by one contiguous array per
+# column. Only the final block may be partly filled. The block being filled
+# is also written out every FLUSH_INTERVAL seconds and rewritten in place
+# as it grows, so a crash loses at most the last FLUSH_INTERVAL seconds.
+# The reader memory-maps the blocks as a structured NumPy array, so nothing
+# is parsed.
+
+import json
+import os
+import queue
+import struct
+import threading
+import time
+
+import numpy as np
+
+# Configuration
+MAGIC = b"EZTRAK\x00\x01"
+HEADER_ALIGN = 64
+BLOCK_SAMPLES = 1024  # Samples per block (about 50 seconds at 20 Hz)
+FLUSH_INTERVAL = 2.0  # Seconds between writes of the partly filled block
+RECORDINGS_DIR = os.path.join(os.path.expanduser("~"), ".eztrak", "recordings")
+
+BLOCK_DTYPE = np.dtype([
+    ("count", "<u4"),
+    ("reserved", "<u4"),
+    ("time", "<f8", (BLOCK_SAMPLES,)),  # Unix time, seconds
+    ("az", "<f4", (BLOCK_SAMPLES,)),  # Degrees
+    ("el", "<f4", (BLOCK_SAMPLES,)),  # Degrees
+    ("rssi", "<f4", (BLOCK_SAMPLES,)),  # dBm, NaN if unknown
+])
+COLUMNS = ("time", "az", "el", "rssi")
+
+
+def _encode_header(metadata):
+    body = json.dumps(dict(metadata, columns=list(COLUMNS), block_samples=BLOCK_SAMPLES)).encode()
+    header = MAGIC + struct.pack("<I", len(body)) + body
+    return header + b"\0" * (-len(header) % HEADER_ALIGN)
+
+
+def read_header(path):
+    """Return (metadata, data_offset) of a recording file."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an EZ-TRAK recording")
+        (length,) = struct.unpack("<I", f.read(4))
+        metadata = json.loads(f.read(length).decode())
+    offset = len(MAGIC) + 4 + length
+    return metadata, offset + (-offset % HEADER_ALIGN)
+
+
+class RecordingWriter:
+    """Streams samples to a recording file from a background writer thread.
+
+    append() only queues the batch, so it is cheap enough to call from the
+    GUI animation callback; the thread packs samples into blocks and writes
+    each one as soon as it is full, and the partial block every FLUSH_INTERVAL.
+    """
+
+    def __init__(self, path, metadata):
+        self.path = path
+        self.samples_written = 0  # Samples on disk, including the last partial block write
+        self._completed = 0  # Samples in full blocks
+        self._file = open(path, "wb")
+        self._file.write(_encode_header(metadata))
+        self._file.flush()
+        self._block = np.zeros(1, dtype=BLOCK_DTYPE)[0]
+        self._fill = 0
+        self._flushed_at = time.monotonic()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="ezTrakRecorder", daemon=True)
+        self._thread.start()
+
+    def append(self, t, az, el, rssi=None):
+        """Queue a batch of samples given as equal-length arrays."""
+        t = np.array(t, dtype=np.float64, ndmin=1)
+        if rssi is None:
+            rssi = np.full(t.size, np.nan)
+        self._queue.put((t, np.asarray(az, dtype=np.float32), np.asarray(el, dtype=np.float32),
+                         np.asarray(rssi, dtype=np.float32)))
+
+    def close(self):
+        """Write everything queued, including the final partial block, and close the file."""
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+    def _write_block(self, partial=False):
+        """Write the current block; a partial one is rewritten in place by the next write."""
+        self._block["count"] = self._fill
+        if partial:
+            # Pad the unused tail so the block still has the fixed size
+            for name in COLUMNS:
+                self._block[name][self._fill:] = np.nan
+        start = self._file.tell()
+        self._file.write(self._block.tobytes())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._flushed_at = time.monotonic()
+        if partial:
+            self._file.seek(start)
+            self.samples_written = self._completed + self._fill
+        else:
+            self._completed += self._fill
+            self.samples_written = self._completed
+            self._fill = 0
+
+    def _run(self):
+        while True:
+            try:
+                batch = self._queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                batch = ()
+            if batch is None:
+                if self._fill:
+                    self._write_block(partial=True)
+                return
+            done = 0
+            n = batch[0].size if batch else 0
+            while done < n:
+                count = min(n - done, BLOCK_SAMPLES - self._fill)
+                for name, values in zip(COLUMNS, batch):
+                    self._block[name][self._fill:self._fill + count] = values[done:done + count]
+                self._fill += count
+                done += count
+                if self._fill == BLOCK_SAMPLES:
+                    self._write_block()
+            if self._fill and time.monotonic() - self._flushed_at >= FLUSH_INTERVAL:
+                self._write_block(partial=True)
+
+
+class Recording:
+    """Memory-mapped, read-only view of a recording file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.metadata, offset = read_header(path)
+        n_blocks = (os.path.getsize(path) - offset) // BLOCK_DTYPE.itemsize
+        if n_blocks:
+            self.blocks = np.memmap(path, dtype=BLOCK_DTYPE, mode="r", offset=offset, shape=(n_blocks,))
+        else:
+            self.blocks = np.zeros(0, dtype=BLOCK_DTYPE)
+        self.length = int(self.blocks["count"].sum())
+
+    def __len__(self):
+        return self.length
+
+    def column(self, name):
+        """One column as a 1-D array (a view of the file when it fits in one block)."""
+        values = self.blocks[name]
+        if values.shape[0] == 1:
+            return values[0, :self.length]
+        return values.reshape(-1)[:self.length]
+
+    def columns(self):
+        """Dict of every column, see column()."""
+        return {name: self.column(name) for name in COLUMNS}
+
+
+def read_recording(path):
+    """Return (metadata, columns) of a recording file."""
+    recording = Recording(path)
+    return recording.metadata, recording.columns()
@@ -0,0 +1,209 @@
+# rotctl.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Persistent, pipelined hamlib rotctld client for the EZ-TRAK rotator
+#
+# One background thread owns a single TCP connection to rotctld and
+# reconnects with exponential backoff when it drops. Commands are written
+# without waiting for the previous reply (rotctld answers in order), and
+# position setpoints are coalesced: set_position() only replaces the
+# pending target, so a burst of tracking updates can never queue up stale
+# moves behind the one in flight.
+
+import select
+import socket
+import threading
+import time
+from collections import deque
+
+# Configuration
+DEFAULT_PORT = 4533  # Standard rotctld port
+POLL_INTERVAL = 0.2  # Seconds between get_pos ("p") requests
+MAX_SETPOINTS_IN_FLIGHT = 1  # "P" commands sent but not yet acknowledged
+RESPONSE_TIMEOUT = 3.0  # Seconds without a reply before the link is declared dead
+CONNECT_TIMEOUT = 3.0  # Seconds
+BACKOFF_MIN = 0.5  # Seconds before the first reconnect attempt
+BACKOFF_MAX = 10.0  # Upper bound of the reconnect delay
+LATENCY_SMOOTHING = 0.2  # Weight of the newest round trip in the latency average
+
+
+class RotctlClient:
+    """Background rotctld client; all public methods are thread-safe and non-blocking."""
+
+    def __init__(self, host, port=DEFAULT_PORT, poll_interval=POLL_INTERVAL, round_trips=None):
+        self.host = host
+        self.port = int(port)
+        self.poll_interval = poll_interval
+        self.status = "Disconnected"
+        self.connected = False
+        self.position = None  # (az, el, unix time) of the last get_pos reply
+        self.latency = None  # Smoothed command round-trip time in seconds
+        self.round_trips = round_trips  # Optional Histogram every round trip is recorded into
+        self.counters = {"sent": 0, "coalesced": 0, "errors": 0, "reconnects": 0}
+        self._lock = threading.Lock()
+        self._setpoint = None
+        self._urgent = deque()
+        self._closed = threading.Event()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._thread = None
+
+    # Public API
+
+    def start(self):
+        """Start connecting in the background."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ezTrakRotctl", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Disconnect and stop the background thread."""
+        self._closed.set()
+        self._wake()
+        if self._thread is None:
+            self._close_wake()
+        else:
+            # The thread closes the wake sockets itself once it has exited
+            self._thread.join(RESPONSE_TIMEOUT)
+
+    def set_position(self, az, el):
+        """Request a move; replaces any target that has not been sent yet."""
+        with self._lock:
+            if self._setpoint is not None:
+                self.counters["coalesced"] += 1
+            self._setpoint = (float(az), float(el))
+        self._wake()
+
+    def stop_rotator(self):
+        """Stop the rotator now, dropping any pending target."""
+        self._send_urgent("S")
+
+    def park(self):
+        """Send the rotator to its park (home) position."""
+        self._send_urgent("K")
+
+    # Background thread
+
+    def _send_urgent(self, command):
+        with self._lock:
+            self._setpoint = None
+            self._urgent.append(command)
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+
+    def _close_wake(self):
+        self._wake_r.close()
+        self._wake_w.close()
+
+    def _run(self):
+        try:
+            self._connect_loop()
+        finally:
+            self._close_wake()
+
+    def _connect_loop(self):
+        backoff = BACKOFF_MIN
+        while not self._closed.is_set():
+            self.status = "Connecting"
+            try:
+                sock = socket.create_connection((self.host, self.port), timeout=CONNECT_TIMEOUT)
+            except OSError as e:
+                self.status = f"Retry in {backoff:.0f}s ({e.strerror or e})"
+                self._closed.wait(backoff)
+                backoff = min(backoff * 2, BACKOFF_MAX)
+                continue
+            backoff = BACKOFF_MIN
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.connected = True
+            self.status = "Connected"
+            try:
+                self._session(sock)
+            except (OSError, ValueError) as e:
+                self.counters["errors"] += 1
+                self.status = f"Connection lost ({e})"
+            finally:
+                self.connected = False
+                sock.close()
+            if not self._closed.is_set():
+                self.counters["reconnects"] += 1
+        self.status = "Disconnected"
+
+    def _session(self, sock):
+        sock.setblocking(False)
+        in_flight = deque()  # (command letter, send time) awaiting replies, in order
+        lines = deque()
+        buffer = b""
+        outgoing = b""  # Commands the socket has not accepted yet
+        last_poll = 0.0
+        while not self._closed.is_set():
+            now = time.monotonic()
+            out = []
+            with self._lock:
+                while self._urgent:
+                    out.append((self._urgent.popleft(), ""))
+                setpoints = sum(1 for kind, _ in in_flight if kind == "P")
+                if self._setpoint is not None and setpoints < MAX_SETPOINTS_IN_FLIGHT:
+                    az, el = self._setpoint
+                    self._setpoint = None
+                    out.append(("P", f" {az:.2f} {el:.2f}"))
+            if now - last_poll >= self.poll_interval and not any(k == "p" for k, _ in in_flight):
+                out.append(("p", ""))
+                last_poll = now
+            if out:
+                outgoing += "".join(kind + args + "\n" for kind, args in out).encode()
+                in_flight.extend((kind, now) for kind, _ in out)
+                self.counters["sent"] += len(out)
+            if outgoing:
+                # Non-blocking: keep whatever the socket buffer cannot take for the next pass
+                try:
+                    outgoing = outgoing[sock.send(outgoing):]
+                except BlockingIOError:
+                    pass
+
+            if in_flight and now - in_flight[0][1] > RESPONSE_TIMEOUT:
+                raise OSError("rotctld not responding")
+            if any(k == "p" for k, _ in in_flight):
+                timeout = self.poll_interval
+            else:
+                timeout = max(self.poll_interval - (now - last_poll), 0.0)
+            # Also wakes when a blocked write can continue; the send happens at the top of the loop
+            readable, _, _ = select.select([sock, self._wake_r], [sock] if outgoing else [], [], timeout)
+            if self._wake_r in readable:
+                try:
+                    while self._wake_r.recv(256):
+                        pass
+                except BlockingIOError:
+                    pass
+            if sock in readable:
+                data = sock.recv(4096)
+                if not data:
+                    raise OSError("connection closed by rotctld")
+                buffer += data
+                *complete, buffer = buffer.split(b"\n")
+                lines.extend(line.decode(errors="replace").strip() for line in complete)
+                self._handle_replies(in_flight, lines)
+
+    def _handle_replies(self, in_flight, lines):
+        """Match buffered reply lines to the oldest commands in flight."""
+        while in_flight and lines:
+            kind, sent = in_flight[0]
+            if kind == "p" and not lines[0].startswith("RPRT"):
+                if len(lines) < 2:
+                    return
+                az, el = float(lines.popleft()), float(lines.popleft())
+                self.position = (az, el, time.time())
+            else:
+                reply = lines.popleft()
+                if reply.startswith("RPRT") and reply != "RPRT 0":
+                    self.counters["errors"] += 1
+            in_flight.popleft()
+            rtt = time.monotonic() - sent
+            if self.round_trips is not None:
+                self.round_trips.record(rtt)
+            self.latency = rtt if self.latency is None else (
+                (1 - LATENCY_SMOOTHING) * self.latency + LATENCY_SMOOTHING * rtt)
@@ -0,0 +1,110 @@
+# satindex.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Satellite name / NORAD / COSPAR index over the cached TLE catalog
+#
+# Built once per TLE refresh by TLEStore.index(). Exact lookups are dict
+# hits, prefix completion is a binary search over the sorted names, and
+# fuzzy matching only scores the records that share a word with the query.
+
+import bisect
+import difflib
+import re
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]+")
+_COSPAR = re.compile(r"^(\d{2}|\d{4})-?(\d{3})([A-Z]{0,3})$")
+
+
+def normalize_name(name):
+    """Uppercase a name and reduce punctuation to single spaces ("ISS (ZARYA)" -> "ISS ZARYA")."""
+    return _NON_ALNUM.sub(" ", name.upper()).strip()
+
+
+def normalize_cospar(designator):
+    """Normalize an international designator to YYYY-NNNP form, or None if it is not one."""
+    match = _COSPAR.match(designator.strip().upper())
+    if match is None:
+        return None
+    year, number, piece = match.groups()
+    if len(year) == 2:
+        year = ("20" if int(year) < 57 else "19") + year
+    return f"{year}-{number}{piece}"
+
+
+class SatelliteIndex:
+    """Lookup tables mapping names, NORAD IDs and COSPAR IDs to catalog rows."""
+
+    def __init__(self, names, line1s):
+        self.names = [str(name).strip() for name in names]
+        self.by_name = {}
+        self.by_norad = {}
+        self.by_cospar = {}
+        self.by_word = {}
+        for row, (name, line1) in enumerate(zip(self.names, line1s)):
+            key = normalize_name(name)
+            # First entry wins so duplicate names resolve to the catalog order
+            self.by_name.setdefault(key, row)
+            self.by_name.setdefault(key.replace(" ", ""), row)
+            norad = line1[2:7].strip()
+            if norad.isdigit():
+                self.by_norad.setdefault(int(norad), row)
+            cospar = normalize_cospar(line1[9:17])
+            if cospar:
+                self.by_cospar.setdefault(cospar, row)
+            for word in key.split():
+                self.by_word.setdefault(word, []).append(row)
+        self.sorted_keys = sorted(self.by_name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, query):
+        """Catalog row for an exact name, NORAD ID or COSPAR ID, or None."""
+        query = str(query).strip()
+        if query.isdigit():
+            return self.by_norad.get(int(query))
+        cospar = normalize_cospar(query)
+        if cospar and cospar in self.by_cospar:
+            return self.by_cospar[cospar]
+        key = normalize_name(query)
+        row = self.by_name.get(key)
+        if row is None:
+            row = self.by_name.get(key.replace(" ", ""))
+        return row
+
+    def complete(self, prefix, limit=10):
+        """Names starting with `prefix`, for autocomplete."""
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        start = bisect.bisect_left(self.sorted_keys, key)
+        rows = []
+        for i in range(start, len(self.sorted_keys)):
+            candidate = self.sorted_keys[i]
+            if not candidate.startswith(key) or len(rows) >= limit:
+                break
+            row = self.by_name[candidate]
+            if row not in rows:
+                rows.append(row)
+        return [self.names[row] for row in rows]
+
+    def search(self, query, limit=5, cutoff=0.6):
+        """Exact match if there is one, else prefix matches, else the closest fuzzy matches."""
+        row = self.lookup(query)
+        if row is not None:
+            return [self.names[row]]
+        completions = self.complete(query, limit)
+        if completions:
+            return completions
+        key = normalize_name(query)
+        candidates = set()
+        for word in key.split():
+            candidates.update(self.by_word.get(word, ()))
+            # Also score names sharing the word's first letters, so typos later in it still match
+            start = bisect.bisect_left(self.sorted_keys, word[:3])
+            for other in self.sorted_keys[start:start + 50]:
+                if other.startswith(word[:3]):
+                    candidates.add(self.by_name[other])
+        choices = {normalize_name(self.names[row]): row for row in candidates}
+        matches = difflib.get_close_matches(key, list(choices), n=limit, cutoff=cutoff)
+        return [self.names[choices[match]] for match in matches]
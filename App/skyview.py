@@ -0,0 +1,106 @@
+# skyview.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# All-sky layer: every catalog satellite above the horizon on the polar plot
+#
+# The whole catalog is propagated as one SatrecArray call per tick, objects
+# below the horizon are culled with a NumPy mask, and the survivors are
+# drawn by a single scatter collection whose offsets are replaced in place.
+# A frame budget keeps the layer from starving the rest of the GUI: when a
+# tick takes too long only every n-th satellite is re-propagated per tick
+# (the others keep their last position), and the stride relaxes again once
+# there is headroom.
+
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from passpredict import PassPredictor, datetime_to_jd
+
+# Configuration
+FRAME_BUDGET = 0.010  # Seconds the layer may spend per tick
+MAX_STRIDE = 64  # Slowest refresh: each satellite re-propagated every 64 ticks
+MAX_POINTS = 2000  # Most satellites drawn at once (highest elevation first)
+MARKER_SIZE = 6
+
+
+class SkyLayer:
+    """Scatter of every satellite in a catalog that is above the horizon."""
+
+    def __init__(self, ax, tles, location, radius_scale=1.0, budget=FRAME_BUDGET,
+                 max_points=MAX_POINTS, **scatter_kwargs):
+        self.ax = ax
+        self.radius_scale = radius_scale  # Plot radius per degree of zenith distance
+        self.budget = budget
+        self.max_points = max_points
+        self.predictor = PassPredictor(tles, *location)
+        self._subsets = {}  # (stride, phase) -> (satellite indices, PassPredictor of just those)
+        n = len(self.predictor.satrecs)
+        self.az = np.zeros(n)
+        self.el = np.full(n, -90.0)
+        self.stride = 1
+        self.visible = 0  # Satellites drawn by the last update
+        self.last_duration = 0.0
+        self._phase = 0
+        scatter_kwargs.setdefault("s", MARKER_SIZE)
+        scatter_kwargs.setdefault("c", "tab:purple")
+        scatter_kwargs.setdefault("alpha", 0.6)
+        scatter_kwargs.setdefault("linewidths", 0)
+        self.collection = ax.scatter(np.empty(0), np.empty(0), **scatter_kwargs)
+
+    def set_location(self, lat, lon, alt):
+        """Move the observer; every position is recomputed on the next update."""
+        self.predictor.set_location(lat, lon, alt)
+        for _, predictor in self._subsets.values():
+            predictor.set_location(lat, lon, alt)
+        self.el[:] = -90.0
+        self.stride = 1
+
+    def update(self, now=None):
+        """Propagate (part of) the catalog to `now` and refresh the scatter offsets."""
+        started = time.perf_counter()
+        if now is None:
+            now = time.time()
+        jd = np.array([datetime_to_jd(datetime.fromtimestamp(now, timezone.utc))])
+        if self.stride == 1:
+            az, el, _ = self.predictor.look_angles_grid(jd)
+            self.az, self.el = az[:, 0], el[:, 0]
+        else:
+            index, predictor = self._subset(self.stride, self._phase)
+            self._phase = (self._phase + 1) % self.stride
+            az, el, _ = predictor.look_angles_grid(jd)
+            self.az[index], self.el[index] = az[:, 0], el[:, 0]
+
+        # Cull below-horizon objects before handing anything to matplotlib
+        up = np.nonzero(self.el > 0)[0]
+        if up.size > self.max_points:
+            up = up[np.argpartition(-self.el[up], self.max_points)[:self.max_points]]
+        self.visible = up.size
+        offsets = np.column_stack((np.radians(self.az[up]), (90 - self.el[up]) * self.radius_scale))
+        self.collection.set_offsets(offsets)
+
+        # Adapt the stride to the frame budget
+        self.last_duration = time.perf_counter() - started
+        if self.last_duration > self.budget and self.stride < MAX_STRIDE:
+            self.stride *= 2
+            self._phase %= self.stride
+        elif self.last_duration < self.budget / 4 and self.stride > 1:
+            self.stride //= 2
+            self._phase %= self.stride
+        return self.collection
+
+    def _subset(self, stride, phase):
+        """Every stride-th satellite from phase, with a batch predictor built once per subset."""
+        if (stride, phase) not in self._subsets:
+            p = self.predictor
+            index = np.arange(phase, len(p.satrecs), stride)
+            subset = PassPredictor([p.tles[i] for i in index], p.lat, p.lon, p.alt,
+                                   satrecs=[p.satrecs[i] for i in index])
+            self._subsets[stride, phase] = (index, subset)
+        return self._subsets[stride, phase]
+
+    def clear(self):
+        """Hide every point (the layer keeps its state for the next update)."""
+        self.collection.set_offsets(np.empty((0, 2)))
+        self.visible = 0
@@ -0,0 +1,281 @@
+# tlestore.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Persistent on-disk TLE store shared by the EZ-TRAK apps
+#
+# Each source (Celestrak, SatNOGS) is cached separately with the time it was
+# last fetched and its ETag / Last-Modified validators. Once a source is
+# older than MAX_AGE it is revalidated with a conditional GET, so an
+# unchanged catalog costs one small 304 response. The parsed catalog is kept
+# as NumPy arrays in a .npz file, so loading it never re-parses TLE text.
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import requests
+
+from passpredict import datetime_to_jd, parse_tle_text
+from satindex import SatelliteIndex
+
+# Configuration
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".eztrak", "tle")
+MAX_AGE = 12 * 3600  # Seconds before a cached source is revalidated
+REQUEST_TIMEOUT = 20  # Seconds
+REFRESH_POLL = 100  # Milliseconds between checks for a finished background refresh
+
+# TLE sources, in order of preference when both carry the same epoch
+SOURCES = {
+    "celestrak": {
+        "url": "https://celestrak.org/NORAD/elements/gp.php?GROUP=active&FORMAT=tle",
+        "format": "tle",
+    },
+    "satnogs": {
+        "url": "https://db.satnogs.org/api/tle/?format=json",
+        "format": "satnogs",
+    },
+}
+
+
+def parse_satnogs_json(text):
+    """Parse the SatNOGS DB /api/tle/ JSON into (name, line1, line2) tuples.
+
+    Records without both TLE lines are skipped; a payload that is not a JSON
+    list raises ValueError.
+    """
+    items = json.loads(text)
+    if not isinstance(items, list):
+        raise ValueError("SatNOGS TLE payload is not a list")
+    entries = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        name, line1, line2 = item.get("tle0"), item.get("tle1"), item.get("tle2")
+        if not isinstance(line1, str) or not isinstance(line2, str):
+            continue
+        name = name.strip() if isinstance(name, str) else ""
+        if name.startswith("0 "):
+            name = name[2:]
+        entries.append((name.strip(), line1.strip(), line2.strip()))
+    return entries
+
+
+def tle_epoch(line1):
+    """Epoch of a TLE as a Julian date."""
+    year = int(line1[18:20])
+    year += 2000 if year < 57 else 1900
+    day = float(line1[20:32])
+    return datetime_to_jd(datetime(year, 1, 1, tzinfo=timezone.utc)) + day - 1
+
+
+def entries_to_arrays(entries):
+    """Pack (name, line1, line2) tuples into the arrays stored on disk."""
+    return {
+        "name": np.array([e[0] for e in entries], dtype=str),
+        "line1": np.array([e[1] for e in entries], dtype="U69"),
+        "line2": np.array([e[2] for e in entries], dtype="U69"),
+        "norad": np.array([int(e[1][2:7]) if e[1][2:7].strip().isdigit() else -1
+                           for e in entries], dtype=np.int64),
+        "epoch": np.array([tle_epoch(e[1]) for e in entries], dtype=np.float64),
+    }
+
+
+class TLEStore:
+    """Local TLE catalog with per-source freshness tracking."""
+
+    def __init__(self, cache_dir=CACHE_DIR, sources=None, max_age=MAX_AGE):
+        self.cache_dir = cache_dir
+        self.sources = sources if sources is not None else SOURCES
+        self.max_age = max_age
+        self._catalog = None
+        self._index = None
+        self._refresh_thread = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # Paths and metadata
+
+    def _data_path(self, source):
+        return os.path.join(self.cache_dir, f"{source}.npz")
+
+    def _meta_path(self, source):
+        return os.path.join(self.cache_dir, f"{source}.json")
+
+    def metadata(self, source):
+        """Stored fetch metadata for a source (empty if never fetched)."""
+        try:
+            with open(self._meta_path(source)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_atomic(self, path, write):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+
+    def _save_metadata(self, source, meta):
+        self._write_atomic(self._meta_path(source),
+                           lambda f: f.write(json.dumps(meta).encode()))
+
+    def age(self, source):
+        """Seconds since a source was last fetched or revalidated, None if never."""
+        fetched = self.metadata(source).get("fetched_at")
+        return None if fetched is None else time.time() - fetched
+
+    def is_fresh(self, source):
+        """True if a source is cached and younger than max_age."""
+        age = self.age(source)
+        return age is not None and age < self.max_age and os.path.exists(self._data_path(source))
+
+    def time_to_refresh(self):
+        """Seconds until the first source is due for revalidation (0 if one is due now)."""
+        if not all(self.is_fresh(source) for source in self.sources):
+            return 0.0
+        return max(min((self.max_age - self.age(source) for source in self.sources),
+                       default=self.max_age), 0.0)
+
+    # Network refresh
+
+    def refresh_source(self, source, force=False):
+        """Bring one source up to date.
+
+        Returns "fresh" (cache young enough, no request made), "not-modified"
+        (server answered 304), "updated", or "error: ..." when the download
+        failed or its payload could not be parsed; the existing cache is
+        then left untouched.
+        """
+        if not force and self.is_fresh(source):
+            return "fresh"
+        config = self.sources[source]
+        meta = self.metadata(source)
+        headers = {}
+        if os.path.exists(self._data_path(source)):
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = requests.get(config["url"], headers=headers, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 304:
+                meta["fetched_at"] = time.time()
+                self._save_metadata(source, meta)
+                return "not-modified"
+            response.raise_for_status()
+        except requests.RequestException as e:
+            return f"error: {e}"
+
+        try:
+            if config["format"] == "satnogs":
+                entries = parse_satnogs_json(response.text)
+            else:
+                entries = parse_tle_text(response.text)
+            if not entries:
+                raise ValueError("no TLEs in the response")
+            arrays = entries_to_arrays(entries)
+        except ValueError as e:
+            # A bad payload must not replace a good cache
+            return f"error: {e}"
+        self._write_atomic(self._data_path(source), lambda f: np.savez(f, **arrays))
+        self._save_metadata(source, {
+            "url": config["url"],
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "count": len(entries),
+        })
+        self._catalog = None
+        self._index = None
+        return "updated"
+
+    def refresh(self, force=False):
+        """Refresh every source, returning {source: status}."""
+        return {source: self.refresh_source(source, force) for source in self.sources}
+
+    def refresh_in_background(self, root, callback, force=False):
+        """Run refresh() in a worker thread and call callback(results) on the Tk thread.
+
+        Tk may only be used from the thread running its mainloop, so the
+        worker just hands its results over and root.after() polls for them.
+        Returns False, and does nothing, while an earlier refresh is running.
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return False
+        done = []
+        self._refresh_thread = threading.Thread(target=lambda: done.append(self.refresh(force)),
+                                                name="ezTrakTLE", daemon=True)
+        self._refresh_thread.start()
+
+        def poll():
+            if done:
+                callback(done[0])
+            else:
+                root.after(REFRESH_POLL, poll)
+
+        root.after(REFRESH_POLL, poll)
+        return True
+
+    # Catalog access
+
+    def load_source(self, source):
+        """Parsed arrays for one source, or None if it has never been fetched."""
+        path = self._data_path(source)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            return {key: data[key] for key in data.files}
+
+    def catalog(self):
+        """Merged catalog arrays; for each NORAD ID the newest epoch wins."""
+        if self._catalog is not None:
+            return self._catalog
+        parts = [p for p in (self.load_source(s) for s in self.sources) if p is not None]
+        if not parts:
+            return None
+        merged = {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+        # Stable sort by (NORAD ID, newest epoch first) keeps source order on ties
+        order = np.lexsort((-merged["epoch"], merged["norad"]))
+        norad = merged["norad"][order]
+        keep = order[np.concatenate(([True], norad[1:] != norad[:-1]))]
+        keep.sort()
+        self._catalog = {key: value[keep] for key, value in merged.items()}
+        return self._catalog
+
+    def index(self):
+        """SatelliteIndex over the merged catalog, rebuilt after each refresh."""
+        if self._index is None:
+            catalog = self.catalog()
+            if catalog is None:
+                return None
+            self._index = SatelliteIndex(catalog["name"].tolist(), catalog["line1"].tolist())
+        return self._index
+
+    def entries(self, names=None):
+        """(name, line1, line2) tuples, optionally only those matching `names`.
+
+        Names may also be NORAD or COSPAR IDs; unknown names are skipped.
+        """
+        catalog = self.catalog()
+        if catalog is None:
+            return []
+        if names is None:
+            rows = range(catalog["name"].size)
+        else:
+            index = self.index()
+            rows = [row for row in (index.lookup(name) for name in names) if row is not None]
+        return [(str(catalog["name"][i]), str(catalog["line1"][i]), str(catalog["line2"][i]))
+                for i in rows]
+
+    def summary(self):
+        """Short human-readable description of each source's cache state."""
+        parts = []
+        for source in self.sources:
+            age = self.age(source)
+            if age is None:
+                parts.append(f"{source}: none")
+            else:
+                parts.append(f"{source}: {age / 3600:.1f}h old")
+        return ", ".join(parts)
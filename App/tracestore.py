@@ -0,0 +1,86 @@
+# tracestore.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# In-memory store for recorded tracking traces
+#
+# Samples are written into fixed-size, preallocated chunks, so appending is
+# O(1) with no reallocation or copying, and nothing is ever dropped. Each
+# chunk holds one contiguous row per column; a trace that fits in one chunk
+# (a 15 minute pass at 20 Hz does) is read back as zero-copy views.
+
+import numpy as np
+
+from recordfile import COLUMNS
+
+# Configuration
+CHUNK_SIZE = 65536  # Samples per chunk (about 55 minutes at 20 Hz)
+
+
+class TraceStore:
+    """Append-only columnar store of (time, az, el, rssi) samples."""
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._chunks = []
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def _chunk(self, k):
+        """Return chunk k, allocating it (and any before it) on first use."""
+        while len(self._chunks) <= k:
+            self._chunks.append(np.empty((len(COLUMNS), self.chunk_size)))
+        return self._chunks[k]
+
+    def append(self, t, az, el, rssi=np.nan):
+        """Append one sample."""
+        k, i = divmod(self._length, self.chunk_size)
+        chunk = self._chunk(k)
+        chunk[0, i] = t
+        chunk[1, i] = az
+        chunk[2, i] = el
+        chunk[3, i] = rssi
+        self._length += 1
+
+    def extend(self, t, az, el, rssi=None):
+        """Append a batch of samples given as equal-length arrays."""
+        t = np.asarray(t, dtype=np.float64)
+        n = t.size
+        if rssi is None:
+            rssi = np.full(n, np.nan)
+        batch = np.vstack([t, np.asarray(az, dtype=np.float64),
+                           np.asarray(el, dtype=np.float64), np.asarray(rssi, dtype=np.float64)])
+        done = 0
+        while done < n:
+            k, i = divmod(self._length, self.chunk_size)
+            count = min(n - done, self.chunk_size - i)
+            self._chunk(k)[:, i:i + count] = batch[:, done:done + count]
+            self._length += count
+            done += count
+
+    def clear(self):
+        """Forget all samples but keep the chunks allocated for reuse."""
+        self._length = 0
+
+    def chunks(self):
+        """Zero-copy (len(COLUMNS), n) views of the filled part of each chunk."""
+        full, rest = divmod(self._length, self.chunk_size)
+        views = [self._chunks[k] for k in range(full)]
+        if rest:
+            views.append(self._chunks[full][:, :rest])
+        return views
+
+    def column(self, name):
+        """One column as a contiguous array; a view when the trace fits in one chunk."""
+        row = COLUMNS.index(name)
+        views = self.chunks()
+        if not views:
+            return np.empty(0)
+        if len(views) == 1:
+            return views[0][row]
+        return np.concatenate([view[row] for view in views])
+
+    def columns(self):
+        """Dict of every column, see column()."""
+        return {name: self.column(name) for name in COLUMNS}
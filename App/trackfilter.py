@@ -0,0 +1,243 @@
+# trackfilter.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Smoothing stage between the device reader and the display / recorder
+#
+# KalmanFilter is a constant-velocity Kalman filter run on azimuth and
+# elevation (position and rate per axis), optionally fused with the
+# predicted track of the pass being followed. The covariance and gains only
+# depend on the sample spacing, and with samples arriving at a steady rate
+# they settle within a few dozen samples to a steady state that is computed
+# once per rate; only the start, gaps and rate changes are stepped through
+# sample by sample. The state update is then an affine recurrence solved for
+# a whole batch at once with a log-step prefix scan in NumPy. The same code
+# filters each drained chunk live and a full recorded session offline.
+#
+# DisplayDecimator passes a position on to the plot only when it moved by
+# more than a threshold, so sensor jitter does not trigger redraws.
+
+import bisect
+
+import numpy as np
+
+# Configuration
+ACCEL_NOISE = 5.0  # deg/s^2, how hard the antenna is expected to be swung
+MEASUREMENT_NOISE = 0.5  # deg, IMU az/el jitter (1 sigma)
+INITIAL_RATE = 10.0  # deg/s, 1 sigma uncertainty of the rate when the filter starts
+PREDICTION_NOISE = 3.0  # deg, expected hand-pointing error around the predicted track
+DISPLAY_THRESHOLD = 0.2  # deg of movement before the plot is updated
+STEADY_TOLERANCE = 0.1  # Relative jitter of the sample spacing still served by the steady-state gains
+CONVERGENCE_TOLERANCE = 0.01  # Relative distance of the covariance from the steady state to switch to it
+STEADY_ITERATIONS = 10000  # Upper bound on the steps taken to find the steady state
+
+
+def angular_separation(az1, el1, az2, el2):
+    """Great-circle angle in degrees between two sets of az/el directions."""
+    az1, el1, az2, el2 = (np.radians(a) for a in (az1, el1, az2, el2))
+    cos_d = np.sin(el1) * np.sin(el2) + np.cos(el1) * np.cos(el2) * np.cos(az1 - az2)
+    return np.degrees(np.arccos(np.clip(cos_d, -1.0, 1.0)))
+
+
+def _kalman_step(covariance, h, r, q):
+    """One predict + update of the shared covariance; returns (covariance, (k1, k2))."""
+    p11, p12, p22 = covariance
+    p11 += h * (2 * p12 + h * p22) + q * h ** 3 / 3
+    p12 += h * p22 + q * h ** 2 / 2
+    p22 += q * h
+    s = p11 + r
+    k1, k2 = p11 / s, p12 / s
+    p22 -= k2 * p12
+    p12 -= k1 * p12
+    p11 -= k1 * p11
+    return (p11, p12, p22), (k1, k2)
+
+
+def steady_state(h, r, q):
+    """Covariance and gains the filter settles to for spacing h, measurement variance r, process q."""
+    covariance = (r, 0.0, INITIAL_RATE ** 2)
+    for _ in range(STEADY_ITERATIONS):
+        previous = covariance
+        covariance, gains = _kalman_step(covariance, h, r, q)
+        if all(abs(a - b) <= 1e-12 * abs(a) for a, b in zip(covariance, previous)):
+            break
+    return covariance, gains
+
+
+def _close(covariance, steady, tolerance=CONVERGENCE_TOLERANCE):
+    return all(abs(a - b) <= tolerance * abs(b) for a, b in zip(covariance, steady))
+
+
+def _wrap(angle):
+    """Angle difference in degrees wrapped to [-180, 180)."""
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+def _affine_scan(a, b):
+    """Solve x[k] = a[k] @ x[k-1] + b[k] for every k at once (x[-1] = 0).
+
+    a is (n, 2, 2) and b is (n, 2, m). After step s every entry holds the
+    composition of the 2**s maps ending at it, so log2(n) batched matrix
+    products replace the sequential loop.
+    """
+    a = a.copy()
+    b = b.copy()
+    shift = 1
+    while shift < len(a):
+        b[shift:] = a[shift:] @ b[:-shift] + b[shift:]
+        a[shift:] = a[shift:] @ a[:-shift]
+        shift *= 2
+    return b
+
+
+class KalmanFilter:
+    """Constant-velocity Kalman filter for az/el samples.
+
+    `process(t, az, el)` returns the filtered samples and keeps the state
+    for the next call, so it can be fed drained chunks as they arrive or a
+    whole session in one go. With `predicted` set (anything with an
+    `at(t) -> (az, el)` method, e.g. a PassEphemeris), every sample is fused
+    with the predicted position wherever it is defined.
+    """
+
+    def __init__(self, accel_noise=ACCEL_NOISE, measurement_noise=MEASUREMENT_NOISE,
+                 prediction_noise=PREDICTION_NOISE, predicted=None):
+        self.accel_noise = accel_noise
+        self.measurement_noise = measurement_noise
+        self.prediction_noise = prediction_noise
+        self.predicted = predicted
+        self.reset()
+
+    def reset(self):
+        """Forget the state; the next sample starts the filter again."""
+        self.time = None
+        self.state = None  # 2x2: [position, rate] rows, [az, el] columns (az unwrapped)
+        self.covariance = None  # (p11, p12, p22), shared by both axes
+        self.steady = None  # (h, r, covariance, gains) of the current sample rate
+
+    def settings(self):
+        """Parameters as a dict, e.g. for a recording header."""
+        return {"type": "kalman", "accel_noise": self.accel_noise,
+                "measurement_noise": self.measurement_noise,
+                "prediction_noise": self.prediction_noise if self.predicted is not None else None}
+
+    def _measurements(self, t, az, el):
+        """Unwrapped azimuth and elevation to update with, and their variance per sample."""
+        reference = self.state[0, 0] if self.state is not None else az[0]
+        az = reference + np.cumsum(_wrap(np.diff(az, prepend=reference)))
+        variance = np.full(t.size, self.measurement_noise ** 2)
+        if self.predicted is not None:
+            pred_az, pred_el = self.predicted.at(t)
+            known = np.isfinite(pred_az) & np.isfinite(pred_el)
+            if np.any(known):
+                # Two independent measurements of the same position combine into
+                # their inverse-variance weighted mean
+                r, rp = self.measurement_noise ** 2, self.prediction_noise ** 2
+                w = r / (r + rp)
+                az, el = az.copy(), el.copy()
+                az[known] += w * _wrap(pred_az[known] - az[known])
+                el[known] += w * (pred_el[known] - el[known])
+                variance[known] = r * rp / (r + rp)
+        return az, el, variance
+
+    def _gains(self, dt, variance):
+        """Kalman gains (n, 2) for the given sample spacings and measurement variances.
+
+        Samples at the steady sample rate (spacing within STEADY_TOLERANCE of
+        it, same measurement variance) get the steady-state gains once the
+        covariance has converged; the recursion is only stepped in Python
+        for the samples before that and for irregular ones (gaps, bursts,
+        the predicted track starting or ending).
+        """
+        q = self.accel_noise ** 2
+        h = float(np.median(dt))
+        r = float(np.median(variance))
+        steady = self.steady
+        if h > 0 and not (steady is not None and abs(h - steady[0]) <= STEADY_TOLERANCE * steady[0]
+                          and r == steady[1]):
+            steady = self.steady = (h, r, *steady_state(h, r, q))
+        gains = np.empty((dt.size, 2))
+        if steady is None:
+            regular = np.zeros(dt.size, dtype=bool)
+        else:
+            regular = (np.abs(dt - steady[0]) <= STEADY_TOLERANCE * steady[0]) & (variance == steady[1])
+        irregular = np.flatnonzero(~regular).tolist() + [dt.size]
+        regular = regular.tolist()
+        covariance = self.covariance
+        converged = steady is not None and _close(covariance, steady[2])
+        k = 0
+        dt_list, variance_list = dt.tolist(), variance.tolist()
+        while k < dt.size:
+            if converged and regular[k]:
+                # Constant gains up to the next irregular sample
+                end = irregular[bisect.bisect_right(irregular, k)]
+                gains[k:end] = steady[3]
+                covariance = steady[2]
+                k = end
+                continue
+            covariance, gains[k] = _kalman_step(covariance, dt_list[k], variance_list[k], q)
+            converged = steady is not None and regular[k] and _close(covariance, steady[2])
+            k += 1
+        self.covariance = covariance
+        return gains
+
+    def process(self, t, az, el):
+        """Filter a batch of samples (arrays in time order); returns (t, az, el)."""
+        t = np.asarray(t, dtype=np.float64)
+        if t.size == 0:
+            return t, np.empty(0), np.empty(0)
+        az = np.asarray(az, dtype=np.float64)
+        el = np.asarray(el, dtype=np.float64)
+        z_az, z_el, variance = self._measurements(t, az, el)
+        z = np.stack([z_az, z_el], axis=1)
+
+        if self.state is None:
+            # The first sample sets the position; the rate starts unknown
+            self.state = np.array([z[0], [0.0, 0.0]])
+            self.covariance = (variance[0], 0.0, INITIAL_RATE ** 2)
+            self.time = t[0]
+        dt = np.maximum(np.diff(t, prepend=self.time), 0.0)
+        gains = self._gains(dt, variance)
+
+        # x[k] = (I - K H) F x[k-1] + K z[k], one affine map per sample
+        k1, k2 = gains[:, 0], gains[:, 1]
+        a = np.empty((t.size, 2, 2))
+        a[:, 0, 0] = 1 - k1
+        a[:, 0, 1] = (1 - k1) * dt
+        a[:, 1, 0] = -k2
+        a[:, 1, 1] = 1 - k2 * dt
+        b = gains[:, :, None] * z[:, None, :]
+        # The carried-in state enters through the first map
+        b[0] += a[0] @ self.state
+        states = _affine_scan(a, b)
+
+        self.state = states[-1]
+        self.time = t[-1]
+        return t, states[:, 0, 0] % 360.0, np.clip(states[:, 0, 1], 0.0, 90.0)
+
+
+def filter_session(t, az, el, predicted=None, **kwargs):
+    """Batch-filter a recorded session with a fresh KalmanFilter; returns (az, el)."""
+    _, az, el = KalmanFilter(predicted=predicted, **kwargs).process(t, az, el)
+    return az, el
+
+
+class DisplayDecimator:
+    """Lets a position through only when it moved more than `threshold` degrees."""
+
+    def __init__(self, threshold=DISPLAY_THRESHOLD):
+        self.threshold = threshold
+        self.last = None
+        self.shown = 0
+        self.skipped = 0
+
+    def reset(self):
+        self.last = None
+
+    def changed(self, az, el):
+        """True (and remember the position) if (az, el) should be drawn."""
+        if self.last is not None and angular_separation(az, el, *self.last) <= self.threshold:
+            self.skipped += 1
+            return False
+        self.last = (az, el)
+        self.shown += 1
+        return True
@@ -0,0 +1,122 @@
+# trackscheduler.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Predictive rotator tracking from a precomputed pass table
+#
+# The az/el of the selected pass is computed once, on a dense time grid,
+# when tracking starts. Each tick then only interpolates that table at a
+# point in the future - the measured command latency plus the time the
+# rotator needs to slew there - and a command is emitted only when that
+# lead target has moved more than the deadband from the last one sent.
+
+import numpy as np
+
+from passpredict import SECONDS_PER_DAY, UNIX_EPOCH_JD, datetime_to_jd
+
+# Configuration
+TABLE_STEP = 1.0  # Seconds between pass table entries
+SLEW_RATE = 6.0  # Rotator slew rate in degrees per second (per axis)
+DEADBAND = 1.0  # Degrees the target must move before a new command is sent
+MAX_LEAD = 10.0  # Upper bound on the look-ahead in seconds
+
+
+def _fit_azimuth(az, min_az, max_az):
+    """Unwrap an azimuth path and shift it by whole turns into [min_az, max_az].
+
+    Returns the shifted path, or None if the path cannot fit the limits
+    without crossing them.
+    """
+    unwrapped = np.degrees(np.unwrap(np.radians(az)))
+    low, high = unwrapped.min(), unwrapped.max()
+    if high - low > max_az - min_az:
+        return None
+    # Smallest whole-turn shift that lifts the path above min_az
+    shift = 360.0 * np.ceil((min_az - low) / 360.0)
+    if high + shift > max_az:
+        return None
+    return unwrapped + shift
+
+
+def plan_path(az, el, min_az=0, max_az=360, min_el=0, max_el=180):
+    """Choose the rotator path for a pass: (az, el, flipped).
+
+    The normal path points straight at the satellite. When the rotator can
+    reach past zenith (max_el >= 180) the flipped path - azimuth + 180,
+    elevation 180 - el - is also considered. The path that stays inside the
+    azimuth limits with the least azimuth travel wins, the normal one on a
+    tie, so a pass crossing the azimuth end stop (or swinging through it
+    overhead) is tracked flipped instead of unwinding mid-pass.
+    """
+    candidates = []
+    normal = _fit_azimuth(az, min_az, max_az)
+    if normal is not None:
+        candidates.append((normal, el, False))
+    if max_el >= 180:
+        flipped = _fit_azimuth((az + 180.0) % 360.0, min_az, max_az)
+        if flipped is not None:
+            candidates.append((flipped, 180.0 - el, True))
+    if not candidates:
+        # Nothing fits: track normally and let the clipping below limit the travel
+        candidates.append((np.asarray(az, dtype=np.float64) % 360.0, el, False))
+    # Travel is rounded so float noise cannot flip a pass that fits either way
+    path_az, path_el, flipped = min(candidates, key=lambda c: (round(np.abs(np.diff(c[0])).sum(), 6), c[2]))
+    return (np.clip(path_az, min_az, max_az), np.clip(path_el, min_el, max_el), flipped)
+
+
+class TrackScheduler:
+    """Turns a pass table into sparse, lead-compensated rotator commands."""
+
+    def __init__(self, times, az, el, limits=(0, 360, 0, 180), slew_rate=SLEW_RATE, deadband=DEADBAND):
+        self.times = np.asarray(times, dtype=np.float64)
+        self.az, self.el, self.flipped = plan_path(np.asarray(az), np.asarray(el), *limits)
+        self.slew_rate = slew_rate
+        self.deadband = deadband
+        self.last_command = None
+        self.commands_sent = 0
+
+    @classmethod
+    def from_pass(cls, predictor, sat_pass, limits=(0, 360, 0, 180), step=TABLE_STEP, **kwargs):
+        """Build the table for one predicted pass."""
+        jd0 = datetime_to_jd(sat_pass.aos)
+        jd1 = datetime_to_jd(sat_pass.los)
+        n = max(int(np.ceil((jd1 - jd0) * SECONDS_PER_DAY / step)) + 1, 2)
+        jd = np.linspace(jd0, jd1, n)
+        az, el, _ = predictor.look_angles(np.full(n, sat_pass.index), jd)
+        times = (jd - UNIX_EPOCH_JD) * SECONDS_PER_DAY
+        return cls(times, az, np.maximum(el, 0.0), limits, **kwargs)
+
+    @property
+    def start_time(self):
+        return self.times[0]
+
+    @property
+    def end_time(self):
+        return self.times[-1]
+
+    def finished(self, now):
+        return now > self.end_time
+
+    def target_at(self, t):
+        """Rotator az/el at unix time t (held at the ends of the pass)."""
+        return float(np.interp(t, self.times, self.az)), float(np.interp(t, self.times, self.el))
+
+    def next_command(self, now, latency=0.0, position=None):
+        """The (az, el) to send now, or None if the rotator is close enough already.
+
+        The target is taken ahead of `now` by the command latency plus the
+        time needed to slew from the current position (or the last command)
+        to the target, iterated once since the slew time depends on the target.
+        """
+        reference = position if position is not None else self.last_command
+        lead = latency or 0.0
+        az, el = self.target_at(now + lead)
+        if reference is not None:
+            slew = max(abs(az - reference[0]), abs(el - reference[1])) / self.slew_rate
+            az, el = self.target_at(now + min(lead + slew, MAX_LEAD))
+        if self.last_command is not None:
+            last_az, last_el = self.last_command
+            if max(abs(az - last_az), abs(el - last_el)) < self.deadband:
+                return None
+        self.last_command = (az, el)
+        self.commands_sent += 1
+        return az, el
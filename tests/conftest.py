@@ -0,0 +1,82 @@
+# conftest.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# The apps are flat modules in App/, imported by name as the apps do. Also
+# provides a local HTTP stand-in for the TLE servers.
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "App")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from tlestore import TLEStore  # noqa: E402  (needs APP_DIR on the path)
+
+ETAG = '"catalog-1"'
+LAST_MODIFIED = "Wed, 10 Apr 2024 12:00:00 GMT"
+
+with open(os.path.join(DATA_DIR, "stations.tle")) as f:
+    TLE_TEXT = f.read()
+
+
+class CatalogHandler(BaseHTTPRequestHandler):
+    """Serves the server's `body` with validators, 304 when they match."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if server.delay:
+            time.sleep(server.delay)
+        if (self.headers.get("If-None-Match") == ETAG
+                or self.headers.get("If-Modified-Since") == LAST_MODIFIED):
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = server.body.encode()
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def tle_server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CatalogHandler)
+    httpd.daemon_threads = True
+    httpd.body = TLE_TEXT
+    httpd.delay = 0.0
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll condition() until it is true; False if it never became true within timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def make_store(tmp_path, server, fmt="tle"):
+    """TLEStore in tmp_path with a single source served by the stand-in."""
+    url = f"http://127.0.0.1:{server.server_address[1]}/catalog"
+    return TLEStore(str(tmp_path), sources={"local": {"url": url, "format": fmt}})
@@ -0,0 +1,166 @@
+# test_bleingest.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# SampleRing counters and drain order, with the simulated device as producer
+
+import time
+
+import numpy as np
+import pytest
+
+from bleingest import ReplayReader, SampleRing, SimulatedReader, decode_packet
+from conftest import wait_for
+from instruments import ThroughputMeter
+from recordfile import RecordingWriter
+
+
+@pytest.fixture
+def reader():
+    readers = []
+
+    def make(**kwargs):
+        reader = SimulatedReader(seed=1, **kwargs)
+        readers.append(reader)
+        return reader
+
+    yield make
+    for reader in readers:
+        reader.stop()
+
+
+def test_ring_drops_when_full_and_drains_in_order():
+    ring = SampleRing(capacity=4)
+    for i in range(6):
+        ring.push(float(i), 10.0 * i, float(i))
+    assert ring.counters() == {"received": 4, "dropped": 2, "late": 0, "pending": 4}
+    t, az, el = ring.drain(now=3.1)
+    assert t.tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert az.tolist() == [0.0, 10.0, 20.0, 30.0]
+    # Everything older than LATE_THRESHOLD when drained is late
+    assert ring.late == 3
+    # The slots wrap around once the consumer caught up
+    assert ring.push_many(np.arange(4.0, 10.0), np.zeros(6), np.zeros(6)) == 4
+    assert ring.drain(now=7.0)[0].tolist() == [4.0, 5.0, 6.0, 7.0]
+    assert len(ring) == 0
+    assert ring.drain()[0].size == 0
+
+
+def test_simulated_reader_overfills_small_ring(reader):
+    ring = SampleRing(capacity=8)
+    device = reader(rate=500.0, ring=ring)
+    device.start()
+    assert wait_for(lambda: ring.dropped > 0)
+    device.stop()
+    assert ring.received == 8
+    t, az, el = ring.drain(now=time.time() + 10.0)
+    # The first samples are kept, in the order they were produced
+    assert t.size == 8
+    assert np.all(np.diff(t) >= 0)
+    assert np.all((az >= 0) & (az < 360)) and np.all((el >= 0) & (el <= 90))
+    assert ring.late == 8
+    counters = ring.counters()
+    assert counters["pending"] == 0
+    assert counters["received"] + counters["dropped"] >= 9
+
+
+def test_reader_thread_start_and_stop(reader):
+    device = reader(rate=50.0)
+    assert device.status == "Disconnected"
+    device.start()
+    thread = device._thread
+    device.start()
+    assert device._thread is thread
+    assert wait_for(lambda: device.status == "Connected (simulated)")
+    assert wait_for(lambda: len(device.ring) >= 3)
+    device.stop()
+    assert not thread.is_alive()
+    assert device._thread is None
+    assert device.status == "Disconnected"
+    # Nothing is produced once the thread has stopped
+    received = device.ring.received
+    time.sleep(0.1)
+    assert device.ring.received == received
+    assert not device.send_command("RESET")
+
+
+def test_decode_packet():
+    assert decode_packet(b"123.5,45.25\r\n") == (123.5, 45.25)
+    with pytest.raises(ValueError):
+        decode_packet(b"garbage")
+
+
+def test_stop_right_after_start(reader):
+    device = reader(rate=50.0)
+    device.start()
+    thread = device._thread
+    device.stop()
+    assert not thread.is_alive()
+    # A second stop is harmless
+    device.stop()
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """A 3000-sample session at 20 Hz, as the tracker records it."""
+    path = str(tmp_path / "session.ezt")
+    t = 1712664000.0 + np.arange(3000) * 0.05
+    az = (np.arange(3000) * 0.1) % 360.0
+    el = np.linspace(0.0, 80.0, 3000)
+    writer = RecordingWriter(path, {"satellite": "NOAA 19"})
+    writer.append(t, az, el)
+    writer.close()
+    return path, t, az.astype(np.float32), el.astype(np.float32)
+
+
+def replay(device, timeout=10.0):
+    """Drain a replay as the GUI does until it finished; returns the samples and the meter."""
+    meter = ThroughputMeter()
+    drained = []
+    device.start()
+    deadline = time.monotonic() + timeout
+    while not device.finished and time.monotonic() < deadline:
+        t, az, el = device.ring.drain()
+        meter.frame(t.size)
+        drained.append((t, az, el))
+        time.sleep(0.002)
+    drained.append(device.ring.drain())
+    device.stop()
+    return [np.concatenate(column) for column in zip(*drained)], meter
+
+
+def test_max_speed_replay_keeps_every_sample(recording):
+    path, t, az, el = recording
+    device = ReplayReader(path, speed=None, ring=SampleRing(capacity=256), original_times=True)
+    assert device.metadata["satellite"] == "NOAA 19"
+    (t_out, az_out, el_out), meter = replay(device)
+    assert device.finished and device.replayed == len(device) == 3000
+    # A full ring makes the replay wait instead of dropping
+    assert device.ring.dropped == 0
+    assert np.array_equal(t_out, t)
+    assert np.array_equal(az_out, az) and np.array_equal(el_out, el)
+    summary = meter.summary()
+    assert 0 < summary["samples"] <= 3000 and summary["samples_per_second"] > 0
+
+
+def test_timed_replay_compresses_the_recorded_spacing(recording):
+    path, t, az, _ = recording
+    speed = 100.0  # 150 s of samples in 1.5 s
+    device = ReplayReader(path, speed=speed)
+    started = time.time()
+    (t_out, az_out, _), _ = replay(device)
+    assert device.finished
+    assert np.array_equal(az_out, az)
+    assert np.allclose(np.diff(t_out), np.diff(t) / speed, rtol=0, atol=1e-6)
+    # Stamped with the replay time, starting when the replay did
+    assert abs(t_out[0] - started) < 0.5
+    assert device.status == "Disconnected"
+
+
+def test_max_speed_replay_stamps_replay_time(recording):
+    path, t, _, _ = recording
+    device = ReplayReader(path, speed=None)
+    started = time.time()
+    (t_out, _, _), _ = replay(device)
+    assert t_out.size == 3000
+    assert np.all(np.diff(t_out) >= 0)
+    assert t_out[0] >= started - 0.01 and t_out[-1] <= time.time()
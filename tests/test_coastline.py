@@ -0,0 +1,57 @@
+# test_coastline.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Bundled coastline file and the reduction of country polygons to coastline
+
+import numpy as np
+
+from coastline import coastline_only, load_coastline, split_dateline, write_coastline
+
+
+def square(lon, lat, size=10.0):
+    return np.array([(lon, lat), (lon + size, lat), (lon + size, lat + size), (lon, lat + size), (lon, lat)])
+
+
+def test_bundled_coastline_loads():
+    coastline = load_coastline()
+    assert coastline is not None
+    lon, lat = coastline
+    finite = np.isfinite(lon)
+    assert finite.sum() > 1000
+    assert np.all(np.abs(lon[finite]) <= 180) and np.all(np.abs(lat[finite]) <= 90)
+
+
+def test_shared_border_is_dropped():
+    # Two countries sharing the edge lon=10 between lat 0 and 10
+    lines = coastline_only([square(0, 0), square(10, 0)])
+    edges = {tuple(map(tuple, line[i:i + 2])) for line in lines for i in range(len(line) - 1)}
+    assert ((10.0, 0.0), (10.0, 10.0)) not in edges
+    assert ((10.0, 10.0), (10.0, 0.0)) not in edges
+    assert sum(len(line) - 1 for line in lines) == 6
+
+
+def test_island_is_kept_whole():
+    island = square(50, 50)
+    lines = coastline_only([square(0, 0), island])
+    assert any(np.array_equal(line, island) for line in lines)
+
+
+def test_antimeridian_cut_is_dropped():
+    # A polygon cut at 180 degrees keeps only its coast
+    lines = coastline_only([square(170, 60)])
+    assert all(not np.any((line[:-1, 0] == 180) & (line[1:, 0] == 180)) for line in lines)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "coast.ezc")
+    write_coastline([square(-20, -20, 40)], path)
+    lon, lat = load_coastline(path)
+    assert np.allclose(lon, [-20, 20, 20, -20, -20], atol=0.01)
+    assert np.allclose(lat, [-20, -20, 20, 20, -20], atol=0.01)
+
+
+def test_split_dateline_breaks_line():
+    lon, lat = split_dateline([170, -170], [0, 10])
+    assert np.isnan(lon[2])
+    assert lon[1] == 180 and lon[3] == -180
+    assert lat[1] == lat[3] == 5
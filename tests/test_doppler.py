@@ -0,0 +1,91 @@
+# test_doppler.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Range rate against the slant range, and the tuner driving the rigctld stand-in
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from conftest import DATA_DIR, wait_for
+from doppler import DOWNLINKS, DopplerTuner, RigctlClient, RigStandIn, doppler_shift, slant_range
+from ephemeris import PassEphemeris
+from passpredict import PassPredictor, parse_tle_text
+
+START = datetime(2024, 4, 9, 12, 0, tzinfo=timezone.utc)  # Epoch of the fixed TLEs
+LONDON = (51.5, -0.1, 30.0)
+DOWNLINK = DOWNLINKS["NOAA 19"][0][1]
+
+
+@pytest.fixture(scope="module")
+def table():
+    with open(os.path.join(DATA_DIR, "stations.tle")) as f:
+        tles = [tle for tle in parse_tle_text(f.read()) if tle[0] == "NOAA 19"]
+    predictor = PassPredictor(tles, *LONDON, min_elevation=10.0)
+    # The highest pass, with the widest swing of range rate
+    sat_pass = max(predictor.find_passes(START, days=1), key=lambda p: p.max_elevation)
+    return PassEphemeris(predictor, sat_pass)
+
+
+@pytest.fixture
+def rig():
+    server = RigStandIn(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_range_rate_is_derivative_of_range(table):
+    t = np.linspace(table.start + 1.0, table.end - 1.0, 200)
+    distance, range_rate = slant_range(table, t)
+    h = 0.5
+    difference = (slant_range(table, t + h)[0] - slant_range(table, t - h)[0]) / (2 * h)
+    assert np.allclose(range_rate, difference, atol=1e-3)
+    # Approaching before TCA, receding after, and LEO speeds
+    assert range_rate[0] < -3.0 and range_rate[-1] > 3.0
+    assert np.all(np.diff(range_rate) > 0)
+    assert np.argmin(distance) in (np.argmin(np.abs(range_rate)), np.argmin(np.abs(range_rate)) + 1)
+
+
+def test_doppler_shift():
+    assert doppler_shift(DOWNLINK, 0.0) == DOWNLINK
+    # About 3 kHz up at 137 MHz when approaching at 7 km/s
+    assert doppler_shift(DOWNLINK, -7.0) == pytest.approx(DOWNLINK + 3201.2, abs=0.1)
+    assert doppler_shift(DOWNLINK, 7.0) < DOWNLINK
+
+
+@pytest.fixture
+def live_table(table):
+    """The pass moved in time so that it is 60 s past AOS now, still approaching."""
+    offset = time.time() - table.start - 60.0
+    table.start += offset
+    table.end += offset
+    yield table
+    table.start -= offset
+    table.end -= offset
+
+
+def test_tuner_sends_corrected_frequency(live_table, rig):
+    tuner = DopplerTuner(RigctlClient(port=rig.server_address[1]), rate=20.0)
+    tuner.set_target(live_table, DOWNLINKS["NOAA 19"])
+    tuner.start()
+    try:
+        assert wait_for(lambda: rig.updates >= 3)
+        assert tuner.rig.status == "Connected"
+        now = time.time()
+        frequency = rig.frequency
+        sample = tuner.latest
+    finally:
+        tuner.close()
+    # The radio follows the corrected downlink, not the nominal one
+    expected = doppler_shift(DOWNLINK, slant_range(live_table, now)[1])
+    assert frequency > DOWNLINK + 1000
+    assert abs(frequency - expected) < 100  # Under a second of Doppler drift
+    assert sample.frequencies[0][0] == "APT"
+    assert sample.frequencies[0][1] == pytest.approx(doppler_shift(DOWNLINK, sample.range_rate))
+    assert tuner.sent == rig.updates
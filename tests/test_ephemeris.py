@@ -0,0 +1,59 @@
+# test_ephemeris.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Per-pass ephemeris tables stay within their analytic error bound of direct SGP4
+
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from conftest import DATA_DIR
+from ephemeris import PassEphemeris
+from passpredict import PassPredictor, parse_tle_text
+
+START = datetime(2024, 4, 9, 12, 0, tzinfo=timezone.utc)  # Epoch of the fixed TLEs
+OBSERVERS = [
+    (51.5, -0.1, 30.0),  # London
+    (-33.9, 151.2, 50.0),  # Sydney
+    (69.6, 18.9, 10.0),  # Tromsø, many polar passes
+]
+
+
+@pytest.fixture(scope="module")
+def tles():
+    with open(os.path.join(DATA_DIR, "stations.tle")) as f:
+        return parse_tle_text(f.read())
+
+
+@pytest.fixture(scope="module", params=OBSERVERS, ids=["london", "sydney", "tromso"])
+def tables(request, tles):
+    predictor = PassPredictor(tles, *request.param, min_elevation=10.0)
+    passes = predictor.find_passes(START, days=2)
+    assert passes
+    return [PassEphemeris(predictor, sat_pass) for sat_pass in passes]
+
+
+def test_verify_within_error_bound(tables):
+    over = []
+    for table in tables:
+        assert table.valid
+        bound_km, bound_deg = table.error_bound()
+        error_km, error_deg = table.verify()
+        if error_km > bound_km or error_deg > bound_deg:
+            over.append(f"{table.name} at {table.start:.0f}: {error_km * 1000:.3f} m {error_deg:.2e}° "
+                        f"over {bound_km * 1000:.3f} m {bound_deg:.2e}°")
+    assert not over, "\n".join(over)
+
+
+def test_direction_matches_vectorized_lookup(tables):
+    for table in tables:
+        t = np.linspace(table.start, table.end, 25)
+        azimuth, elevation = table.at(t)
+        scalar = np.array([table.direction(value) for value in t.tolist()])
+        assert np.allclose(scalar[:, 1], elevation, atol=1e-9)
+        # Azimuth wraps at north
+        assert np.allclose((scalar[:, 0] - azimuth + 180.0) % 360.0 - 180.0, 0.0, atol=1e-9)
+        assert table.direction(table.start - 1.0) is None
+        assert table.direction(table.end + 1.0) is None
@@ -0,0 +1,86 @@
+# test_eztrak_plan.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Multi-observer planner: the pass matrix against PassPredictor and the schedule's ordering
+
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from sgp4.api import Satrec
+
+from conftest import DATA_DIR
+from eztrak_plan import MATRIX_FIELDS, elements_to_satrecs, pass_matrix, schedule, tle_elements
+from passpredict import PassPredictor, ecef_positions, parse_tle_text
+
+START = datetime(2024, 4, 9, 12, 0, tzinfo=timezone.utc)  # Epoch of the fixed TLEs
+OBSERVERS = [("london", 51.5, -0.1, 30.0), ("tromso", 69.6, 18.9, 10.0)]
+
+
+@pytest.fixture(scope="module")
+def tles():
+    with open(os.path.join(DATA_DIR, "stations.tle")) as f:
+        return parse_tle_text(f.read())
+
+
+def row(observer, satellite, aos, los, max_elevation):
+    """A pass matrix row; TCA and azimuths do not matter to the schedule."""
+    return [observer, satellite, aos, (aos + los) / 2, los, max_elevation, 0.0, 0.0]
+
+
+def test_schedule_prefers_higher_passes():
+    matrix = np.array([
+        row(0, 0, 0, 600, 30.0),
+        row(0, 1, 300, 900, 70.0),  # Overlaps both neighbours and beats them
+        row(0, 2, 800, 1400, 50.0),
+        row(0, 0, 930, 1300, 20.0),  # Clear of the best pass, but not by the slew gap
+        row(0, 1, 2100, 2600, 10.0),
+    ])
+    # Kept in time order, only the best of each overlapping group
+    assert schedule(matrix, gap=60)[:, 2].tolist() == [300, 2100]
+    assert schedule(matrix, gap=0)[:, 2].tolist() == [300, 930, 2100]
+
+
+def test_schedule_is_per_observer():
+    matrix = np.array([
+        row(1, 0, 0, 600, 40.0),
+        row(0, 0, 0, 600, 20.0),
+        row(0, 1, 100, 700, 60.0),
+        row(1, 1, 100, 700, 30.0),
+    ])
+    chosen = schedule(matrix)
+    # Sorted by observer, then AOS; overlaps only conflict at the same site
+    assert chosen[:, :2].tolist() == [[0, 1], [1, 0]]
+    assert schedule(np.empty((0, len(MATRIX_FIELDS)))).shape == (0, len(MATRIX_FIELDS))
+
+
+def test_schedule_keeps_first_of_equal_passes():
+    matrix = np.array([row(0, 0, 0, 600, 45.0), row(0, 1, 200, 800, 45.0)])
+    assert schedule(matrix)[:, 1].tolist() == [0]
+
+
+def test_rebuilt_satrecs_propagate_identically(tles):
+    satrecs = elements_to_satrecs(tle_elements(tles))
+    t = START.timestamp() + np.arange(0, 86400, 600.0)
+    for (_, line1, line2), satrec in zip(tles, satrecs):
+        original = Satrec.twoline2rv(line1, line2)
+        assert np.allclose(ecef_positions(satrec, t)[0], ecef_positions(original, t)[0], atol=1e-6)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pass_matrix_matches_predictor(tles, workers):
+    matrix = pass_matrix(tles, OBSERVERS, start=START.timestamp(), days=1, min_elevation=10.0,
+                         workers=workers, per_job=2)
+    assert matrix.shape[1] == len(MATRIX_FIELDS)
+    for o, (_, lat, lon, alt) in enumerate(OBSERVERS):
+        expected = PassPredictor(tles, lat, lon, alt, min_elevation=10.0).find_passes(START, days=1)
+        rows = matrix[matrix[:, 0] == o]
+        assert len(rows) == len(expected)
+        # Sorted by AOS within each observer
+        assert np.all(np.diff(rows[:, 2]) >= 0)
+        for r, p in zip(rows, sorted(expected, key=lambda p: p.aos)):
+            assert r[1] == p.index
+            assert r[2] == pytest.approx(p.aos.timestamp(), abs=1e-3)
+            assert r[4] == pytest.approx(p.los.timestamp(), abs=1e-3)
+            assert r[5] == pytest.approx(p.max_elevation, abs=1e-6)
@@ -0,0 +1,93 @@
+# test_eztrakd.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Tracking daemon: manual stop versus auto-track, and the TLE refresh schedule
+
+from datetime import datetime, timezone
+
+import pytest
+
+import eztrakd
+from conftest import make_store
+from eztrakd import TrackingDaemon
+from passcache import PassCache
+
+START = datetime(2024, 4, 9, 12, 0, tzinfo=timezone.utc).timestamp()  # Epoch of the fixed TLEs
+SATELLITES = ["ISS (ZARYA)", "NOAA 19", "METOP-C"]
+
+
+@pytest.fixture
+def daemon(tmp_path, tle_server):
+    store = make_store(tmp_path / "tle", tle_server)
+    store.refresh()
+    # The rotator client is never started: set_position() only queues the target
+    tracker = TrackingDaemon((51.5, -0.1, 30.0), SATELLITES, 10.0, simulate=True,
+                             rotator=("127.0.0.1", 4533), auto_track=True, tle_store=store,
+                             pass_cache=PassCache(str(tmp_path / "passes")))
+    tracker.refresh_passes(START)
+    assert len(tracker.passes) >= 2
+    yield tracker
+    tracker.close()
+
+
+def test_auto_track_starts_before_aos(daemon):
+    first = daemon.passes[0]
+    daemon.step(first.aos.timestamp() - eztrakd.TRACK_LEAD - 5)
+    assert daemon.tracked_pass is None
+    daemon.step(first.aos.timestamp() - 5)
+    assert daemon.tracked_pass == first
+
+
+def test_manual_stop_holds_auto_track(daemon):
+    first, second = daemon.passes[:2]
+    daemon.step(first.aos.timestamp() - 5)
+    assert daemon.tracked_pass == first
+
+    daemon.stop_tracking()
+    assert not daemon.tracking()["auto_track"]
+    daemon.step(first.aos.timestamp() - 4)
+    assert daemon.tracked_pass is None
+    # Nor does auto-track pick up the following pass
+    daemon.step(first.los.timestamp() + 1)
+    daemon.step(second.aos.timestamp() - 5)
+    assert daemon.tracked_pass is None
+
+    # An explicit start resumes tracking and re-arms auto-track
+    assert daemon.start_tracking(0) == daemon.passes[0]
+    assert daemon.tracking()["auto_track"]
+
+
+def test_tle_refresh_follows_store_age(daemon, tle_server):
+    # Just downloaded: nothing is due until MAX_AGE runs out
+    wait = daemon.refresh_tles()
+    assert daemon.tle_results == {"local": "fresh"}
+    assert daemon.tle_store.max_age - 5 < wait <= daemon.tle_store.max_age
+    assert len(tle_server.requests) == 1
+
+    # Once stale the source is revalidated (304) and the next check is MAX_AGE away
+    daemon.tle_store.max_age = 0.5
+    daemon.tle_store._save_metadata("local", {**daemon.tle_store.metadata("local"), "fetched_at": 0})
+    wait = daemon.refresh_tles()
+    assert daemon.tle_results == {"local": "not-modified"}
+    assert 0 < wait <= 1.0
+    assert len(tle_server.requests) == 2
+
+
+def test_tle_update_repredicts_passes(daemon):
+    predictor = daemon.predictor
+    daemon.step(START + 1)
+    assert daemon.predictor is predictor  # Pass list still young
+    daemon.tle_store._save_metadata("local", {})  # Forget the validators: full download
+    daemon.refresh_tles()
+    assert daemon.tle_results == {"local": "updated"}
+    daemon.step(START + 2)
+    assert daemon.predictor is not predictor
+    assert daemon.passes
+
+
+def test_tle_refresh_error_retries_later(daemon, tle_server):
+    tle_server.shutdown()
+    tle_server.server_close()
+    daemon.tle_store._save_metadata("local", {})
+    assert daemon.refresh_tles() == eztrakd.TLE_RETRY
+    assert daemon.tle_results["local"].startswith("error")
@@ -0,0 +1,101 @@
+# test_instruments.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Timing histograms: binning, percentiles against exact values, the JSON dump and throughput
+
+import json
+
+import numpy as np
+import pytest
+
+import instruments
+from instruments import BLE_TO_SCREEN, FRAME, Histogram, Instruments, ThroughputMeter
+
+
+@pytest.fixture
+def durations():
+    # Frame-time-like spread: around 5 ms with a long tail
+    return np.random.default_rng(0).lognormal(np.log(0.005), 0.8, 20000)
+
+
+def test_percentiles_within_bin_accuracy(durations):
+    histogram = Histogram()
+    for seconds in durations.tolist():
+        histogram.record(seconds)
+    assert histogram.count == durations.size
+    assert histogram.total == pytest.approx(durations.sum())
+    assert histogram.max == durations.max()
+    # The geometric middle of a bin is within half a bin of anything in it
+    half_bin = 0.5 / instruments.BINS_PER_DECADE
+    for q in (10, 50, 90, 99):
+        assert abs(np.log10(histogram.percentile(q) / np.percentile(durations, q))) <= half_bin
+    assert histogram.percentile(100) <= histogram.max
+
+
+def test_record_many_matches_record(durations):
+    one, many = Histogram(), Histogram()
+    # Also under- and overflow
+    values = np.concatenate([durations, [0.0, 1e-7, 250.0]])
+    for seconds in values.tolist():
+        one.record(seconds)
+    many.record_many(values[:5000])
+    many.record_many(values[5000:])
+    many.record_many([])
+    assert many.counts == one.counts
+    assert many.count == one.count and many.max == one.max
+    assert many.total == pytest.approx(one.total)
+    assert one.counts[0] == 2 and one.counts[-1] == 1
+
+
+def test_empty_histogram():
+    histogram = Histogram()
+    assert histogram.percentile(50) is None
+    assert histogram.summary() == {"count": 0}
+
+
+def test_summary_in_milliseconds():
+    histogram = Histogram()
+    histogram.record_many([0.002] * 99 + [0.5])
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["mean_ms"] == pytest.approx((0.002 * 99 + 0.5) * 10)
+    assert summary["max_ms"] == 500.0
+    assert summary["p50_ms"] == pytest.approx(2.0, rel=0.15)
+    assert summary["p99_ms"] == pytest.approx(2.0, rel=0.15)
+    assert histogram.percentile(99.5) == pytest.approx(0.5, rel=0.15)
+
+
+def test_dump_aggregates_every_histogram(tmp_path, monkeypatch):
+    monkeypatch.setattr(instruments, "STATS_DIR", str(tmp_path))
+    stats = Instruments("eztrack")
+    assert stats.overlay_text() == "p50/p99 ms: no data yet"
+    stats.record(FRAME, 0.010)
+    stats.record_many(BLE_TO_SCREEN, [0.020, 0.030, 0.040])
+    stats.throughput = ThroughputMeter()
+    assert stats.overlay_text().startswith("p50/p99 ms: BLE>screen ")
+    assert "frame 10." in stats.overlay_text()
+
+    path = stats.dump()
+    assert path.startswith(str(tmp_path)) and path.endswith(".json")
+    with open(path) as f:
+        data = json.load(f)
+    assert data["app"] == "eztrack"
+    assert set(data["histograms"]) == set(instruments.LABELS)
+    ble = data["histograms"][BLE_TO_SCREEN]
+    assert ble["count"] == 3 and sum(ble["counts"]) == 3
+    assert len(ble["bin_upper_edges_s"]) == len(ble["counts"]) - 1
+    assert data["histograms"][instruments.PREDICTION] == {
+        "count": 0, "bin_upper_edges_s": Histogram().edges()[:-1], "counts": [0] * len(ble["counts"])}
+    assert data["throughput"]["frames"] == 0
+
+
+def test_throughput_counts_from_first_samples():
+    meter = ThroughputMeter()
+    meter.frame(0, now=0.0)  # Nothing yet: the clock has not started
+    meter.frame(50, now=1.0)  # First samples start it
+    for k in range(1, 11):
+        meter.frame(100, now=1.0 + k * 0.5)
+    assert meter.rates() == (pytest.approx(200.0), pytest.approx(2.0))
+    assert meter.summary() == {"samples": 1000, "frames": 10, "seconds": 5.0,
+                               "samples_per_second": 200.0, "frames_per_second": 2.0}
+    assert meter.line() == "200 samples/s, 2.0 fps"
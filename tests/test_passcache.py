@@ -0,0 +1,51 @@
+# test_passcache.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# PassCache: clear() is per process, the disk layer is shared and pruned by age
+
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import DATA_DIR
+from passcache import MAX_FILE_AGE, PassCache
+from passpredict import PassPredictor, parse_tle_text
+
+NOW = datetime(2024, 4, 9, 12, 0, tzinfo=timezone.utc).timestamp()  # Epoch of the fixed TLEs
+
+
+@pytest.fixture
+def predictor():
+    with open(os.path.join(DATA_DIR, "stations.tle")) as f:
+        return PassPredictor(parse_tle_text(f.read()), 51.5, -0.1, 30.0, 10.0)
+
+
+def cache_files(path):
+    return sorted(name for name in os.listdir(path) if name.endswith(".npz"))
+
+
+def test_clear_keeps_files_for_other_apps(tmp_path, predictor):
+    cache = PassCache(str(tmp_path))
+    passes = cache.find_passes(predictor, 1, now=NOW)
+    assert passes and cache.misses == 3
+    files = cache_files(tmp_path)
+    assert len(files) == 3
+
+    cache.clear()
+    assert cache_files(tmp_path) == files
+    # Another app sharing the directory is served from disk
+    other = PassCache(str(tmp_path))
+    assert other.find_passes(predictor, 1, now=NOW) == passes
+    assert (other.hits, other.misses) == (3, 0)
+
+
+def test_prune_removes_old_files(tmp_path, predictor):
+    cache = PassCache(str(tmp_path))
+    cache.find_passes(predictor, 1, now=NOW)
+    old, *recent = cache_files(tmp_path)
+    stale = time.time() - MAX_FILE_AGE - 60
+    os.utime(os.path.join(tmp_path, old), (stale, stale))
+    PassCache(str(tmp_path))  # Opening a cache prunes it
+    assert cache_files(tmp_path) == recent
@@ -0,0 +1,132 @@
+# test_passpredict.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# find_passes against a dense brute-force elevation scan of the fixed TLEs
+
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+import passpredict
+from conftest import DATA_DIR
+from passpredict import PassPredictor, datetime_to_jd, parse_tle_text
+
+START = datetime(2024, 4, 9, 12, 0, tzinfo=timezone.utc)  # Epoch of the fixed TLEs
+DAYS = 1
+SCAN_STEP = 1.0  # Seconds between brute-force samples
+TOLERANCE = 1.5  # Seconds allowed between predicted and scanned AOS / LOS / TCA
+
+
+@pytest.fixture(scope="module")
+def tles():
+    with open(os.path.join(DATA_DIR, "stations.tle")) as f:
+        return parse_tle_text(f.read())
+
+
+def scan(predictor, start, days):
+    """Passes from sampling every satellite every SCAN_STEP seconds: (index, aos, tca, los, max_el)."""
+    t = np.arange(0.0, days * 86400.0 + SCAN_STEP, SCAN_STEP)
+    jd = datetime_to_jd(start) + t / 86400.0
+    passes = []
+    for index in range(len(predictor.satrecs)):
+        elevation = predictor.look_angles(np.full(jd.size, index), jd)[1]
+        above = np.concatenate(([0], elevation >= predictor.min_elevation, [0])).astype(np.int8)
+        edges = np.diff(above)
+        for rise, set_ in zip(np.nonzero(edges == 1)[0], np.nonzero(edges == -1)[0]):
+            peak = rise + int(np.argmax(elevation[rise:set_]))
+            passes.append((index, t[rise], t[peak], t[set_ - 1], elevation[peak]))
+    return sorted(passes, key=lambda p: p[1])
+
+
+def seconds(start, when):
+    return (when - start).total_seconds()
+
+
+def assert_matches_scan(predictor, start, days):
+    passes = predictor.find_passes(start, days=days)
+    expected = scan(predictor, start, days)
+    assert len(passes) == len(expected)
+    for sat_pass, (index, aos, tca, los, max_elevation) in zip(passes, expected):
+        assert sat_pass.index == index
+        assert abs(seconds(start, sat_pass.aos) - aos) <= TOLERANCE
+        assert abs(seconds(start, sat_pass.los) - los) <= TOLERANCE
+        assert abs(seconds(start, sat_pass.tca) - tca) <= TOLERANCE
+        assert sat_pass.max_elevation >= max_elevation - 1e-6
+        assert sat_pass.max_elevation >= predictor.min_elevation
+    return passes
+
+
+@pytest.mark.parametrize("location", [(51.5, -0.1, 30.0), (69.6, 18.9, 10.0)], ids=["london", "tromso"])
+@pytest.mark.parametrize("min_elevation", [0.0, 20.0])
+@pytest.mark.parametrize("keep_states", [False, True], ids=["screened", "kept"])
+def test_passes_match_brute_force(tles, location, min_elevation, keep_states):
+    predictor = PassPredictor(tles, *location, min_elevation=min_elevation, keep_states=keep_states)
+    passes = assert_matches_scan(predictor, START, DAYS)
+    assert passes
+
+
+def test_min_elevation_is_respected(tles):
+    low = PassPredictor(tles, 51.5, -0.1, 30.0, min_elevation=0.0).find_passes(START, days=DAYS)
+    high = PassPredictor(tles, 51.5, -0.1, 30.0, min_elevation=40.0).find_passes(START, days=DAYS)
+    assert len(high) < len(low)
+    assert all(p.max_elevation >= 40.0 for p in high)
+    # Raising the threshold only drops passes, the remaining peaks are unchanged
+    for sat_pass in high:
+        assert any(p.index == sat_pass.index and abs(seconds(p.tca, sat_pass.tca)) <= TOLERANCE
+                   for p in low)
+
+
+def test_satellite_that_never_rises(tles):
+    # The ISS (51.6° inclination) never reaches 10° over the South Pole
+    predictor = PassPredictor(tles, -89.0, 0.0, 2800.0, min_elevation=10.0)
+    passes = assert_matches_scan(predictor, START, DAYS)
+    assert passes
+    assert all(p.name != "ISS (ZARYA)" for p in passes)
+
+
+def test_pass_in_progress_at_start(tles):
+    predictor = PassPredictor(tles, 51.5, -0.1, 30.0, min_elevation=0.0)
+    first = predictor.find_passes(START, days=DAYS)[0]
+    start = first.aos + (first.tca - first.aos) / 2
+    passes = assert_matches_scan(predictor, start, DAYS)
+    assert passes[0].index == first.index
+    # Julian-date round trip, microseconds
+    assert abs(seconds(start, passes[0].aos)) < 1e-3
+    assert abs(seconds(first.los, passes[0].los)) <= TOLERANCE
+
+
+def assert_same_passes(passes, expected):
+    assert len(passes) == len(expected)
+    for sat_pass, other in zip(passes, expected):
+        assert sat_pass.index == other.index
+        for field in ("aos", "tca", "los"):
+            assert abs(seconds(getattr(other, field), getattr(sat_pass, field))) <= TOLERANCE
+        assert sat_pass.max_elevation == pytest.approx(other.max_elevation, abs=0.01)
+
+
+def test_kept_states_follow_location_and_min_elevation(tles):
+    predictor = PassPredictor(tles, 51.5, -0.1, 30.0, min_elevation=10.0, keep_states=True)
+    predictor.find_passes(START, days=DAYS)
+    states = predictor._states
+    for lat, lon, alt, min_elevation in [(48.1, 11.6, 520.0, 10.0), (48.1, 11.6, 520.0, 30.0),
+                                         (-33.9, 151.2, 50.0, 0.0)]:
+        predictor.set_location(lat, lon, alt)
+        predictor.min_elevation = min_elevation
+        passes = predictor.find_passes(START, days=DAYS)
+        assert passes
+        fresh = PassPredictor(tles, lat, lon, alt, min_elevation=min_elevation)
+        assert_same_passes(passes, fresh.find_passes(START, days=DAYS))
+    # Neither change propagated again
+    assert predictor._states is states
+
+
+def test_keep_states_ignored_for_large_sets(tles, monkeypatch):
+    monkeypatch.setattr(passpredict, "KEEP_STATES_MAX", 2)
+    assert not PassPredictor(tles, 51.5, -0.1, 30.0, keep_states=True).keep_states
+    assert PassPredictor(tles[:2], 51.5, -0.1, 30.0, keep_states=True).keep_states
+
+
+def test_no_satellites():
+    assert PassPredictor([], 51.5, -0.1, 30.0).find_passes(START) == []
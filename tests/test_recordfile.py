@@ -0,0 +1,73 @@
+# test_recordfile.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Recording files: write / close / read round trip and the periodic partial-block flush
+
+import numpy as np
+import pytest
+
+import recordfile
+from conftest import wait_for
+from recordfile import BLOCK_SAMPLES, Recording, RecordingWriter, read_header, read_recording
+
+METADATA = {"lat": 51.5, "lon": -0.1, "alt": 30.0, "satellite": "NOAA 19"}
+
+
+def samples(n, start=1712664000.0):
+    t = start + np.arange(n) * 0.05
+    return t, (np.arange(n) * 0.5) % 360.0, np.linspace(0.0, 80.0, n)
+
+
+def test_round_trip_with_partial_final_block(tmp_path):
+    path = str(tmp_path / "session.ezt")
+    n = 2 * BLOCK_SAMPLES + 100
+    t, az, el = samples(n)
+    writer = RecordingWriter(path, METADATA)
+    # Uneven batches, as the GUI drains them
+    for chunk in np.array_split(np.arange(n), 37):
+        writer.append(t[chunk], az[chunk], el[chunk])
+    writer.close()
+    assert writer.samples_written == n
+
+    metadata, columns = read_recording(path)
+    assert {key: metadata[key] for key in METADATA} == METADATA
+    assert metadata["columns"] == list(recordfile.COLUMNS)
+    assert metadata["block_samples"] == BLOCK_SAMPLES
+    recording = Recording(path)
+    assert len(recording) == n
+    assert recording.blocks["count"].tolist() == [BLOCK_SAMPLES, BLOCK_SAMPLES, 100]
+    assert np.array_equal(columns["time"], t)
+    assert np.allclose(columns["az"], az, atol=1e-4)
+    assert np.allclose(columns["el"], el, atol=1e-4)
+    assert np.all(np.isnan(columns["rssi"]))
+
+
+def test_empty_recording(tmp_path):
+    path = str(tmp_path / "empty.ezt")
+    RecordingWriter(path, METADATA).close()
+    recording = Recording(path)
+    assert len(recording) == 0
+    assert recording.column("time").size == 0
+
+
+def test_partial_block_reaches_disk_before_close(tmp_path, monkeypatch):
+    monkeypatch.setattr(recordfile, "FLUSH_INTERVAL", 0.05)
+    path = str(tmp_path / "live.ezt")
+    t, az, el = samples(BLOCK_SAMPLES + 30)
+    writer = RecordingWriter(path, METADATA)
+    writer.append(t[:20], az[:20], el[:20])
+    assert wait_for(lambda: len(Recording(path)) == 20)
+    assert writer.samples_written == 20
+    # The partial block is rewritten in place as it grows and fills
+    writer.append(t[20:], az[20:], el[20:])
+    assert wait_for(lambda: len(Recording(path)) == BLOCK_SAMPLES + 30)
+    assert Recording(path).blocks["count"].tolist() == [BLOCK_SAMPLES, 30]
+    writer.close()
+    assert np.array_equal(Recording(path).column("time"), t)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.ezt"
+    path.write_bytes(b"not a recording")
+    with pytest.raises(ValueError):
+        read_header(str(path))
@@ -0,0 +1,153 @@
+# test_rotctl.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# RotctlClient against the fake rotctld: pipelining, setpoint coalescing, reconnects
+
+import socket
+import time
+
+import pytest
+
+import rotctl
+from conftest import wait_for
+from fakerotctld import FakeRotctld
+from rotctl import RotctlClient
+
+
+@pytest.fixture
+def server():
+    server = FakeRotctld(port=0, rate=1000.0).start()
+    yield server
+    server.drop_clients()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client_for():
+    clients = []
+
+    def make(server, poll_interval=0.05):
+        client = RotctlClient("127.0.0.1", server.port, poll_interval=poll_interval)
+        clients.append(client)
+        client.start()
+        assert wait_for(lambda: client.connected)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def setpoints(server):
+    return [command for command in server.rotator.commands if command.startswith("P ")]
+
+
+def test_setpoint_pipelined_behind_poll(server, client_for):
+    server.serving.clear()
+    client = client_for(server, poll_interval=10.0)
+    # The first get_pos went out on connect and is held unanswered
+    client.set_position(123.0, 45.0)
+    assert wait_for(lambda: client.counters["sent"] == 2)
+    assert client.position is None
+    server.serving.set()
+    assert wait_for(lambda: client.position is not None)
+    assert server.rotator.commands[:2] == ["p", "P 123.00 45.00"]
+    assert wait_for(lambda: client.latency is not None)
+    assert client.counters["errors"] == 0
+
+
+def test_position_polled(server, client_for):
+    client = client_for(server)
+    client.set_position(10.0, 20.0)
+    assert wait_for(lambda: client.position is not None and client.position[:2] == (10.0, 20.0))
+
+
+def test_setpoints_coalesced(server, client_for):
+    server.delay = 0.05
+    client = client_for(server, poll_interval=10.0)
+    targets = [(float(az), 30.0) for az in range(0, 100, 5)]
+    for az, el in targets:
+        client.set_position(az, el)
+        time.sleep(0.005)
+    final = f"P {targets[-1][0]:.2f} {targets[-1][1]:.2f}"
+    assert wait_for(lambda: setpoints(server)[-1:] == [final])
+    sent = setpoints(server)
+    # Only MAX_SETPOINTS_IN_FLIGHT moves are outstanding; the rest were replaced, never queued
+    assert rotctl.MAX_SETPOINTS_IN_FLIGHT == 1
+    assert len(sent) < len(targets)
+    assert len(sent) + client.counters["coalesced"] == len(targets)
+
+
+def test_burst_larger_than_socket_buffer(server, client_for, monkeypatch):
+    create_connection = socket.create_connection
+
+    def small_buffer(*args, **kwargs):
+        sock = create_connection(*args, **kwargs)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        return sock
+
+    monkeypatch.setattr(rotctl.socket, "create_connection", small_buffer)
+    # rotctld stops reading, so the socket buffers fill and writes go out in pieces
+    server.serving.clear()
+    client = client_for(server, poll_interval=10.0)
+    burst = 100000
+    for _ in range(burst):
+        client.stop_rotator()
+    assert wait_for(lambda: client.counters["sent"] == burst + 1)
+    server.serving.set()
+    assert wait_for(lambda: len(server.rotator.commands) == burst + 1, timeout=30.0)
+    assert server.rotator.commands == ["p"] + ["S"] * burst
+    assert client.counters["errors"] == 0
+    assert client.connected
+
+
+def test_close_without_start_releases_wake_sockets():
+    client = RotctlClient("127.0.0.1", 1)
+    client.close()
+    assert client._wake_r.fileno() == -1 and client._wake_w.fileno() == -1
+    client.set_position(1.0, 2.0)  # Harmless once closed
+
+
+def test_urgent_command_drops_pending_setpoint(server, client_for):
+    server.serving.clear()
+    client = client_for(server, poll_interval=10.0)
+    client.set_position(10.0, 10.0)
+    assert wait_for(lambda: client.counters["sent"] == 2)
+    client.set_position(20.0, 20.0)  # Waits behind the first move
+    client.stop_rotator()
+    assert wait_for(lambda: client.counters["sent"] == 3)
+    server.serving.set()
+    # Commands arrive in order, so once the park is in everything before it is too
+    client.park()
+    assert wait_for(lambda: "K" in server.rotator.commands)
+    assert server.rotator.commands == ["p", "P 10.00 10.00", "S", "K"]
+
+
+def test_reconnects_with_backoff(server, client_for, monkeypatch):
+    monkeypatch.setattr(rotctl, "BACKOFF_MIN", 0.05)
+    monkeypatch.setattr(rotctl, "BACKOFF_MAX", 0.2)
+    port = server.port
+    client = client_for(server)
+
+    # Dropped connection: reconnects at once while rotctld is still listening
+    assert wait_for(lambda: server.clients)
+    server.drop_clients()
+    assert wait_for(lambda: client.counters["reconnects"] == 1)
+    assert wait_for(lambda: client.connected)
+
+    # rotctld gone: connection attempts back off until it returns
+    server.shutdown()
+    server.server_close()
+    server.drop_clients()
+    assert wait_for(lambda: client.status.startswith("Retry in"))
+    assert not client.connected
+    replacement = FakeRotctld(port=port, rate=1000.0).start()
+    try:
+        assert wait_for(lambda: client.connected)
+        client.set_position(90.0, 10.0)
+        assert wait_for(lambda: "P 90.00 10.00" in replacement.rotator.commands)
+    finally:
+        replacement.drop_clients()
+        replacement.shutdown()
+        replacement.server_close()
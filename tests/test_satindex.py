@@ -0,0 +1,82 @@
+# test_satindex.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Satellite lookups by name, NORAD ID, COSPAR ID, prefix and typo over the fixed TLEs
+
+import os
+
+import pytest
+
+from conftest import DATA_DIR, make_store
+from passpredict import parse_tle_text
+from satindex import SatelliteIndex, normalize_cospar, normalize_name
+
+
+@pytest.fixture(scope="module")
+def index():
+    with open(os.path.join(DATA_DIR, "stations.tle")) as f:
+        tles = parse_tle_text(f.read())
+    return SatelliteIndex([name for name, _, _ in tles], [line1 for _, line1, _ in tles])
+
+
+def test_normalize():
+    assert normalize_name(" iss (zarya) ") == "ISS ZARYA"
+    assert normalize_cospar("98067A") == "1998-067A"
+    assert normalize_cospar("2009-005a") == "2009-005A"
+    assert normalize_cospar("18087") == "2018-087"
+    assert normalize_cospar("NOAA") is None
+
+
+@pytest.mark.parametrize("query, row", [
+    ("ISS (ZARYA)", 0),
+    ("iss zarya", 0),
+    ("ISSZARYA", 0),
+    ("noaa-19", 1),
+    ("METOP C", 2),
+    ("25544", 0),  # NORAD
+    (" 33591 ", 1),
+    (43689, 2),
+    ("1998-067A", 0),  # COSPAR, long and short forms
+    ("09005A", 1),
+    ("2018-087a", 2),
+])
+def test_exact_lookup(index, query, row):
+    assert index.lookup(query) == row
+
+
+@pytest.mark.parametrize("query", ["NOAA", "99999", "1998-067B", "ISS ZARYA 2", ""])
+def test_lookup_misses(index, query):
+    assert index.lookup(query) is None
+
+
+def test_prefix_completion(index):
+    assert index.complete("no") == ["NOAA 19"]
+    assert index.complete("ISS (") == ["ISS (ZARYA)"]
+    assert index.complete("M") == ["METOP-C"]
+    assert index.complete("NOAA 18") == []
+    assert index.complete("  ") == []
+    # Each satellite once, though its name is indexed with and without spaces
+    assert index.complete("ISSZ") == ["ISS (ZARYA)"]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("33591", ["NOAA 19"]),  # Exact matches win
+    ("Metop", ["METOP-C"]),  # Then prefixes
+    ("NOA 19", ["NOAA 19"]),  # Then typos
+    ("METPO-C", ["METOP-C"]),
+    ("zarya", ["ISS (ZARYA)"]),
+    ("GOES 16", []),
+])
+def test_search(index, query, expected):
+    assert index.search(query) == expected
+
+
+def test_store_index_follows_catalog(tmp_path, tle_server):
+    store = make_store(tmp_path, tle_server)
+    assert store.index() is None  # Nothing cached yet
+    store.refresh()
+    index = store.index()
+    assert len(index) == 3
+    assert index.names[index.lookup("25544")] == "ISS (ZARYA)"
+    assert store.index() is index
+    assert [name for name, _, _ in store.entries(["33591", "2018-087A", "unknown"])] == ["NOAA 19", "METOP-C"]
@@ -0,0 +1,102 @@
+# test_skyview.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# All-sky layer: horizon culling and the refresh stride that keeps it within its frame budget
+
+import math
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+
+import skyview
+from conftest import DATA_DIR
+from passpredict import PassPredictor, parse_tle_text
+from skyview import SkyLayer
+
+START = datetime(2024, 4, 9, 12, 0, tzinfo=timezone.utc)  # Epoch of the fixed TLEs
+LONDON = (51.5, -0.1, 30.0)
+COPIES = 20  # Catalog of 60 satellites, the fixed three repeated
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    with open(os.path.join(DATA_DIR, "stations.tle")) as f:
+        return parse_tle_text(f.read()) * COPIES
+
+
+@pytest.fixture(scope="module")
+def overhead(catalog):
+    """Time at which the ISS culminates over London."""
+    predictor = PassPredictor(catalog[:1], *LONDON, min_elevation=30.0)
+    return predictor.find_passes(START, days=1)[0].tca.timestamp()
+
+
+def layer(catalog, **kwargs):
+    ax = Figure().add_subplot(projection="polar")
+    return SkyLayer(ax, catalog, LONDON, **kwargs)
+
+
+def test_only_satellites_above_horizon_drawn(catalog, overhead):
+    sky = layer(catalog, budget=math.inf)
+    sky.update(overhead)
+    up = sky.el > 0
+    assert 0 < up.sum() < len(catalog)
+    assert sky.visible == up.sum()
+    offsets = sky.collection.get_offsets()
+    assert np.allclose(np.sort(offsets[:, 1]), np.sort(90 - sky.el[up]))
+    # Capped at max_points, keeping the highest
+    sky = layer(catalog, budget=math.inf, max_points=COPIES)
+    sky.update(overhead)
+    assert sky.visible == COPIES
+    assert np.allclose(sky.collection.get_offsets()[:, 1], 90 - sky.el.max())
+
+
+def test_stride_doubles_over_budget(catalog, overhead):
+    sky = layer(catalog, budget=0.0)  # Every tick is over budget
+    strides = []
+    for k in range(9):
+        sky.update(overhead + k)
+        strides.append(sky.stride)
+    assert strides == [2, 4, 8, 16, 32, 64, 64, 64, 64]
+
+
+def test_stride_refreshes_a_subset_per_tick(catalog, overhead):
+    sky = layer(catalog, budget=0.0)
+    sky.update(overhead)
+    assert sky.stride == 2
+    sky.budget = math.inf  # Hold the stride for one tick, then let it relax
+    before = sky.el.copy()
+    sky.update(overhead + 30)
+    changed = np.nonzero(sky.el != before)[0]
+    # Only the satellites of phase 0 moved; the others kept their last position
+    assert changed.tolist() == list(range(0, len(catalog), 2))
+    assert sky.stride == 1
+
+
+def test_stride_relaxes_with_headroom(catalog, overhead, monkeypatch):
+    monkeypatch.setattr(skyview, "MAX_STRIDE", 8)
+    sky = layer(catalog, budget=0.0)
+    for k in range(5):
+        sky.update(overhead + k)
+    assert sky.stride == 8
+    sky.budget = math.inf
+    strides = []
+    for k in range(4):
+        sky.update(overhead + 10 + k)
+        strides.append(sky.stride)
+    assert strides == [4, 2, 1, 1]
+    # Back at stride 1 the whole catalog is current again
+    full = layer(catalog, budget=math.inf)
+    full.update(overhead + 13)
+    assert np.array_equal(sky.el, full.el)
+
+
+def test_set_location_resets_stride(catalog, overhead):
+    sky = layer(catalog, budget=0.0)
+    for k in range(3):
+        sky.update(overhead + k)
+    sky.set_location(-33.9, 151.2, 50.0)
+    assert sky.stride == 1 and np.all(sky.el == -90.0)
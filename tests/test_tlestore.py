@@ -0,0 +1,118 @@
+# test_tlestore.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# TLEStore refresh against a local HTTP stand-in for Celestrak / SatNOGS
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import tlestore
+from conftest import ETAG, LAST_MODIFIED, TLE_TEXT, make_store
+from tlestore import parse_satnogs_json
+
+
+def test_refresh_downloads_catalog(tmp_path, tle_server):
+    store = make_store(tmp_path, tle_server)
+    assert store.refresh() == {"local": "updated"}
+    assert [name for name, _, _ in store.entries()] == ["ISS (ZARYA)", "NOAA 19", "METOP-C"]
+    meta = store.metadata("local")
+    assert meta["etag"] == ETAG
+    assert meta["last_modified"] == LAST_MODIFIED
+    assert meta["count"] == 3
+    # First download carries no validators
+    assert "If-None-Match" not in tle_server.requests[0]
+
+
+def test_fresh_cache_makes_no_request(tmp_path, tle_server):
+    store = make_store(tmp_path, tle_server)
+    store.refresh()
+    assert store.refresh() == {"local": "fresh"}
+    assert len(tle_server.requests) == 1
+
+
+def test_conditional_get_not_modified(tmp_path, tle_server):
+    store = make_store(tmp_path, tle_server)
+    store.refresh()
+    fetched_at = store.metadata("local")["fetched_at"]
+    assert store.refresh(force=True) == {"local": "not-modified"}
+    headers = tle_server.requests[-1]
+    assert headers["If-None-Match"] == ETAG
+    assert headers["If-Modified-Since"] == LAST_MODIFIED
+    assert store.metadata("local")["fetched_at"] >= fetched_at
+    assert len(store.entries()) == 3
+
+
+def test_timeout_keeps_cache(tmp_path, tle_server, monkeypatch):
+    store = make_store(tmp_path, tle_server)
+    store.refresh()
+    monkeypatch.setattr(tlestore, "REQUEST_TIMEOUT", 0.2)
+    tle_server.delay = 1.0
+    status = store.refresh_source("local", force=True)
+    assert status.startswith("error:")
+    assert len(store.entries()) == 3
+
+
+@pytest.mark.parametrize("fmt, body", [
+    ("satnogs", "<html>Service unavailable</html>"),
+    ("satnogs", '{"detail": "throttled"}'),
+    ("tle", "<html>Service unavailable</html>"),
+    ("tle", "ISS\n1 25544U 98067A   24xxx.5000\n2 25544  51.6400\n"),
+])
+def test_bad_payload_keeps_cache(tmp_path, tle_server, fmt, body):
+    store = make_store(tmp_path, tle_server, fmt)
+    if fmt == "satnogs":
+        tle_server.body = json.dumps([{"tle0": "0 NOAA 19", "tle1": line1, "tle2": line2}
+                                  for _, line1, line2 in tlestore.parse_tle_text(TLE_TEXT)])
+    assert store.refresh() == {"local": "updated"}
+    tle_server.body = body
+    # A fresh tle_server with no matching validators, so the bad body is served
+    os.remove(store._meta_path("local"))
+    status = store.refresh_source("local", force=True)
+    assert status.startswith("error:")
+    assert len(store.entries()) == 3
+
+
+def test_parse_satnogs_skips_malformed_records():
+    _, line1, line2 = tlestore.parse_tle_text(TLE_TEXT)[1]
+    text = json.dumps([
+        {"tle0": "0 NOAA 19", "tle1": line1, "tle2": line2},
+        {"tle0": "0 BROKEN", "tle1": line1},
+        {"tle0": None, "tle1": None, "tle2": None},
+        "not a record",
+    ])
+    assert parse_satnogs_json(text) == [("NOAA 19", line1, line2)]
+
+
+class AfterLoop:
+    """Stand-in for a Tk root: runs after() callbacks in the test thread."""
+
+    def __init__(self):
+        self.pending = []
+        self.thread = threading.get_ident()
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def run(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            self.pending.pop(0)()
+            time.sleep(0.01)
+
+
+def test_refresh_in_background_reports_on_caller_thread(tmp_path, tle_server):
+    store = make_store(tmp_path, tle_server)
+    tle_server.delay = 0.3
+    root = AfterLoop()
+    reported = []
+    assert store.refresh_in_background(root, lambda results: reported.append(
+        (results, threading.get_ident())), force=True)
+    # A second request while the first is running is ignored
+    assert not store.refresh_in_background(root, reported.append, force=True)
+    root.run()
+    assert reported == [({"local": "updated"}, root.thread)]
+    assert len(tle_server.requests) == 1
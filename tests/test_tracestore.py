@@ -0,0 +1,68 @@
+# test_tracestore.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Chunked trace store: appends across chunk boundaries and zero-copy reads
+
+import numpy as np
+
+import recordfile
+from tracestore import COLUMNS, TraceStore
+
+
+def batch(start, n):
+    t = np.arange(start, start + n, dtype=np.float64)
+    return t, t % 360.0, t % 90.0, -t
+
+
+def test_columns_match_recording_format():
+    assert COLUMNS is recordfile.COLUMNS
+
+
+def test_extend_rolls_over_chunks():
+    store = TraceStore(chunk_size=16)
+    done = 0
+    # Batches that end mid-chunk, exactly on a boundary, and span several chunks
+    for n in (5, 11, 1, 40, 3):
+        store.extend(*batch(done, n))
+        done += n
+    assert len(store) == done == 60
+    assert [view.shape[1] for view in store.chunks()] == [16, 16, 16, 12]
+    t, az, el, rssi = batch(0, done)
+    columns = store.columns()
+    assert np.array_equal(columns["time"], t)
+    assert np.array_equal(columns["az"], az)
+    assert np.array_equal(columns["el"], el)
+    assert np.array_equal(columns["rssi"], rssi)
+
+
+def test_append_matches_extend():
+    appended, extended = TraceStore(chunk_size=8), TraceStore(chunk_size=8)
+    t, az, el, rssi = batch(0, 20)
+    for sample in zip(t, az, el, rssi):
+        appended.append(*sample)
+    extended.extend(t, az, el, rssi)
+    for name in COLUMNS:
+        assert np.array_equal(appended.column(name), extended.column(name))
+    # Without an RSSI the column is NaN
+    appended.append(20.0, 1.0, 2.0)
+    assert np.isnan(appended.column("rssi")[-1])
+
+
+def test_single_chunk_is_a_view():
+    store = TraceStore(chunk_size=16)
+    store.extend(*batch(0, 10))
+    column = store.column("az")
+    assert np.shares_memory(column, store.chunks()[0])
+    store.extend(*batch(10, 10))  # Now spans two chunks: a copy
+    assert not np.shares_memory(store.column("az"), store.chunks()[0])
+
+
+def test_clear_reuses_chunks():
+    store = TraceStore(chunk_size=16)
+    store.extend(*batch(0, 40))
+    chunks = list(store._chunks)
+    store.clear()
+    assert len(store) == 0 and store.column("time").size == 0 and store.chunks() == []
+    store.extend(*batch(100, 20))
+    assert all(a is b for a, b in zip(store._chunks, chunks)) and len(store._chunks) == 3
+    assert np.array_equal(store.column("time"), np.arange(100.0, 120.0))
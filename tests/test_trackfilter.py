@@ -0,0 +1,63 @@
+# test_trackfilter.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# KalmanFilter: steady-state gains against the full recursion, chunked against batch filtering
+
+import numpy as np
+import pytest
+
+import trackfilter
+from trackfilter import KalmanFilter, angular_separation, steady_state
+
+
+def samples(n=2000, jitter=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = 1.7e9 + np.cumsum(0.05 + rng.normal(0.0, jitter, n))
+    az = (np.linspace(350.0, 370.0, n) + rng.normal(0.0, 0.5, n)) % 360.0
+    el = np.linspace(10.0, 60.0, n) + rng.normal(0.0, 0.5, n)
+    return t, az, el
+
+
+def exact(t, az, el, monkeypatch):
+    """Filter with every gain stepped through the recursion (steady state never used)."""
+    monkeypatch.setattr(trackfilter, "STEADY_TOLERANCE", -1.0)
+    try:
+        return KalmanFilter().process(t, az, el)
+    finally:
+        monkeypatch.undo()
+
+
+def test_steady_state_is_a_fixed_point():
+    covariance, gains = steady_state(0.05, 0.25, 25.0)
+    again, gains_again = trackfilter._kalman_step(covariance, 0.05, 0.25, 25.0)
+    assert np.allclose(again, covariance, rtol=1e-9)
+    assert np.allclose(gains_again, gains, rtol=1e-9)
+
+
+def test_uniform_spacing_matches_full_recursion(monkeypatch):
+    t, az, el = samples()
+    _, ref_az, ref_el = exact(t, az, el, monkeypatch)
+    _, out_az, out_el = KalmanFilter().process(t, az, el)
+    assert np.max(angular_separation(out_az, out_el, ref_az, ref_el)) < 1e-3
+
+
+def test_jittered_spacing_close_to_full_recursion(monkeypatch):
+    t, az, el = samples(jitter=0.003)
+    # A two second gap is stepped through exactly
+    t[1000:] += 2.0
+    _, ref_az, ref_el = exact(t, az, el, monkeypatch)
+    _, out_az, out_el = KalmanFilter().process(t, az, el)
+    # Far below the 0.5 degree measurement noise
+    assert np.max(angular_separation(out_az, out_el, ref_az, ref_el)) < 0.05
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 64])
+def test_chunks_match_batch(chunk):
+    t, az, el = samples(jitter=0.001)
+    _, batch_az, batch_el = KalmanFilter().process(t, az, el)
+    live = KalmanFilter()
+    parts = [live.process(t[i:i + chunk], az[i:i + chunk], el[i:i + chunk])
+             for i in range(0, t.size, chunk)]
+    live_az = np.concatenate([p[1] for p in parts])
+    live_el = np.concatenate([p[2] for p in parts])
+    assert np.max(angular_separation(live_az, live_el, batch_az, batch_el)) < 0.05
@@ -0,0 +1,110 @@
+# test_trackscheduler.py
+# MIT License
+# Copyright (c) 2025 Benb0jangles
+# Rotator path planning (flip, limits) and the deadband / lead of the command stream
+
+import numpy as np
+import pytest
+
+from trackscheduler import MAX_LEAD, TrackScheduler, plan_path
+
+LIMITS = (0, 360, 0, 180)  # MIN_AZ, MAX_AZ, MIN_EL, MAX_EL of the rotator app
+DURATION = 600.0
+
+
+def overhead_pass(peak=85.0):
+    """A pass rising in the north-west that crosses north (the azimuth end stop) near zenith."""
+    t = np.linspace(0.0, DURATION, 601)
+    az = (300.0 + 120.0 * t / DURATION) % 360.0
+    el = peak * np.sin(np.pi * t / DURATION)
+    return t, az, el
+
+
+def assert_within(az, el, limits):
+    min_az, max_az, min_el, max_el = limits
+    assert np.all((az >= min_az) & (az <= max_az))
+    assert np.all((el >= min_el) & (el <= max_el))
+
+
+def test_pass_through_end_stop_is_flipped():
+    _, az, el = overhead_pass()
+    path_az, path_el, flipped = plan_path(az, el, *LIMITS)
+    assert flipped
+    assert_within(path_az, path_el, LIMITS)
+    # No unwinding mid-pass: the path moves smoothly
+    assert np.max(np.abs(np.diff(path_az))) < 1.0
+    # Flipped, the dish points through zenith at the same direction
+    assert np.allclose((path_az - 180.0) % 360.0, az)
+    assert np.allclose(path_el, 180.0 - el)
+
+
+def test_pass_clear_of_end_stop_is_not_flipped():
+    _, az, el = overhead_pass()
+    az = (az + 90.0) % 360.0  # 30° to 150°, never crossing north
+    path_az, path_el, flipped = plan_path(az, el, *LIMITS)
+    assert not flipped
+    assert np.allclose(path_az, az) and np.allclose(path_el, el)
+
+
+def test_no_flip_without_elevation_past_zenith():
+    _, az, el = overhead_pass()
+    limits = (0, 360, 0, 90)
+    path_az, path_el, flipped = plan_path(az, el, *limits)
+    assert not flipped
+    assert_within(path_az, path_el, limits)
+
+
+@pytest.mark.parametrize("limits", [LIMITS, (0, 360, 5, 90), (-180, 180, 0, 180)])
+def test_commands_stay_within_limits_and_outside_deadband(limits):
+    t, az, el = overhead_pass()
+    scheduler = TrackScheduler(t, az, el, limits=limits, deadband=1.0)
+    commands = []
+    for now in np.arange(-5.0, DURATION + 5.0, 0.1):
+        command = scheduler.next_command(now, latency=0.2)
+        if command is not None:
+            commands.append(command)
+    assert len(commands) == scheduler.commands_sent > 10
+    commands = np.array(commands)
+    assert_within(commands[:, 0], commands[:, 1], limits)
+    # Every command moved at least the deadband from the one before
+    step = np.max(np.abs(np.diff(commands, axis=0)), axis=1)
+    assert np.all(step >= scheduler.deadband)
+
+
+def test_no_command_inside_deadband():
+    t, az, el = overhead_pass()
+    scheduler = TrackScheduler(t, az, el, limits=LIMITS, deadband=5.0)
+    first = scheduler.next_command(300.0)
+    assert first is not None
+    # Half a second later the target has moved well under 5°
+    assert scheduler.next_command(300.5) is None
+    assert scheduler.last_command == first
+    assert scheduler.commands_sent == 1
+
+
+def test_lead_compensation():
+    t, az, el = overhead_pass()
+    scheduler = TrackScheduler(t, az, el, limits=LIMITS, slew_rate=6.0)
+    now = 100.0
+    # Rotator already on the lead target: only the latency is added
+    position = scheduler.target_at(now + 0.5)
+    assert scheduler.next_command(now, latency=0.5, position=position) == pytest.approx(
+        scheduler.target_at(now + 0.5))
+    # Far from the target, the slew time is added, capped at MAX_LEAD
+    scheduler = TrackScheduler(t, az, el, limits=LIMITS, slew_rate=6.0)
+    target = scheduler.target_at(now + 0.5)
+    position = (target[0] - 12.0, target[1])
+    assert scheduler.next_command(now, latency=0.5, position=position) == pytest.approx(
+        scheduler.target_at(now + 0.5 + 2.0), abs=0.05)
+    scheduler = TrackScheduler(t, az, el, limits=LIMITS, slew_rate=6.0)
+    position = (target[0] - 170.0, target[1])
+    assert scheduler.next_command(now, latency=0.5, position=position) == pytest.approx(
+        scheduler.target_at(now + MAX_LEAD))
+
+
+def test_target_held_at_the_ends():
+    t, az, el = overhead_pass()
+    scheduler = TrackScheduler(t, az, el, limits=LIMITS)
+    assert scheduler.target_at(-10.0) == scheduler.target_at(0.0)
+    assert scheduler.target_at(DURATION + 10.0) == scheduler.target_at(DURATION)
+    assert scheduler.finished(DURATION + 1.0) and not scheduler.finished(DURATION)